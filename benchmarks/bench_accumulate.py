@@ -0,0 +1,56 @@
+"""Checksums and inner products: ``Mod`` operator chains against
+``Mod.sum``, ``Mod.dot`` and ``ModAccumulator``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_accumulate.py``
+
+"""
+
+import random
+import timeit
+
+from mod import Mod, ModAccumulator
+
+
+COUNT = 10000
+NUMBER = 10
+REPEAT = 3
+
+
+def accumulate(left, right, modulus):
+    total = ModAccumulator(0, modulus)
+    for x, y in zip(left, right):
+        total.add_product(x, y)
+    return total.value
+
+
+def main():
+    print('{:>6}  {:<28} {:>10}'.format('bits', 'case', 'ms'))
+    for bits in [16, 64, 256, 2048]:
+        generator = random.Random(bits)
+        modulus = generator.getrandbits(bits) | (1 << (bits - 1)) | 1
+        left = [Mod(generator.randrange(modulus), modulus)
+                for _ in range(COUNT)]
+        right = [Mod(generator.randrange(modulus), modulus)
+                 for _ in range(COUNT)]
+        zero = Mod(0, modulus)
+
+        cases = [
+            ('sum(numbers)', lambda: sum(left, zero)),
+            ('Mod.sum(numbers)', lambda: Mod.sum(left)),
+            ('sum(x * y for ...)', lambda: sum(
+                (x * y for x, y in zip(left, right)), zero
+            )),
+            ('Mod.dot(left, right)', lambda: Mod.dot(left, right)),
+            ('ModAccumulator.add_product', lambda: accumulate(
+                left, right, modulus
+            )),
+        ]
+        for name, case in cases:
+            elapsed = min(timeit.repeat(case, number=NUMBER, repeat=REPEAT))
+            print('{:>6}  {:<28} {:>10.2f}'.format(
+                bits, name, elapsed / NUMBER * 1000
+            ))
+
+
+if __name__ == '__main__':
+    main()
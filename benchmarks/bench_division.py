@@ -0,0 +1,49 @@
+"""Division-heavy workloads: ``inverse``, ``Mod // Mod`` and ``int // Mod``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_division.py``
+
+"""
+
+import random
+import timeit
+
+from mod import Mod
+
+
+NUMBER = 2000
+REPEAT = 5
+
+
+def cases(bits):
+    generator = random.Random(bits)
+    modulus = generator.getrandbits(bits) | (1 << (bits - 1)) | 1
+    while True:
+        left = Mod(generator.randrange(modulus), modulus)
+        right = Mod(generator.randrange(modulus), modulus)
+        try:
+            left.inverse, right.inverse
+        except ValueError:
+            continue
+        break
+
+    divisor = int(right)
+    return [
+        ('x.inverse', lambda: left.inverse),
+        ('x // y', lambda: left // right),
+        ('x // int', lambda: left // divisor),
+        ('int // x', lambda: divisor // left),
+    ]
+
+
+def main():
+    print('{:>6}  {:<12} {:>12}'.format('bits', 'case', 'ops/s'))
+    for bits in [16, 64, 256, 1024, 2048]:
+        for name, case in cases(bits):
+            elapsed = min(timeit.repeat(case, number=NUMBER, repeat=REPEAT))
+            print('{:>6}  {:<12} {:>12,.0f}'.format(
+                bits, name, NUMBER / elapsed
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Repeated powers of one base: ``Mod.__pow__`` against ``FixedBase``,
+and separate powers against ``Mod.multi_pow``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_fixed_base.py``
+
+"""
+
+import random
+import timeit
+
+from mod import FixedBase, Mod
+
+
+NUMBER = 20
+REPEAT = 3
+
+
+def main():
+    print('{:>6}  {:<22} {:>12}'.format('bits', 'case', 'ops/s'))
+    for bits in [256, 1024, 2048]:
+        generator = random.Random(bits)
+        modulus = generator.getrandbits(bits) | (1 << (bits - 1)) | 1
+        base = Mod(generator.randrange(modulus), modulus)
+        other = Mod(generator.randrange(modulus), modulus)
+        exponent = generator.getrandbits(bits)
+        second = generator.getrandbits(bits)
+        table = FixedBase(base, bits)
+
+        cases = [
+            ('base ** e', lambda: base**exponent),
+            ('FixedBase.pow(e)', lambda: table.pow(exponent)),
+            ('a ** x * b ** y', lambda: base**exponent * other**second),
+            ('Mod.multi_pow', lambda: Mod.multi_pow(
+                (base, exponent), (other, second)
+            )),
+        ]
+        for name, case in cases:
+            elapsed = min(timeit.repeat(case, number=NUMBER, repeat=REPEAT))
+            print('{:>6}  {:<22} {:>12,.0f}'.format(
+                bits, name, NUMBER / elapsed
+            ))
+
+
+if __name__ == '__main__':
+    main()
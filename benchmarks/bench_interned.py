@@ -0,0 +1,58 @@
+"""Memory of many Mod numbers with small moduli, created with ``Mod`` or
+shared with ``Mod.interned``, measured with tracemalloc.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_interned.py [count]``,
+the default is 10 million numbers
+
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from mod import Mod
+
+
+MODULI = [7, 97, 360, 4093]
+
+
+def measure(count, build):
+    """Bytes and seconds taken by a list of *count* numbers, the time is
+    measured without tracing allocations"""
+    generator = random.Random(count)
+    values = [generator.randrange(1 << 16) for _ in range(1 << 16)]
+
+    def numbers():
+        return [
+            build(values[index & 0xffff], MODULI[index & 3])
+            for index in range(count)
+        ]
+
+    started = time.perf_counter()
+    numbers()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    kept = numbers()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10**7
+    print('{:,} numbers modulo {}'.format(count, MODULI))
+    print('{:<14} {:>12} {:>14} {:>10}'.format(
+        'constructor', 'MiB', 'bytes/number', 'seconds'
+    ))
+    for name, build in [('Mod', Mod), ('Mod.interned', Mod.interned)]:
+        size, elapsed = measure(count, build)
+        print('{:<14} {:>12,.1f} {:>14.1f} {:>10.2f}'.format(
+            name, size / 2**20, size / count, elapsed
+        ))
+
+
+if __name__ == '__main__':
+    main()
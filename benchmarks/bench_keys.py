@@ -0,0 +1,44 @@
+"""Dicts keyed by Mod numbers of many moduli sharing the same residues,
+a plain ``dict`` against ``ModDict``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_keys.py``
+
+"""
+
+import time
+
+from mod import Mod, ModDict
+
+
+MODULI = [1009 + 2 * index for index in range(100)]
+RESIDUES = 1000
+
+
+def main():
+    keys = [Mod(value, modulus)
+            for modulus in MODULI for value in range(RESIDUES)]
+    print('{:,} keys, {} moduli sharing residues below {}'.format(
+        len(keys), len(MODULI), RESIDUES
+    ))
+    print('{:<10} {:>10} {:>14} {:>14}'.format(
+        'container', 'entries', 'insert (ns)', 'lookup (ns)'
+    ))
+    for name, build in [('dict', dict), ('ModDict', ModDict)]:
+        table = build()
+        started = time.perf_counter()
+        for index, key in enumerate(keys):
+            table[key] = index
+        inserted = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for key in keys:
+            table[key]
+        looked_up = time.perf_counter() - started
+        print('{:<10} {:>10,} {:>14.0f} {:>14.0f}'.format(
+            name, len(table), inserted / len(keys) * 1e9,
+            looked_up / len(keys) * 1e9
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Hot formulas on ``Mod`` numbers: operator chains against the same
+functions compiled with ``lazy``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_lazy.py``
+
+"""
+
+import random
+import timeit
+
+from mod import Mod, lazy
+
+
+NUMBER = 2000
+REPEAT = 3
+
+
+def formula(a, b, c, d, e, f):
+    return (a * b + c * d - e) ** 5 // f
+
+
+def horner(x, c0, c1, c2, c3, c4, c5, c6, c7):
+    return ((((((c7 * x + c6) * x + c5) * x + c4) * x + c3) * x + c2)
+            * x + c1) * x + c0
+
+
+def point_double(x, y, a):
+    # Doubling of an affine point on y^2 = x^3 + a x + b
+    slope = (3 * x * x + a) // (2 * y)
+    result = slope * slope - 2 * x
+    return result, slope * (x - result) - y
+
+
+def main():
+    print('{:>6}  {:<14} {:>12} {:>12}'.format(
+        'bits', 'function', 'plain (us)', 'lazy (us)'
+    ))
+    for bits in [64, 256, 2048]:
+        generator = random.Random(bits)
+        modulus = generator.getrandbits(bits) | (1 << (bits - 1)) | 1
+        numbers = [Mod(generator.randrange(1, modulus), modulus)
+                   for _ in range(9)]
+
+        for function in [formula, horner, point_double]:
+            compiled = lazy(function)
+            size = function.__code__.co_argcount
+            args = numbers[:size]
+            plain = min(timeit.repeat(
+                lambda: function(*args), number=NUMBER, repeat=REPEAT
+            ))
+            fused = min(timeit.repeat(
+                lambda: compiled(*args), number=NUMBER, repeat=REPEAT
+            ))
+            print('{:>6}  {:<14} {:>12.2f} {:>12.2f}'.format(
+                bits, function.__name__,
+                plain / NUMBER * 1e6, fused / NUMBER * 1e6
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Discrete logarithms under a fixed base: the first logarithm builds
+the baby-step tables, the next ones reuse them.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_log.py``
+
+"""
+
+import random
+import time
+
+from mod import Mod, ModRing
+
+
+COUNT = 100
+
+
+def prime_with_factor(bits, seed):
+    # Prime p such that p - 1 has a prime factor of about *bits* bits
+    generator = random.Random(seed)
+    while True:
+        factor = generator.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if not ModRing(factor).is_prime:
+            continue
+        for cofactor in range(2, 10000, 2):
+            if ModRing(factor * cofactor + 1).is_prime:
+                return factor * cofactor + 1
+
+
+def main():
+    print('{:>8} {:>14} {:>14} {:>14}'.format(
+        'modulus', 'largest q', 'first (ms)', 'next (ms)'
+    ))
+    cases = [('2^61-1', 2**61 - 1)]
+    for bits in [20, 28, 32]:
+        cases.append(('{}-bit q'.format(bits), prime_with_factor(bits, bits)))
+
+    for name, modulus in cases:
+        generator = random.Random(modulus)
+        base = Mod(3, modulus)
+        largest = max(base.ring.carmichael_factorization)
+        targets = [base**generator.randrange(modulus) for _ in range(COUNT)]
+
+        started = time.perf_counter()
+        targets[0].log(base)
+        first = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for target in targets[1:]:
+            target.log(base)
+        following = (time.perf_counter() - started) / (COUNT - 1)
+        print('{:>8} {:>14} {:>14.2f} {:>14.2f}'.format(
+            name, largest, first * 1000, following * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Every ``Mod`` operator against hand-written ``int`` code, for moduli
+from 8 to 4096 bits and each mix of ``Mod``, ``int`` and ``float``
+operands.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_operators.py``
+
+Results can be saved and compared with a previous run, cases that got
+slower than the threshold are reported and make the script fail::
+
+    python benchmarks/bench_operators.py --save before.json
+    python benchmarks/bench_operators.py --compare before.json
+
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from math import gcd
+
+import mod
+from mod import Mod
+
+
+BITS = [8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096]
+
+# Minimum duration of one measurement, in seconds
+MINIMUM = 0.02
+REPEAT = 3
+
+# Name, statement with Mod numbers, plain int statement.
+# a and b are Mod numbers with the residues x and y, m is the modulus,
+# e an exponent as wide as the modulus and f a float.
+# Statements that fail, like floats of huge residues, are not timed
+CASES = [
+    ('Mod(x, m)', 'Mod(x, m)', 'x % m'),
+    ('a.copy()', 'a.copy()', None),
+    ('int(a)', 'int(a)', None),
+    ('float(a)', 'float(a)', 'float(x)'),
+    ('hash(a)', 'hash(a)', 'hash(x)'),
+    ('-a', '-a', '-x % m'),
+    ('+a', '+a', None),
+    ('Mod(f, m)', 'Mod(f, m)', 'int(f) % m'),
+    ('a == b', 'a == b', 'x == y'),
+    ('a == y', 'a == y', 'x == y % m'),
+    ('y == a', 'y == a', 'y % m == x'),
+    ('a == f', 'a == f', 'x == int(f) % m'),
+    ('a < b', 'a < b', 'x < y'),
+    ('a < y', 'a < y', 'x < y % m'),
+    ('y < a', 'y < a', 'y % m < x'),
+    ('a < f', 'a < f', 'x < int(f) % m'),
+    ('a <= b', 'a <= b', 'x <= y'),
+    ('a > y', 'a > y', 'x > y % m'),
+    ('a + b', 'a + b', '(x + y) % m'),
+    ('a + y', 'a + y', '(x + y) % m'),
+    ('y + a', 'y + a', '(y + x) % m'),
+    ('a + f', 'a + f', 'x + f'),
+    ('f + a', 'f + a', 'f + x'),
+    ('a - b', 'a - b', '(x - y) % m'),
+    ('a - y', 'a - y', '(x - y) % m'),
+    ('y - a', 'y - a', '(y - x) % m'),
+    ('a - f', 'a - f', 'x - f'),
+    ('f - a', 'f - a', 'f - x'),
+    ('a * b', 'a * b', 'x * y % m'),
+    ('a * y', 'a * y', 'x * y % m'),
+    ('y * a', 'y * a', 'y * x % m'),
+    ('a * f', 'a * f', 'x * f'),
+    ('f * a', 'f * a', 'f * x'),
+    ('a / b', 'a / b', 'x / y'),
+    ('a / y', 'a / y', 'x / y'),
+    ('y / a', 'y / a', 'y / x'),
+    ('a / f', 'a / f', 'x / f'),
+    ('f / a', 'f / a', 'f / x'),
+    ('a // b', 'a // b', 'x * pow(y, -1, m) % m'),
+    ('a // y', 'a // y', 'x * pow(y, -1, m) % m'),
+    ('y // a', 'y // a', 'y * pow(x, -1, m) % m'),
+    ('a // f', 'a // f', 'x // f'),
+    ('f // a', 'f // a', 'f // x'),
+    ('a.inverse', 'a.inverse', 'pow(x, -1, m)'),
+    ('a ** e', 'a ** e', 'pow(x, e, m)'),
+    ('a ** b', 'a ** b', 'pow(x, y, m)'),
+    ('y ** a', 'y ** a', 'pow(y, x, m)'),
+]
+
+
+def operands(bits):
+    """Namespace of the statements for a modulus of *bits* bits"""
+    generator = random.Random(bits)
+    modulus = generator.getrandbits(bits) | (1 << (bits - 1)) | 1
+
+    def unit():
+        while True:
+            value = generator.randrange(2, modulus)
+            if gcd(value, modulus) == 1:
+                return value
+
+    a, b = Mod(unit(), modulus), Mod(unit(), modulus)
+    # The int statements use the integer type of the selected backend
+    return {
+        'Mod': Mod, 'a': a, 'b': b, 'f': 2.5,
+        'm': a._modulus, 'x': a._value, 'y': b._value,
+        'e': type(a._value)(generator.getrandbits(bits)),
+    }
+
+
+def measure(statement, namespace):
+    """Seconds per execution of *statement*, ``None`` when it fails"""
+    timer = timeit.Timer(statement, globals=namespace)
+    try:
+        timer.timeit(1)
+    except (ArithmeticError, ValueError):
+        # Floats cannot hold residues of huge moduli
+        return None
+
+    number = 1
+    while timer.timeit(number) < MINIMUM:
+        number *= 4
+    return min(timer.repeat(REPEAT, number)) / number
+
+
+def run(bits, selected):
+    """Timings of the selected cases, keyed by ``"bits:name"``"""
+    results = {}
+    for size in bits:
+        namespace = operands(size)
+        for name, statement, baseline in CASES:
+            if selected and not any(word in name for word in selected):
+                continue
+            key = '{}:{}'.format(size, name)
+            results[key] = {
+                'mod': measure(statement, namespace),
+                'int': baseline and measure(baseline, namespace),
+            }
+            show(key, results[key])
+    return results
+
+
+def nanoseconds(seconds):
+    return 'n/a' if seconds is None else '{:,.0f}'.format(seconds * 1e9)
+
+
+def show(key, result, previous=None):
+    bits, name = key.split(':', 1)
+    ratio = ''
+    if result['mod'] and result['int']:
+        ratio = '{:.1f}x'.format(result['mod'] / result['int'])
+    change = ''
+    if previous and previous.get('mod') and result['mod']:
+        change = '{:+.0%}'.format(result['mod'] / previous['mod'] - 1)
+    print('{:>5}  {:<10} {:>12} {:>12} {:>7} {:>7}'.format(
+        bits, name, nanoseconds(result['mod']),
+        nanoseconds(result['int']), ratio, change,
+    ))
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--bits', type=int, nargs='+', default=BITS,
+                        help='modulus sizes')
+    parser.add_argument('--case', nargs='+', default=[],
+                        help='only run the cases containing these words')
+    parser.add_argument('--backend', default='auto',
+                        choices=['auto', 'int', 'gmpy2'])
+    parser.add_argument('--save', help='write the results to a JSON file')
+    parser.add_argument('--compare', help='JSON file of a previous run')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown reported as a regression')
+    options = parser.parse_args(arguments)
+
+    mod.set_backend(options.backend)
+    print('{:>5}  {:<10} {:>12} {:>12} {:>7} {:>7}'.format(
+        'bits', 'case', 'Mod (ns)', 'int (ns)', 'ratio', 'change'
+    ))
+    results = run(options.bits, options.case)
+
+    if options.save:
+        with open(options.save, 'w') as handle:
+            json.dump({
+                'mod': mod.__version__,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'backend': options.backend,
+                'results': results,
+            }, handle, indent=1, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as handle:
+            previous = json.load(handle)['results']
+        print('\nCompared with {}:'.format(options.compare))
+        regressions = []
+        for key, result in results.items():
+            if key not in previous:
+                continue
+            show(key, result, previous[key])
+            before, after = previous[key].get('mod'), result['mod']
+            if before and after and after > before * (1 + options.threshold):
+                regressions.append(key)
+        if regressions:
+            print('\nSlower than {:.0%}: {}'.format(
+                options.threshold, ', '.join(regressions)
+            ))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
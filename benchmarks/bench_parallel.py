@@ -0,0 +1,66 @@
+"""Bulk powers and inverses with 2048-bit moduli: list comprehensions
+against ``pow_many`` and ``inverse_many`` over 1 to N processes.
+
+Also compares the size of a chunk sent to a worker, as fixed-width
+bytes and as a pickled list of ``Mod``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_parallel.py``
+
+"""
+
+import os
+import pickle
+import random
+import time
+from math import gcd
+
+from mod import Mod, inverse_many, pow_many
+
+
+BITS = 2048
+COUNT = 500
+
+
+def measure(function):
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def main():
+    generator = random.Random(BITS)
+    modulus = generator.getrandbits(BITS) | (1 << (BITS - 1)) | 1
+    values = []
+    while len(values) < COUNT:
+        value = generator.randrange(modulus)
+        if gcd(value, modulus) == 1:
+            values.append(value)
+    exponent = generator.getrandbits(BITS)
+    numbers = [Mod(value, modulus) for value in values]
+
+    width = BITS // 8 + 1
+    packed = b''.join(
+        value.to_bytes(width, 'little', signed=True) for value in values
+    )
+    print('chunk of {} numbers: {:,} bytes packed, {:,} bytes pickled'.format(
+        COUNT, len(packed), len(pickle.dumps(numbers))
+    ))
+
+    print('{:>8} {:>12} {:>12}'.format('workers', 'pow (s)', 'inverse (s)'))
+    print('{:>8} {:>12.3f} {:>12.3f}'.format(
+        'list',
+        measure(lambda: [number**exponent for number in numbers]),
+        measure(lambda: [number.inverse for number in numbers]),
+    ))
+    workers = 1
+    while workers <= max(os.cpu_count() or 1, 2):
+        print('{:>8} {:>12.3f} {:>12.3f}'.format(
+            workers,
+            measure(lambda: pow_many(values, exponent, modulus, workers)),
+            measure(lambda: inverse_many(values, modulus, workers)),
+        ))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
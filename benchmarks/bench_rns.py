@@ -0,0 +1,63 @@
+"""Multiply/add chains on huge integers: plain ``int`` against ``RNS``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_rns.py``
+
+"""
+
+import random
+import time
+import timeit
+
+from mod import RNS
+
+
+CHAIN = 20
+REPEAT = 3
+
+
+def chain(numbers, start):
+    result = start
+    for number in numbers:
+        result = result * number + number
+    return result
+
+
+def main():
+    print('{:>6}  {:>9} {:>12} {:>12} {:>12}'.format(
+        'bits', 'channels', 'basis (s)', 'int (ms)', 'RNS (ms)'
+    ))
+    for bits in [4096, 8192, 16384, 32768, 65536]:
+        generator = random.Random(bits)
+        values = [generator.getrandbits(bits) for _ in range(CHAIN)]
+
+        # Basis wide enough for the product of two operands
+        started = time.perf_counter()
+        basis = RNS.basis(2 * bits + 64)
+        setup = time.perf_counter() - started
+
+        numbers = [RNS(value, basis) for value in values]
+        wrapped = [value % basis.modulus for value in values]
+
+        def plain_int():
+            result = 1
+            for value in wrapped:
+                result = (result * value + value) % basis.modulus
+            return result
+
+        def rns():
+            return chain(numbers, RNS(1, basis))
+
+        assert int(rns()) == plain_int()
+        plain = min(timeit.repeat(plain_int, number=1, repeat=REPEAT))
+        residue = min(timeit.repeat(rns, number=1, repeat=REPEAT))
+        print('{:>6}  {:>9} {:>12.2f} {:>12.2f} {:>12.2f}'.format(
+            bits, len(basis.moduli), setup, plain * 1e3, residue * 1e3
+        ))
+
+        result = rns()
+        elapsed = min(timeit.repeat(lambda: int(result), number=1, repeat=1))
+        print('{:>6}  reconstruction: {:.2f} ms'.format('', elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main()
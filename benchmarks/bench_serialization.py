@@ -0,0 +1,76 @@
+"""Storing many residues: ``pickle`` against ``Mod.pack_many`` and
+residue files loaded with ``ModView``.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_serialization.py``
+
+"""
+
+import os
+import pickle
+import random
+import tempfile
+import time
+
+from mod import Mod, ModArray, ModView
+
+
+COUNT = 200000
+
+
+def measure(function):
+    started = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started, result
+
+
+def main():
+    print('{:>6}  {:<22} {:>12} {:>10}'.format(
+        'bits', 'case', 'bytes', 'ms'
+    ))
+    for bits in [16, 61, 256]:
+        generator = random.Random(bits)
+        modulus = generator.getrandbits(bits) | (1 << (bits - 1)) | 1
+        numbers = [Mod(generator.randrange(modulus), modulus)
+                   for _ in range(COUNT)]
+
+        cases = [
+            ('pickle.dumps', lambda: pickle.dumps(numbers)),
+            ('Mod.pack_many', lambda: Mod.pack_many(numbers)),
+        ]
+        for name, case in cases:
+            elapsed, data = measure(case)
+            print('{:>6}  {:<22} {:>12,} {:>10.1f}'.format(
+                bits, name, len(data), elapsed * 1000
+            ))
+
+        pickled = pickle.dumps(numbers)
+        packed = Mod.pack_many(numbers)
+        cases = [
+            ('pickle.loads', lambda: pickle.loads(pickled)),
+            ('Mod.unpack_many', lambda: Mod.unpack_many(packed, modulus)),
+        ]
+        for name, case in cases:
+            elapsed, _ = measure(case)
+            print('{:>6}  {:<22} {:>12} {:>10.1f}'.format(
+                bits, name, '', elapsed * 1000
+            ))
+
+    # Memory-mapped file of native residues, shared with a ModArray
+    modulus = 2**61 - 1
+    vector = ModArray(range(10 * COUNT), modulus) * 987654321
+    handle, path = tempfile.mkstemp(suffix='.mod')
+    os.close(handle)
+    try:
+        ModView.save(path, vector, width=8)
+        elapsed, view = measure(lambda: ModView.load(path).to_array())
+        print('{:>6}  {:<22} {:>12,} {:>10.1f}'.format(
+            61, 'ModView.load + array', os.path.getsize(path),
+            elapsed * 1000
+        ))
+        del view
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
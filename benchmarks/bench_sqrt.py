@@ -0,0 +1,79 @@
+"""Square roots modulo primes of each residue class and modulo composite
+numbers, against a plain Tonelli-Shanks that searches a non-residue at
+every call.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_sqrt.py``
+
+"""
+
+import random
+import timeit
+
+from mod import Mod
+
+
+NUMBER = 200
+
+CASES = [
+    ('2^127-1, 3 mod 4', 2**127 - 1),
+    ('2^255-19, 5 mod 8', 2**255 - 19),
+    ('2^64-2^32+1', 2**64 - 2**32 + 1),
+    ('7×2^120+1', 7 * 2**120 + 1),
+    ('(2^61-1)^2×2^20', (2**61 - 1)**2 * 2**20),
+]
+
+
+def tonelli_shanks(value, prime):
+    odd, shift = prime - 1, 0
+    while not odd & 1:
+        odd >>= 1
+        shift += 1
+    residue = 2
+    while pow(residue, (prime - 1) // 2, prime) != prime - 1:
+        residue += 1
+    factor = pow(residue, odd, prime)
+    root = pow(value, (odd + 1) // 2, prime)
+    error = pow(value, odd, prime)
+    while error != 1:
+        order, power = 0, error
+        while power != 1:
+            power = power * power % prime
+            order += 1
+        step = pow(factor, 1 << (shift - order - 1), prime)
+        shift = order
+        factor = step * step % prime
+        error = error * factor % prime
+        root = root * step % prime
+    return root
+
+
+def main():
+    print('{:<20} {:>12} {:>12} {:>14}'.format(
+        'modulus', 'sqrt (µs)', 'is_square', 'plain TS (µs)'
+    ))
+    for name, modulus in CASES:
+        generator = random.Random(modulus)
+        squares = [Mod(generator.randrange(modulus), modulus)**2
+                   for _ in range(NUMBER)]
+        squares[0].sqrt()
+
+        sqrt = timeit.timeit(
+            lambda: [square.sqrt() for square in squares], number=1
+        )
+        test = timeit.timeit(
+            lambda: [square.is_square() for square in squares], number=1
+        )
+        plain = 'n/a'
+        if squares[0].ring.is_prime:
+            values = [int(square) for square in squares]
+            plain = '{:.1f}'.format(timeit.timeit(
+                lambda: [tonelli_shanks(value, modulus) for value in values],
+                number=1
+            ) / NUMBER * 1e6)
+        print('{:<20} {:>12.1f} {:>12.1f} {:>14}'.format(
+            name, sqrt / NUMBER * 1e6, test / NUMBER * 1e6, plain
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Operations modulo small moduli with and without the lookup tables of
+``mod.set_tables``, including the build time of the tables.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_tables.py``
+
+"""
+
+import random
+import timeit
+
+import mod
+from mod import Mod, ModTables
+
+
+NUMBER = 5000
+
+MODULI = [97, 1009, 4093]
+
+
+def measure(statement, namespace):
+    """Seconds per execution of *statement* without and with tables,
+    measured in turns so that both see the same machine load"""
+    timer = timeit.Timer(statement, globals=namespace)
+    timings = [], []
+    for _ in range(7):
+        for index, limit in enumerate([0, 1 << 12]):
+            mod.set_tables(limit, logarithm=True)
+            timer.timeit(1)
+            timings[index].append(timer.timeit(NUMBER) / NUMBER)
+    mod.set_tables(0)
+    return min(timings[0]), min(timings[1])
+
+
+def main():
+    print('{:>6} {:<12} {:>12} {:>12}'.format(
+        'modulus', 'operation', 'plain (ns)', 'table (ns)'
+    ))
+    for modulus in MODULI:
+        generator = random.Random(modulus)
+        namespace = {
+            'a': Mod(generator.randrange(1, modulus), modulus),
+            'b': Mod(generator.randrange(1, modulus), modulus),
+            'e': generator.randrange(modulus),
+        }
+        namespace['t'] = namespace['b']**namespace['e']
+        cases = [
+            ('inverse', 'a.inverse'),
+            ('a ** e', 'a ** e'),
+            ('t.log(b)', 't.log(b)'),
+        ]
+        for name, statement in cases:
+            before, after = measure(statement, namespace)
+            print('{:>6} {:<12} {:>12,.0f} {:>12,.0f}'.format(
+                modulus, name, before * 1e9, after * 1e9
+            ))
+
+        build = timeit.timeit(
+            lambda: ModTables(modulus, logarithm=True), number=3
+        ) / 3
+        print('{:>6} {:<12} {:>12} {:>12,.0f}'.format(
+            modulus, 'build (µs)', '', build * 1e6
+        ))
+
+    # Multiplication tables in a check digit loop
+    modulus = 97
+    digits = [random.randrange(modulus) for _ in range(1000)]
+    table = ModTables(modulus, multiplication=True).multiplication
+
+    def plain():
+        total = 0
+        for digit in digits:
+            total = (total * 10 + digit) % modulus
+        return total
+
+    def lookup():
+        times = table[10]
+        total = 0
+        for digit in digits:
+            total = times[total] + digit
+            if total >= modulus:
+                total -= modulus
+        return total
+
+    assert plain() == lookup()
+    print('\nCheck digit loop of {} digits: plain {:.1f} µs, table {:.1f} '
+          'µs'.format(len(digits),
+                      min(timeit.repeat(plain, number=100)) * 1e4,
+                      min(timeit.repeat(lookup, number=100)) * 1e4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Powers with exponents much wider than the modulus, reduced with the
+Carmichael function, against the built-in ``pow``, and towers of
+exponents.
+
+Run with ``PYTHONPATH=. python benchmarks/bench_tower.py``
+
+"""
+
+import random
+import timeit
+
+from mod import Mod
+
+
+NUMBER = 20
+
+MODULI = [
+    ('2^127-1', 2**127 - 1),
+    ('2^255-19', 2**255 - 19),
+    ('10^9', 10**9),
+    ('2^64', 2**64),
+]
+
+
+def main():
+    print('{:<10} {:>10} {:>14} {:>14}'.format(
+        'modulus', 'exp bits', 'Mod (µs)', 'pow (µs)'
+    ))
+    generator = random.Random(1)
+    for name, modulus in MODULI:
+        base = Mod(generator.randrange(modulus), modulus)
+        value = int(base)
+        for bits in [10000, 100000]:
+            exponent = generator.getrandbits(bits)
+            base**exponent
+            reduced = timeit.timeit(lambda: base**exponent, number=NUMBER)
+            plain = timeit.timeit(
+                lambda: pow(value, exponent, modulus), number=NUMBER
+            )
+            print('{:<10} {:>10} {:>14.1f} {:>14.1f}'.format(
+                name, bits, reduced / NUMBER * 1e6, plain / NUMBER * 1e6
+            ))
+
+    print('\n{:<24} {:>10}'.format('tower', 'µs'))
+    for name, base, exponents in [
+        ('3^3^3^3 % 10^9', Mod(3, 10**9), [3, 3, 3]),
+        ('7^7^7^7^7 % 10^9', Mod(7, 10**9), [7, 7, 7, 7]),
+        ('2^3^4^5^6 % 2^61-1', Mod(2, 2**61 - 1), [3, 4, 5, 6]),
+    ]:
+        timing = timeit.timeit(
+            lambda: base.power_tower(*exponents), number=NUMBER
+        )
+        print('{:<24} {:>10.1f}'.format(name, timing / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
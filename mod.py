@@ -4,14 +4,711 @@ See: https://en.wikipedia.org/wiki/Modular_arithmetic
 
 """
 
-from functools import total_ordering
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
+from math import gcd
 from numbers import Number
+from operator import add, mul, sub
+from time import perf_counter
 
+try:
+    import gmpy2
+except ImportError:  # pragma: no cover
+    gmpy2 = None
 
-__version__ = "0.3.0"
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+__version__ = "0.4.0"
+
+
+# Storage backend of Mod numbers, see set_backend
+_BACKEND = 'auto'
+_GMPY2_THRESHOLD = 256
+
+
+def set_backend(backend='auto', threshold=256):
+    """Select how new :class:`Mod` numbers store their value and modulus.
+
+    * ``'int'``: Python ``int``
+    * ``'gmpy2'``: ``gmpy2.mpz``, GMP-backed integers
+    * ``'auto'``: ``gmpy2.mpz`` for moduli of at least *threshold* bits
+      when gmpy2 is installed, ``int`` otherwise
+
+    The setting applies process-wide to numbers created afterwards.
+    Whatever the backend, ``int(number)`` and ``number.modulus``
+    return a plain ``int``.
+
+    :param str backend: ``'auto'``, ``'int'`` or ``'gmpy2'``
+    :param int threshold: modulus size in bits for the ``'auto'`` backend
+    :raises ValueError: unknown backend
+    :raises ImportError: gmpy2 is requested but not installed
+    """
+    global _BACKEND, _GMPY2_THRESHOLD
+
+    if backend not in ('auto', 'int', 'gmpy2'):
+        raise ValueError("Unknown backend {!r}".format(backend))
+
+    if backend == 'gmpy2' and gmpy2 is None:
+        raise ImportError("gmpy2 backend requires gmpy2")
+
+    _BACKEND = backend
+    _GMPY2_THRESHOLD = threshold
+
+
+def set_tables(limit=1 << 12, memory=1 << 24, multiplication=False,
+               logarithm=False):
+    """Enable lookup tables for the moduli below *limit*.
+
+    Each modulus gets an inverse table, and optionally a multiplication
+    table and, for prime moduli, discrete logarithm and antilogarithm
+    tables, see :class:`ModTables`. Tables are built on first use,
+    shared by all the numbers of a modulus and evicted least recently
+    used first when they use more than *memory* bytes.
+
+    :attr:`Mod.inverse`, ``**`` and :meth:`Mod.log` use the tables.
+    Multiplying two numbers is faster than finding the multiplication
+    table, which is meant to be used directly in loops.
+
+    :param int limit: moduli below this value get tables, ``0``
+        disables them
+    :param int memory: size of the cached tables in bytes
+    :param bool multiplication: build multiplication tables, for the
+        moduli where one table fits in *memory*
+    :param bool logarithm: build logarithm tables for prime moduli
+    """
+    global _TABLE_LIMIT, _TABLE_MEMORY, _TABLE_MULTIPLICATION
+    global _TABLE_LOGARITHM, _TABLE_BYTES
+
+    _TABLE_LIMIT = limit
+    _TABLE_MEMORY = memory
+    _TABLE_MULTIPLICATION = multiplication
+    _TABLE_LOGARITHM = logarithm
+    _TABLES.clear()
+    _TABLE_BYTES = 0
+
+
+def _backend_modulus(modulus):
+    # Modulus in the storage type selected by set_backend
+    if gmpy2 is None or _BACKEND == 'int':
+        return modulus
+    if _BACKEND == 'gmpy2' or modulus.bit_length() >= _GMPY2_THRESHOLD:
+        return gmpy2.mpz(modulus)
+    return modulus
+
+
+# Window width, in bits, of the precomputed power tables
+_WINDOW_WIDTH = 4
+
+
+_SMALL_PRIMES = (
+    2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67,
+    71, 73, 79, 83, 89, 97,
+)
+
+# Miller-Rabin with the first 13 primes as witnesses is exact below this
+_DETERMINISTIC_BOUND = 3317044064679887385961981
+
+
+def _is_prime(number):
+    # Miller-Rabin, deterministic below _DETERMINISTIC_BOUND
+    if number < 2:
+        return False
+    for prime in _SMALL_PRIMES:
+        if number % prime == 0:
+            return number == prime
+
+    odd, shift = number - 1, 0
+    while not odd & 1:
+        odd >>= 1
+        shift += 1
+
+    witnesses = _SMALL_PRIMES
+    if number < _DETERMINISTIC_BOUND:
+        witnesses = _SMALL_PRIMES[:13]
+    for witness in witnesses:
+        value = pow(witness, odd, number)
+        if value == 1 or value == number - 1:
+            continue
+        for _ in range(shift - 1):
+            value = value * value % number
+            if value == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_brent(number):
+    # Finds a non-trivial factor of an odd composite number
+    for constant in range(1, number):
+        value = saved = 2
+        factor = power = 1
+        while factor == 1:
+            saved = value
+            for _ in range(power):
+                value = (value * value + constant) % number
+            step = 0
+            while step < power and factor == 1:
+                product = 1
+                for _ in range(min(128, power - step)):
+                    value = (value * value + constant) % number
+                    product = product * abs(saved - value) % number
+                factor = gcd(product, number)
+                step += 128
+            power *= 2
+        if factor != number:
+            return factor
+    return number
+
+
+def _integer_root(number, degree):
+    # Largest integer whose *degree*-th power does not exceed number
+    if number < 2:
+        return number
+    root = 1 << -(-number.bit_length() // degree)
+    while True:
+        power = root**(degree - 1)
+        smaller = ((degree - 1) * root + number // power) // degree
+        if smaller >= root:
+            return root
+        root = smaller
+
+
+def _perfect_power(number):
+    # (root, degree) with the largest degree such that root^degree == number
+    for degree in range(number.bit_length(), 1, -1):
+        root = _integer_root(number, degree)
+        if root > 1 and root**degree == number:
+            return root, degree
+    return number, 1
+
+
+def _factorize(number):
+    # Prime factorization of a positive integer, as {prime: exponent}
+    factors = {}
+    for prime in _SMALL_PRIMES:
+        while number % prime == 0:
+            factors[prime] = factors.get(prime, 0) + 1
+            number //= prime
+
+    pending = [number] if number > 1 else []
+    while pending:
+        number = pending.pop()
+        root, degree = _perfect_power(number)
+        if _is_prime(root):
+            factors[root] = factors.get(root, 0) + degree
+            continue
+        factor = _pollard_brent(root)
+        pending += [factor, root // factor] * degree
+    return dict(sorted(factors.items()))
+
+
+# Exponents this many times wider than a modulus of unknown factorization
+# pay for a primality test, or a factorization of small moduli, to be
+# reduced with the Carmichael function
+_EXPONENT_REDUCTION_FACTOR = 32
+
+# Moduli up to this size are always factored to reduce huge exponents,
+# larger ones only when they are a prime times small primes
+_CHEAP_FACTOR_BITS = 32
+
+
+def _cheaply_factored(ring):
+    # Whether the factorization of the ring modulus is known or quick to
+    # find: small moduli, or a prime times small primes
+    modulus = abs(int(ring._modulus))
+    if ring._factorization is not None or \
+            modulus.bit_length() <= _CHEAP_FACTOR_BITS:
+        return True
+
+    rest = modulus
+    for prime in _SMALL_PRIMES:
+        while rest % prime == 0:
+            rest //= prime
+    if rest == modulus:
+        return ring.is_prime
+    return rest == 1 or _is_prime(rest)
+
+
+def _reduce_exponent(exponent, modulus):
+    # Smaller exponent raising every base to the same power modulo
+    # modulus, the exponent itself when the Carmichael function of
+    # modulus is unknown and too costly to find
+    if exponent < 0:
+        return -_reduce_exponent(-exponent, modulus)
+
+    ring = _RINGS.get(modulus)
+    if ring is None or ring._carmichael is None:
+        bits = abs(modulus).bit_length()
+        if exponent.bit_length() < _EXPONENT_REDUCTION_FACTOR * bits:
+            return exponent
+        ring = ModRing(modulus)
+        if not _cheaply_factored(ring):
+            return exponent
+
+    order = ring.carmichael
+    # Powers of bases sharing prime factors with the modulus only cycle
+    # once the exponent reaches the largest exponent of these primes
+    threshold = max(ring._factorization.values(), default=0)
+    if exponent < threshold + order:
+        return exponent
+    return threshold + (exponent - threshold) % order
+
+
+def _tower_floor(exponents, bound):
+    # min(e1^e2^...^ek, bound) without building the whole tower
+    result = exponents[-1]
+    for base in reversed(exponents[:-1]):
+        if result == 0:
+            result = 1
+        elif base < 2:
+            result = base
+        elif (base.bit_length() - 1) * result >= bound.bit_length():
+            # base^result >= 2^((bits - 1) × result) > bound
+            result = bound
+        else:
+            result = min(base**result, bound)
+    return min(result, bound)
+
+
+def _tower(exponents, modulus):
+    # e1^e2^...^ek % modulus, for a positive modulus
+    if modulus == 1:
+        return 0
+    if len(exponents) == 1:
+        return exponents[0] % modulus
+
+    # Exact exponents up to the size __pow__ leaves unreduced
+    bound = 1 << (_EXPONENT_REDUCTION_FACTOR * modulus.bit_length())
+    exponent = _tower_floor(exponents[1:], bound)
+    if exponent < bound:
+        return pow(exponents[0], exponent, modulus)
+
+    ring = ModRing(modulus)
+    if ring._carmichael is None and not _cheaply_factored(ring):
+        raise ValueError(
+            "Tower exponent too large to compute exactly and {} cannot be "
+            "factored cheaply to reduce it".format(modulus)
+        )
+    # The exponent is only needed modulo the Carmichael function, past
+    # the threshold where powers of non-units become periodic
+    order = ring.carmichael
+    threshold = max(ring._factorization.values())
+    exponent = _tower(exponents[1:], order)
+    exponent = threshold + (exponent - threshold) % order
+    return pow(exponents[0], exponent, modulus)
+
+
+# Baby-step tables hold at most this many entries, logarithms in larger
+# subgroups of prime order use Pollard's rho instead
+_BABY_STEP_SIZE = 1 << 16
+
+# Total number of baby-step entries kept by the cache of tables
+_BABY_STEP_CACHE_SIZE = 1 << 18
+
+_BABY_STEPS = OrderedDict()
+_BABY_STEP_ENTRIES = 0
+
+
+def _baby_steps(generator, order, modulus):
+    # (table of generator^j -> j, generator^-size, size), cached per
+    # generator, evicted least recently used first
+    global _BABY_STEP_ENTRIES
+
+    key = generator, order, modulus
+    entry = _BABY_STEPS.get(key)
+    if entry is not None:
+        _BABY_STEPS.move_to_end(key)
+        return entry
+
+    size = _integer_root(order - 1, 2) + 1
+    table = {}
+    value = 1 % modulus
+    for index in range(size):
+        table.setdefault(value, index)
+        value = value * generator % modulus
+    entry = table, Mod._new(value, modulus).inverse._value, size
+
+    _BABY_STEPS[key] = entry
+    _BABY_STEP_ENTRIES += size
+    while _BABY_STEP_ENTRIES > _BABY_STEP_CACHE_SIZE and len(_BABY_STEPS) > 1:
+        _, (_, _, evicted) = _BABY_STEPS.popitem(last=False)
+        _BABY_STEP_ENTRIES -= evicted
+    return entry
+
+
+def _bsgs_log(generator, target, order, modulus):
+    # Baby-step giant-step, None when target is not a power of generator
+    table, giant, size = _baby_steps(generator, order, modulus)
+    value = target
+    for step in range(0, order, size):
+        index = table.get(value)
+        if index is not None:
+            return step + index
+        value = value * giant % modulus
+    return None
+
+
+def _rho_log(generator, target, order, modulus):
+    # Pollard's rho for a generator of prime order, None on failure
+    def walk(value, left, right):
+        # Pseudo-random step keeping value == generator^left × target^right
+        branch = value % 3
+        if branch == 0:
+            return value * value % modulus, 2 * left % order, \
+                2 * right % order
+        if branch == 1:
+            return value * generator % modulus, (left + 1) % order, right
+        return value * target % modulus, left, (right + 1) % order
+
+    for attempt in range(1, 33):
+        left, right = attempt * 7919 % order, attempt * 104729 % order
+        value = pow(generator, left, modulus) * \
+            pow(target, right, modulus) % modulus
+        fast = value, left, right
+        slow = fast
+        while True:
+            slow = walk(*slow)
+            fast = walk(*walk(*fast))
+            if slow[0] == fast[0]:
+                break
+        denominator = (fast[2] - slow[2]) % order
+        if denominator:
+            inverse = Mod._new(denominator, order).inverse._value
+            return (slow[1] - fast[1]) * inverse % order
+    return None
+
+
+def _prime_order_log(generator, target, order, modulus):
+    # Logarithm in a subgroup of prime order
+    if target == 1 % modulus:
+        return 0
+    if order < 64:
+        # Tiny subgroups are cheaper to scan than to tabulate
+        value = generator
+        for exponent in range(1, order):
+            if value == target:
+                return exponent
+            value = value * generator % modulus
+        return None
+    if _integer_root(order, 2) < _BABY_STEP_SIZE:
+        return _bsgs_log(generator, target, order, modulus)
+    result = _rho_log(generator, target, order, modulus)
+    if result is None or pow(generator, result, modulus) != target:
+        return None
+    return result
+
+
+def _discrete_log(base, target, factors, modulus):
+    # Pohlig-Hellman: x with base^x == target, *factors* is the
+    # factorization of the order of base
+    value, order = 0, 1
+    for prime, exponent in factors.items():
+        power = prime**exponent
+        cofactor = 1
+        for other, count in factors.items():
+            if other != prime:
+                cofactor *= other**count
+
+        # Subgroup of order prime^exponent, solved one digit at a time
+        generator = pow(base, cofactor, modulus)
+        inverse = Mod._new(generator, modulus).inverse._value
+        element = pow(target, cofactor, modulus)
+        gamma = pow(generator, power // prime, modulus)
+        digits = 0
+        for index in range(exponent):
+            shifted = element * pow(inverse, digits, modulus) % modulus
+            digit = _prime_order_log(
+                gamma, pow(shifted, power // prime**(index + 1), modulus),
+                prime, modulus,
+            )
+            if digit is None:
+                return None
+            digits += digit * prime**index
+        value, order = _crt_merge(value, order, digits, power)
+    return value
+
+
+def _cipolla(value, prime):
+    # Square root of a quadratic residue modulo an odd prime, computed
+    # as (t + w)^((p + 1) / 2) in F_p(w) with w² = t² - value
+    # a non-residue
+    base = 1
+    while pow((base * base - value) % prime, (prime - 1) // 2, prime) != \
+            prime - 1:
+        base += 1
+    square = (base * base - value) % prime
+
+    # (left + right × w)^exponent by square-and-multiply
+    left, right = 1, 0
+    power_left, power_right = base, 1
+    exponent = (prime + 1) // 2
+    while exponent:
+        if exponent & 1:
+            left, right = (
+                (left * power_left + right * power_right * square) % prime,
+                (left * power_right + right * power_left) % prime,
+            )
+        power_left, power_right = (
+            (power_left * power_left + power_right * power_right * square)
+            % prime,
+            2 * power_left * power_right % prime,
+        )
+        exponent >>= 1
+    return left
+
+
+def _tonelli_shanks(value, prime):
+    # Square root of a quadratic residue modulo an odd prime
+    odd, shift, factor = ModRing(prime)._square_root_constants()
+    if shift * shift > 24 * prime.bit_length():
+        # Long chains of squarings: Cipolla's cost does not depend
+        # on the power of 2 dividing p - 1
+        return _cipolla(value, prime)
+
+    root = pow(value, (odd + 1) // 2, prime)
+    error = pow(value, odd, prime)
+    while error != 1:
+        # Smallest order 2^order of the error
+        order, power = 0, error
+        while power != 1:
+            power = power * power % prime
+            order += 1
+        step = pow(factor, 1 << (shift - order - 1), prime)
+        shift = order
+        factor = step * step % prime
+        error = error * factor % prime
+        root = root * step % prime
+    return root
+
+
+def _sqrt_prime(value, prime):
+    # Square root modulo a prime, None for non-residues
+    value %= prime
+    if value == 0 or prime == 2:
+        return value
+
+    if prime % 4 == 3:
+        root = pow(value, (prime + 1) // 4, prime)
+    elif prime % 8 == 5:
+        # Atkin's formula
+        half = pow(2 * value, (prime - 5) // 8, prime)
+        imaginary = 2 * value * half * half % prime
+        root = value * half * (imaginary - 1) % prime
+    elif pow(value, (prime - 1) // 2, prime) != 1:
+        return None
+    else:
+        root = _tonelli_shanks(value, prime)
+    return root if root * root % prime == value else None
+
+
+def _sqrt_unit(value, prime, exponent):
+    # Square root of a unit modulo prime^exponent, None for non-residues
+    modulus = prime**exponent
+    if prime == 2:
+        if exponent >= 3 and value % 8 != 1 or \
+                exponent == 2 and value % 4 != 1:
+            return None
+        # Lift a root of value modulo 2^(bits + 1) one bit at a time
+        root = 1
+        for bits in range(3, exponent):
+            if (root * root - value) % (2 << bits):
+                root += 1 << (bits - 1)
+        return root % modulus
+
+    root = _sqrt_prime(value, prime)
+    if root is None:
+        return None
+
+    # Hensel lifting, the precision doubles at each step
+    precision = prime
+    while precision < modulus:
+        precision = min(precision * precision, modulus)
+        inverse = Mod._new(2 * root % precision, precision).inverse._value
+        root = (root - (root * root - value) * inverse) % precision
+    return root
+
+
+def _sqrt_prime_power(value, prime, exponent):
+    # Square root modulo prime^exponent, None for non-residues
+    modulus = prime**exponent
+    value %= modulus
+    if value == 0:
+        return 0
+
+    # value = prime^valuation × unit, the valuation must be even
+    valuation = 0
+    while value % prime == 0:
+        value //= prime
+        valuation += 1
+    if valuation % 2:
+        return None
+
+    root = _sqrt_unit(value, prime, exponent - valuation)
+    if root is None:
+        return None
+    root = root * prime**(valuation // 2) % modulus
+    return min(root, -root % modulus)
+
+
+# Lazy accumulators reduce their value once it grows this many times
+# wider than the modulus
+_LAZY_FACTOR = 4
+
+# Above this modulus size, multiplying wide values costs more than
+# reducing them: lazy functions reduce every product
+_LAZY_WIDE_BITS = 1024
+
+
+def _extended_gcd(value, modulus):
+    # gcd of value and modulus, Bézout coefficient of value
+    # and number of division steps
+    t_value = 0
+    new_t = 1
+    r_value = abs(modulus)
+    new_r = value % r_value
+    steps = 0
+    while True:
+        if new_r == 0:
+            return [r_value, t_value, steps]
+        quotient = r_value // new_r
+        t_value, new_t = new_t, t_value - quotient * new_t
+        r_value, new_r = new_r, r_value - quotient * new_r
+        steps += 1
+
+
+def _has_native_inverse():
+    # pow(value, -1, modulus) computes modular inverses since Python 3.8
+    try:
+        return pow(2, -1, 3) == 2
+    except ValueError:
+        return False
+
+
+_NATIVE_INVERSE = _has_native_inverse()
+
+
+def _batch_invert(values, modulus):
+    # Montgomery's trick on reduced ints, None for non-invertible values
+    count = len(values)
+    if not count:
+        return []
+
+    prefix = [0] * count
+    product = 1
+    for index, value in enumerate(values):
+        prefix[index] = product
+        product = product * value % modulus
+
+    try:
+        inverse = Mod._new(product, modulus).inverse._value
+    except ValueError:
+        # The product of invertible values is invertible, so at least
+        # one value is not and the recursion is on a shorter list
+        invertible = [gcd(value, modulus) == 1 for value in values]
+        results = [None] * count
+        chosen = [index for index in range(count) if invertible[index]]
+        for index, value in zip(
+                chosen, _batch_invert([values[i] for i in chosen], modulus)):
+            results[index] = value
+        return results
+
+    results = [0] * count
+    for index in range(count - 1, -1, -1):
+        results[index] = inverse * prefix[index] % modulus
+        inverse = inverse * values[index] % modulus
+    return results
+
+
+def _common_values(numbers, modulus, reduce=True):
+    # Values of int or Mod numbers that share the same modulus,
+    # the modulus defaults to the one of the first Mod
+    numbers = list(numbers)
+    if modulus is None:
+        for number in numbers:
+            if isinstance(number, Mod):
+                modulus = number._modulus
+                break
+        else:
+            if numbers:
+                raise ValueError("Modulus is missing")
+            return [], None
+
+    values = []
+    for number in numbers:
+        if isinstance(number, Mod):
+            if number._modulus != modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        modulus, number._modulus
+                    )
+                )
+            values.append(number._value)
+        elif reduce:
+            values.append(int(number) % modulus)
+        else:
+            values.append(int(number))
+    return values, modulus
+
+
+def _residue_width(modulus):
+    # Bytes needed to store the residues modulo *modulus*
+    return ((abs(modulus) - 1).bit_length() + 7) // 8 or 1
+
+
+def _restore_mod(value, modulus):
+    # Rebuilds pickled Mod numbers
+    modulus = _backend_modulus(modulus)
+    return Mod._new(value % modulus, modulus)
+
+
+def _crt_merge(value, modulus, other_value, other_modulus):
+    # Solves x ≡ value (mod modulus) and x ≡ other_value (mod other_modulus)
+    divisor = gcd(modulus, other_modulus)
+    difference = other_value - value
+    if difference % divisor:
+        raise ValueError(
+            "Incompatible congruences: {} % {} and {} % {}".format(
+                value, modulus, other_value, other_modulus
+            )
+        )
+
+    other_modulus //= divisor
+    factor = Mod._new(modulus // divisor % other_modulus, other_modulus)
+    step = difference // divisor * factor.inverse._value % other_modulus
+    modulus *= other_modulus
+    return (value + (modulus // other_modulus) * step) % modulus, modulus
+
+
+# Residues below this bound are shared by Mod.interned
+_INTERN_SIZE = 1 << 12
+
+# Number of moduli with a pool of interned numbers
+_INTERN_MODULI = 1 << 8
+
+_INTERNED = OrderedDict()
+
+
+def _intern_pool(modulus):
+    # Interned numbers of a modulus indexed by the absolute value of their
+    # residue, pools are evicted least recently used first
+    pool = _INTERNED.get(modulus)
+    if pool is None:
+        pool = _INTERNED[modulus] = [None] * min(abs(modulus), _INTERN_SIZE)
+        if len(_INTERNED) > _INTERN_MODULI:
+            _INTERNED.popitem(last=False)
+    return pool
 
 
-@total_ordering
 class Mod:
     """Integer number that automatically adds a modulus
     to arithmetic operations.
@@ -19,6 +716,11 @@ class Mod:
     The floor division ``//`` implements the inverse of a multiplication
     with a modulus. Therefore, it should be used with care to avoid errors.
 
+    Mod numbers are equal when they share the modulus and the residue.
+    Compared with other numbers, a Mod number acts as its residue: it
+    equals and hashes like ``5`` for ``Mod(5, 7)``, not like ``12``.
+    Ordering numbers of different moduli raises :class:`ValueError`.
+
     >>> number = Mod(2, 3)
     >>> number
     (2 % 3)
@@ -32,7 +734,14 @@ class Mod:
     :raises ValueError: one of the parameters is not a number or *modulus* == 0
     """
 
+    __slots__ = ('_value', '_modulus')
+
     def __init__(self, value, modulus):
+        if type(value) is int and type(modulus) is int and modulus:
+            self._modulus = _backend_modulus(modulus)
+            self._value = value % self._modulus
+            return
+
         if not isinstance(value, Number):
             raise ValueError("Value is not a number")
 
@@ -45,28 +754,49 @@ class Mod:
         if modulus != int(modulus):
             raise ValueError("Modulus is not an integer")
 
-        self._modulus = int(modulus)
+        self._modulus = _backend_modulus(int(modulus))
         self._value = int(value) % self._modulus
 
+    @classmethod
+    def _new(cls, value, modulus):
+        # Unchecked constructor: *value* must already be reduced
+        # and *modulus* must be a valid non-zero int
+        number = object.__new__(cls)
+        number._value = value
+        number._modulus = modulus
+        return number
+
     def __repr__(self):
         return "({} % {})".format(self._value, self._modulus)
 
     def __int__(self):
-        return self._value
+        return int(self._value)
 
     def __float__(self):
         return float(self._value)
 
     def __hash__(self):
+        # Same hash as the residue, the only int that compares equal
         return hash(self._value)
 
+    def __reduce__(self):
+        return _restore_mod, (int(self._value), int(self._modulus))
+
     @property
     def modulus(self):
         """Modulus value
 
         :rtype: int
         """
-        return self._modulus
+        return int(self._modulus)
+
+    @property
+    def ring(self):
+        """Ring of the integers modulo :attr:`modulus`
+
+        :rtype: ModRing
+        """
+        return ModRing(self._modulus)
 
     def copy(self, modulus=None):
         """Copy the Mod number
@@ -74,19 +804,49 @@ class Mod:
         :param int modulus: modulus of the new Mod number
         :rtype: Mod
         """
-        return Mod(self._value, modulus if modulus else self._modulus)
+        if not modulus:
+            return self._new(self._value, self._modulus)
+        return Mod(self._value, modulus)
 
     def _extended_gcd(self):
-        t_value = 0
-        new_t = 1
-        r_value = self._modulus
-        new_r = self._value
-        while True:
-            if new_r == 0:
-                return [r_value, t_value]
-            quotient = r_value // new_r
-            t_value, new_t = new_t, t_value - quotient * new_t
-            r_value, new_r = new_r, r_value - quotient * new_r
+        return _extended_gcd(self._value, self._modulus)[:2]
+
+    @classmethod
+    def interned(cls, value, modulus):
+        """Shared instance of ``Mod(value, modulus)``.
+
+        Like the small ``int`` cache of CPython, numbers with a residue
+        below 4096 in absolute value are kept in a pool per modulus and
+        returned again for the same value. The pools of the 256 most
+        recently used moduli are kept. Mod numbers are immutable:
+        operators and :meth:`copy` return new numbers, interned or not.
+
+        >>> Mod.interned(10, 7) is Mod.interned(3, 7)
+        True
+        >>>
+
+        :param int value: Mod number value
+        :param int modulus: modulus associated with the value
+        :rtype: Mod
+        :raises ValueError: one of the parameters is not a number or
+            *modulus* == 0
+        """
+        pool = _INTERNED.get(modulus)
+        if pool is not None and type(value) is int and \
+                type(modulus) is int:
+            _INTERNED.move_to_end(modulus)
+            index = abs(value % modulus)
+            if index < len(pool) and pool[index] is not None:
+                return pool[index]
+
+        number = cls(value, modulus)
+        index = abs(number._value)
+        if index >= _INTERN_SIZE:
+            return number
+        pool = _intern_pool(number._modulus)
+        if pool[index] is None:
+            pool[index] = number
+        return pool[index]
 
     @property
     def inverse(self):
@@ -98,132 +858,4223 @@ class Mod:
             y × x ≡ 1 (mod. n)
 
         :rtype: Mod
+        :raises ValueError: the number cannot be inverted
         """
+        modulus = self._modulus
+        if 0 < modulus < _TABLE_LIMIT:
+            value = _lookup_tables(modulus).inverse[self._value]
+            if value is None:
+                raise ValueError(
+                    "the value {} cannot be inverted".format(self)
+                )
+            return self._new(value, modulus)
+
+        if _NATIVE_INVERSE:
+            try:
+                value = pow(self._value, -1, self._modulus)
+            except ValueError:
+                raise ValueError(
+                    "the value {} cannot be inverted".format(self)
+                ) from None
+            return self._new(value, self._modulus)
+
         r_value, t_value = self._extended_gcd()
         if r_value != 1:
             raise ValueError("the value {} cannot be inverted".format(self))
 
-        value = t_value + (self._modulus if t_value < 0 else 0)
-        return Mod(value, self._modulus)
+        return self._new(t_value % self._modulus, self._modulus)
 
-    # Comparison operators
+    @classmethod
+    def batch_inverse(cls, numbers, modulus=None):
+        """Modular inverses of many numbers sharing the same modulus.
 
-    def __eq__(self, other):
-        if not isinstance(other, Number):
-            return False
+        Uses Montgomery's trick: a single inversion and about
+        ``3 × n`` multiplications for ``n`` numbers.
+        Unlike :attr:`inverse`, values that cannot be inverted
+        do not raise, their inverse is ``None``.
 
-        if isinstance(other, Mod):
-            modulus = min((self._modulus, other._modulus))
-        else:
-            modulus = self._modulus
-        return int(self) % modulus == int(other) % modulus
+        >>> Mod.batch_inverse([Mod(2, 9), Mod(3, 9), Mod(4, 9)])
+        [(5 % 9), None, (7 % 9)]
+        >>>
 
-    def __lt__(self, other):
-        if not isinstance(other, Number):
-            return False
+        :param numbers: iterable of ``int`` or :class:`Mod`
+        :param int modulus: modulus of the ``int`` numbers,
+            defaults to the modulus of the first :class:`Mod`
+        :rtype: list
+        :raises ValueError: the numbers do not share the same modulus
+        """
+        values, modulus = _common_values(numbers, modulus)
+        return [
+            None if value is None else cls._new(value, modulus)
+            for value in _batch_invert(values, modulus)
+        ]
 
-        if isinstance(other, Mod):
-            modulus = min((self._modulus, other._modulus))
-        else:
-            modulus = self._modulus
-        return int(self) % modulus < int(other) % modulus
+    @classmethod
+    def crt(cls, *numbers):
+        """Chinese remainder theorem: the number congruent to each of
+        the *numbers* modulo their own modulus.
 
-    # Arithmetic operations
+        The moduli do not need to be coprime, the result modulus is
+        their least common multiple.
 
-    def __pos__(self):
-        return self.copy()
+        >>> Mod.crt(Mod(2, 3), Mod(3, 5), Mod(2, 7))
+        (23 % 105)
+        >>> Mod.crt(Mod(3, 4), Mod(5, 6))
+        (11 % 12)
+        >>>
 
-    def __neg__(self):
-        return Mod(-self._value, self._modulus)
+        :param numbers: :class:`Mod` numbers to combine
+        :rtype: Mod
+        :raises ValueError: no numbers or incompatible congruences
+        """
+        if not numbers:
+            raise ValueError("No number to combine")
 
-    def _convert(self, other):
-        if isinstance(other, Mod):
-            if other._modulus != self._modulus:
+        value, modulus = 0, 1
+        for number in numbers:
+            if not isinstance(number, Mod):
+                raise ValueError("{!r} is not a Mod number".format(number))
+            value, modulus = _crt_merge(
+                value, modulus, int(number._value), abs(int(number._modulus))
+            )
+        return cls(value, modulus)
+
+    def split(self, moduli=None):
+        """Residues of the number modulo divisors of its modulus,
+        the reverse of :meth:`crt`.
+
+        >>> Mod(23, 105).split()
+        ((2 % 3), (3 % 5), (2 % 7))
+        >>>
+
+        :param moduli: divisors of the modulus,
+            defaults to its prime power factors
+        :rtype: tuple
+        :raises ValueError: one of the moduli does not divide the modulus
+        """
+        modulus = abs(int(self._modulus))
+        if moduli is None:
+            moduli = [
+                prime**exponent
+                for prime, exponent in self.ring.factorization.items()
+            ]
+
+        numbers = []
+        for divisor in moduli:
+            if not divisor or modulus % divisor:
                 raise ValueError(
-                    "Not same modulus: {} != {}".format(
-                        self._modulus, other._modulus
-                    )
+                    "{} does not divide {}".format(divisor, modulus)
                 )
-            return other
+            numbers.append(Mod(self._value, divisor))
+        return tuple(numbers)
 
-        if isinstance(other, int):
-            return Mod(other, self._modulus)
+    @classmethod
+    def multi_pow(cls, *pairs):
+        """Product of powers ``a^x × b^y × ...`` in one interleaved pass.
 
-        return None
+        The squarings are shared by all the bases, and each base only
+        adds one multiplication per window of its exponent.
 
-    def __add__(self, other):
-        converted = self._convert(other)
-        if converted is None:
-            return self._value + other
+        >>> Mod.multi_pow((Mod(2, 101), 10), (Mod(3, 101), 20))
+        (65 % 101)
+        >>>
 
-        return Mod(self._value + converted._value, self._modulus)
+        :param pairs: ``(base, exponent)`` pairs, the bases are
+            :class:`Mod` numbers with the same modulus
+        :rtype: Mod
+        :raises ValueError: no pairs or bases with different moduli
+        """
+        if not pairs:
+            raise ValueError("No power to compute")
 
-    __radd__ = __add__
+        # Every base is checked before any modulus is read
+        bases = [base for base, _ in pairs]
+        if not all(isinstance(base, Mod) for base in bases) or \
+                len({base._modulus for base in bases}) != 1:
+            raise ValueError("Bases must share the same modulus")
+        modulus = bases[0]._modulus
 
-    def __sub__(self, other):
-        converted = self._convert(other)
-        if converted is None:
-            return self._value - other
+        tables = []
+        exponents = []
+        for base, exponent in pairs:
+            exponent = int(exponent)
+            if exponent < 0:
+                base, exponent = base.inverse, -exponent
 
-        return Mod(self._value - converted._value, self._modulus)
+            # base^0 ... base^(2^w - 1)
+            table = [1 % modulus, base._value]
+            for _ in range(2, 1 << _WINDOW_WIDTH):
+                table.append(table[-1] * base._value % modulus)
+            tables.append(table)
+            exponents.append(exponent)
 
-    def __rsub__(self, other):
-        return -self + other
+        mask = (1 << _WINDOW_WIDTH) - 1
+        width = max(exponent.bit_length() for exponent in exponents)
+        start = (width - 1) // _WINDOW_WIDTH * _WINDOW_WIDTH
+        result = 1 % modulus
+        for shift in range(start, -1, -_WINDOW_WIDTH):
+            for _ in range(_WINDOW_WIDTH if shift != start else 0):
+                result = result * result % modulus
+            for table, exponent in zip(tables, exponents):
+                digit = (exponent >> shift) & mask
+                if digit:
+                    result = result * table[digit] % modulus
+        return cls._new(result, modulus)
 
-    def __mul__(self, other):
-        converted = self._convert(other)
-        if converted is None:
-            return self._value * other
+    @classmethod
+    def sum(cls, numbers, modulus=None):
+        """Sum of many numbers, reduced once at the end.
 
-        return Mod(self._value * converted._value, self._modulus)
+        >>> Mod.sum([Mod(5, 7), 4, Mod(6, 7)])
+        (1 % 7)
+        >>>
 
-    __rmul__ = __mul__
+        :param numbers: iterable of ``int`` or :class:`Mod`
+        :param int modulus: modulus of the ``int`` numbers,
+            defaults to the modulus of the first :class:`Mod`
+        :rtype: Mod
+        :raises ValueError: the numbers do not share the same modulus
+        """
+        values, modulus = _common_values(numbers, modulus, reduce=False)
+        if modulus is None:
+            raise ValueError("Modulus is missing")
+        return cls._new(sum(values) % modulus, modulus)
 
-    def __truediv__(self, other):
-        return float(self) / float(other)
+    @classmethod
+    def prod(cls, numbers, modulus=None):
+        """Product of many numbers, reduced only when the running product
+        grows much wider than the modulus.
 
-    def __rtruediv__(self, other):
-        return float(other) / float(self)
+        >>> Mod.prod([Mod(5, 7), 4, Mod(6, 7)])
+        (1 % 7)
+        >>>
 
-    def __floordiv__(self, other):
-        converted = self._convert(other)
-        if converted is None:
-            return self._value // other
+        :param numbers: iterable of ``int`` or :class:`Mod`
+        :param int modulus: modulus of the ``int`` numbers,
+            defaults to the modulus of the first :class:`Mod`
+        :rtype: Mod
+        :raises ValueError: the numbers do not share the same modulus
+        """
+        values, modulus = _common_values(numbers, modulus)
+        if modulus is None:
+            raise ValueError("Modulus is missing")
 
-        if converted._value == 0:
-            raise ZeroDivisionError(
-                'integer division by {}'.format(converted)
+        limit = _LAZY_FACTOR * modulus.bit_length()
+        result = 1
+        for value in values:
+            result *= value
+            if result.bit_length() > limit:
+                result %= modulus
+        return cls._new(result % modulus, modulus)
+
+    @classmethod
+    def dot(cls, left, right, modulus=None):
+        """Inner product ``x0 × y0 + x1 × y1 + ...``, reduced once
+        at the end.
+
+        >>> Mod.dot([Mod(1, 7), 2, 3], [4, 5, 6])
+        (4 % 7)
+        >>>
+
+        :param left: iterable of ``int`` or :class:`Mod`
+        :param right: iterable of ``int`` or :class:`Mod`
+        :param int modulus: modulus of the ``int`` numbers,
+            defaults to the modulus of the first :class:`Mod`
+        :rtype: Mod
+        :raises ValueError: the numbers do not share the same modulus
+            or the iterables have different lengths
+        """
+        left, right = list(left), list(right)
+        if len(left) != len(right):
+            raise ValueError(
+                "Not same length: {} != {}".format(len(left), len(right))
             )
 
-        inverted = (other * self.inverse)
-        return inverted.inverse
+        values, modulus = _common_values(left + right, modulus, reduce=False)
+        if modulus is None:
+            raise ValueError("Modulus is missing")
+        size = len(left)
+        return cls._new(
+            sum(map(mul, values[:size], values[size:])) % modulus, modulus
+        )
 
-    def __rfloordiv__(self, other):
-        converted = self._convert(other)
-        if converted is None:
-            return other // self._value
+    def log(self, base):
+        """Discrete logarithm: the smallest non-negative *x* such that
+        ``base ** x == self``.
 
-        return converted * self.inverse
+        The order of *base* is split in prime powers (Pohlig-Hellman).
+        Logarithms in small prime subgroups use baby-step giant-step
+        tables that are cached per base, larger ones Pollard's rho.
+        The modulus must be small enough to be factored.
 
-    def __pow__(self, other):
-        converted = self._convert(other)
+        >>> Mod(13, 1000003).log(2)
+        511564
+        >>>
+
+        :param base: ``int`` or :class:`Mod` base
+        :rtype: int
+        :raises ValueError: *base* is not invertible, has another
+            modulus or the number is not a power of *base*
+        """
+        converted = self._convert(base)
         if converted is None:
-            return self._value ** other
+            raise ValueError("{!r} is not a valid base".format(base))
 
-        if isinstance(other, Mod):
-            result = pow(self._value, other._value, self._modulus)
-        else:
-            result = pow(self._value, other, self._modulus)
+        modulus = abs(int(self._modulus))
+        base = int(converted._value) % modulus
+        target = int(self._value) % modulus
+        if gcd(base, modulus) != 1:
+            raise ValueError("Base {} is not invertible".format(converted))
+
+        tables = _lookup_tables(modulus) if modulus < _TABLE_LIMIT else None
+        if tables is not None and tables.log is not None:
+            result = _table_log(tables, base, target)
+            if result is None:
+                raise ValueError(
+                    "{} is not a power of {}".format(self, converted)
+                )
+            return result
 
-        return Mod(result, self._modulus)
+        # Order of the base, from the exponent of the group
+        factors = self.ring.carmichael_factorization
+        order = self.ring.carmichael
+        for prime, exponent in list(factors.items()):
+            while factors[prime] and \
+                    pow(base, order // prime, modulus) == 1:
+                order //= prime
+                factors[prime] -= 1
+        factors = {
+            prime: exponent for prime, exponent in factors.items() if exponent
+        }
 
-    def __rpow__(self, other):
-        converted = self._convert(other)
-        if converted is None:
-            return pow(other, self._value, self._modulus)
+        result = _discrete_log(base, target, factors, modulus)
+        if result is None or pow(base, result, modulus) != target:
+            raise ValueError(
+                "{} is not a power of {}".format(self, converted)
+            )
+        return result
 
-        result = pow(converted._value, self._value, self._modulus)
-        return Mod(result, self._modulus)
+    def power_tower(self, *exponents):
+        """Raise the number to a tower of exponents,
+        ``self ** (e1 ** (e2 ** ...))``, from the top down.
 
+        Towers whose exponent stays below ``2^(32 × bits)`` for a modulus
+        of *bits* bits are computed exactly. Larger ones are reduced
+        level by level modulo the Carmichael function of the level
+        below, the huge intermediate integers are never built. Only
+        then is the chain of moduli factored, each of them must be
+        small or a prime times small primes.
 
-Number.register(Mod)
+        >>> Mod(3, 1000).power_tower(3, 3, 3)
+        (387 % 1000)
+        >>> Mod(2, 100).power_tower(10, 10**100)
+        (76 % 100)
+        >>>
+
+        :param exponents: non-negative ``int`` or :class:`Mod` exponents
+        :rtype: Mod
+        :raises ValueError: an exponent is negative, or the tower needs
+            a reduction modulo a number that cannot be factored cheaply
+        """
+        exponents = [int(exponent) for exponent in exponents]
+        if any(exponent < 0 for exponent in exponents):
+            raise ValueError("Negative exponent in tower: {}".format(
+                exponents
+            ))
+
+        modulus = self._modulus
+        value = _tower([int(self._value)] + exponents, abs(int(modulus)))
+        return self._new(value % modulus, modulus)
+
+    def is_square(self):
+        """Whether the number is a quadratic residue, the square of
+        another number modulo the same modulus
+
+        >>> Mod(2, 7).is_square(), Mod(3, 7).is_square()
+        (True, False)
+        >>>
+
+        :rtype: bool
+        """
+        modulus = abs(int(self._modulus))
+        value = int(self._value) % modulus
+        if modulus > 2 and self.ring.is_prime:
+            # Euler's criterion
+            return value == 0 or \
+                pow(value, (modulus - 1) // 2, modulus) == 1
+        return self._sqrt() is not None
+
+    def _sqrt(self):
+        modulus = abs(int(self._modulus))
+        value = int(self._value) % modulus
+        if self.ring.is_prime:
+            root = _sqrt_prime(value, modulus)
+            return root if root is None else min(root, modulus - root)
+
+        root, order = 0, 1
+        for prime, exponent in self.ring.factorization.items():
+            part = _sqrt_prime_power(value, prime, exponent)
+            if part is None:
+                return None
+            root, order = _crt_merge(root, order, part, prime**exponent)
+        return root
+
+    def sqrt(self):
+        """Square root of the number.
+
+        For a prime modulus *p*, the result is the smallest of the
+        two roots, the other one is ``p - root``. Other moduli are
+        factored, roots modulo each prime power are lifted with Hensel's
+        lemma and combined with the Chinese remainder theorem.
+
+        >>> Mod(2, 7).sqrt()
+        (3 % 7)
+        >>> Mod(4, 15).sqrt() ** 2
+        (4 % 15)
+        >>>
+
+        :rtype: Mod
+        :raises ValueError: the number is not a square
+        """
+        root = self._sqrt()
+        if root is None:
+            raise ValueError("{} is not a square".format(self))
+        modulus = self._modulus
+        return self._new(root % modulus, modulus)
+
+    def to_bytes(self, width=None):
+        """Residue as fixed-width little-endian bytes.
+
+        Residues are stored in ``[0, |modulus|)`` and use the fewest
+        bytes that fit every residue of the modulus by default.
+
+        >>> Mod(1000, 65537).to_bytes()
+        b'\\xe8\\x03\\x00'
+        >>>
+
+        :param int width: size in bytes
+        :rtype: bytes
+        """
+        modulus = abs(int(self._modulus))
+        return (int(self._value) % modulus).to_bytes(
+            width or _residue_width(modulus), 'little'
+        )
+
+    @classmethod
+    def from_bytes(cls, data, modulus):
+        """Number from its :meth:`to_bytes` representation
+
+        :param data: bytes-like object
+        :param int modulus: modulus of the number
+        :rtype: Mod
+        """
+        return cls(int.from_bytes(data, 'little'), modulus)
+
+    @classmethod
+    def pack_many(cls, numbers, modulus=None, width=None):
+        """Residues of many numbers as one fixed-width little-endian
+        buffer, see :meth:`to_bytes`.
+
+        >>> Mod.pack_many([Mod(1, 7), 5, 13])
+        b'\\x01\\x05\\x06'
+        >>>
+
+        :param numbers: iterable of ``int`` or :class:`Mod`
+        :param int modulus: modulus of the ``int`` numbers,
+            defaults to the modulus of the first :class:`Mod`
+        :param int width: size in bytes of each residue
+        :rtype: bytes
+        :raises ValueError: the numbers do not share the same modulus
+        """
+        if isinstance(numbers, ModArray) and \
+                modulus in (None, numbers._modulus):
+            values, modulus = numbers._values, numbers._modulus
+        else:
+            values, modulus = _common_values(numbers, modulus)
+            if modulus is None:
+                return b''
+
+        modulus = abs(int(modulus))
+        if width is None:
+            width = _residue_width(modulus)
+        elif width < _residue_width(modulus):
+            raise ValueError(
+                "Width {} is too small for modulus {}".format(width, modulus)
+            )
+
+        if not isinstance(values, list) and values.dtype != object and \
+                width in (1, 2, 4, 8):
+            return values.astype('<u{}'.format(width)).tobytes()
+        return _pack_values(
+            [int(value) % modulus for value in values], width, signed=False
+        )
+
+    @classmethod
+    def unpack_many(cls, data, modulus, width=None):
+        """Numbers from a :meth:`pack_many` buffer
+
+        :param data: bytes-like object
+        :param int modulus: modulus of the numbers
+        :param int width: size in bytes of each residue
+        :rtype: list
+        """
+        modulus = Mod(0, modulus)._modulus
+        width = width or _residue_width(modulus)
+        if len(data) % width:
+            raise ValueError(
+                "Buffer size {} is not a multiple of {}".format(
+                    len(data), width
+                )
+            )
+        return [
+            cls._new(value % modulus, modulus)
+            for value in _unpack_values(data, width, signed=False)
+        ]
+
+    # Comparison operators
+
+    def __eq__(self, other):
+        # Exact types first, isinstance checks against the Number ABC
+        # are slow
+        kind = type(other)
+        if kind is int or kind is float:
+            return self._value == other
+        if kind is Mod:
+            return self._value == other._value and \
+                self._modulus == other._modulus
+
+        if not isinstance(other, Number):
+            return False
+
+        if isinstance(other, Mod):
+            return self._value == other._value and \
+                self._modulus == other._modulus
+        return int(self._value) == other
+
+    def _ordered(self, other):
+        # Number the residue is ordered against, None for non-numbers
+        if isinstance(other, Mod):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            return int(other._value)
+        if not isinstance(other, Number):
+            return None
+        return other
+
+    def __lt__(self, other):
+        kind = type(other)
+        if kind is int or kind is float:
+            return self._value < other
+        if kind is Mod and other._modulus == self._modulus:
+            return self._value < other._value
+
+        other = self._ordered(other)
+        return other is not None and int(self._value) < other
+
+    def __le__(self, other):
+        kind = type(other)
+        if kind is int or kind is float:
+            return self._value <= other
+        if kind is Mod and other._modulus == self._modulus:
+            return self._value <= other._value
+
+        other = self._ordered(other)
+        return other is not None and int(self._value) <= other
+
+    def __gt__(self, other):
+        kind = type(other)
+        if kind is int or kind is float:
+            return self._value > other
+        if kind is Mod and other._modulus == self._modulus:
+            return self._value > other._value
+
+        other = self._ordered(other)
+        return other is not None and int(self._value) > other
+
+    def __ge__(self, other):
+        kind = type(other)
+        if kind is int or kind is float:
+            return self._value >= other
+        if kind is Mod and other._modulus == self._modulus:
+            return self._value >= other._value
+
+        other = self._ordered(other)
+        return other is not None and int(self._value) >= other
+
+    # Arithmetic operations
+
+    def __pos__(self):
+        return self.copy()
+
+    def __neg__(self):
+        return self._new(-self._value % self._modulus, self._modulus)
+
+    def _convert(self, other):
+        kind = type(other)
+        if kind is Mod and other._modulus == self._modulus:
+            return other
+        if kind is int:
+            return self._new(other % self._modulus, self._modulus)
+        if kind is float:
+            return None
+
+        if isinstance(other, Mod):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            return other
+
+        if isinstance(other, int):
+            return self._new(other % self._modulus, self._modulus)
+
+        return None
+
+    def __add__(self, other):
+        # int and Mod operands skip _convert, the sum is reduced anyway
+        kind = type(other)
+        if kind is int:
+            value = other
+        elif kind is Mod and other._modulus == self._modulus:
+            value = other._value
+        else:
+            converted = self._convert(other)
+            if converted is None:
+                return int(self._value) + other
+            value = converted._value
+
+        modulus = self._modulus
+        return self._new((self._value + value) % modulus, modulus)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        kind = type(other)
+        if kind is int:
+            value = other
+        elif kind is Mod and other._modulus == self._modulus:
+            value = other._value
+        else:
+            converted = self._convert(other)
+            if converted is None:
+                return int(self._value) - other
+            value = converted._value
+
+        modulus = self._modulus
+        return self._new((self._value - value) % modulus, modulus)
+
+    def __rsub__(self, other):
+        if type(other) is int:
+            modulus = self._modulus
+            return self._new((other - self._value) % modulus, modulus)
+        return -self + other
+
+    def __mul__(self, other):
+        kind = type(other)
+        if kind is int:
+            value = other
+        elif kind is Mod and other._modulus == self._modulus:
+            value = other._value
+        else:
+            converted = self._convert(other)
+            if converted is None:
+                return int(self._value) * other
+            value = converted._value
+
+        modulus = self._modulus
+        return self._new((self._value * value) % modulus, modulus)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return float(self) / float(other)
+
+    def __rtruediv__(self, other):
+        return float(other) / float(self)
+
+    def __floordiv__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return int(self._value) // other
+
+        if converted._value == 0:
+            raise ZeroDivisionError(
+                'integer division by {}'.format(converted)
+            )
+
+        modulus = self._modulus
+        inverse = converted.inverse._value
+        return self._new(self._value * inverse % modulus, modulus)
+
+    def __rfloordiv__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return other // int(self._value)
+
+        return converted * self.inverse
+
+    def __pow__(self, other):
+        if type(other) is int:
+            exponent = other
+        else:
+            converted = self._convert(other)
+            if converted is None:
+                return int(self._value) ** other
+            exponent = converted._value if isinstance(other, Mod) else other
+
+        modulus = self._modulus
+        if exponent.bit_length() > modulus.bit_length():
+            # Huge exponent: reduce it with the exponent of the
+            # multiplicative group
+            exponent = _reduce_exponent(exponent, modulus)
+
+        if 0 < modulus < _TABLE_LIMIT and self._value:
+            tables = _lookup_tables(modulus)
+            if tables.log is not None:
+                index = tables.log[self._value] * exponent % (modulus - 1)
+                return self._new(tables.antilog[index], modulus)
+
+        return self._new(pow(self._value, exponent, modulus), modulus)
+
+    def __rpow__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return pow(other, int(self._value), int(self._modulus))
+
+        result = pow(converted._value, self._value, self._modulus)
+        return self._new(result, self._modulus)
+
+
+Number.register(Mod)
+
+
+class ModAccumulator:
+    """Mutable running sum or product modulo *n*.
+
+    ``+=``, ``-=`` and ``*=`` update the accumulator in place with plain
+    integers: no :class:`Mod` is built along the way and the value is
+    only reduced when it grows much wider than the modulus.
+
+    >>> total = ModAccumulator(0, 7)
+    >>> for number in range(10):
+    ...     total += Mod(number, 7)
+    >>> total.value
+    (3 % 7)
+    >>>
+
+    :param value: initial ``int`` or :class:`Mod` value
+    :param int modulus: modulus of the accumulated numbers
+    :raises ValueError: *modulus* is not a non-zero integer
+    """
+
+    __slots__ = ('_value', '_modulus', '_limit')
+
+    def __init__(self, value, modulus):
+        start = Mod(value, modulus)
+        self._value = start._value
+        self._modulus = start._modulus
+        self._limit = _LAZY_FACTOR * start._modulus.bit_length()
+
+    def __repr__(self):
+        return "ModAccumulator{!r}".format(self.value)
+
+    def __int__(self):
+        return int(self._value % self._modulus)
+
+    __hash__ = None
+
+    @property
+    def modulus(self):
+        """Modulus value
+
+        :rtype: int
+        """
+        return int(self._modulus)
+
+    @property
+    def value(self):
+        """Reduced value of the accumulator
+
+        :rtype: Mod
+        """
+        self._value %= self._modulus
+        return Mod._new(self._value, self._modulus)
+
+    def _convert(self, other):
+        if isinstance(other, Mod):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            return other._value
+
+        if isinstance(other, int):
+            return other
+
+        return None
+
+    def __iadd__(self, other):
+        value = self._convert(other)
+        if value is None:
+            return NotImplemented
+
+        self._value += value
+        return self
+
+    def __isub__(self, other):
+        value = self._convert(other)
+        if value is None:
+            return NotImplemented
+
+        self._value -= value
+        return self
+
+    def __imul__(self, other):
+        value = self._convert(other)
+        if value is None:
+            return NotImplemented
+
+        self._value *= value
+        if self._value.bit_length() > self._limit:
+            self._value %= self._modulus
+        return self
+
+    def add_product(self, left, right):
+        """Add ``left × right`` without building an intermediate
+        :class:`Mod`
+
+        :param left: ``int`` or :class:`Mod`
+        :param right: ``int`` or :class:`Mod`
+        :raises ValueError: one of the numbers has another modulus
+        """
+        left, right = self._convert(left), self._convert(right)
+        if left is None or right is None:
+            raise ValueError("Operands must be int or Mod numbers")
+
+        self._value += left * right
+        if self._value.bit_length() > self._limit:
+            self._value %= self._modulus
+
+
+class ModDict(MutableMapping):
+    """Mapping keyed by :class:`Mod` numbers, stored per modulus then
+    per residue.
+
+    Lookups hash the plain residue in the table of its modulus, the keys
+    of one modulus are available at once with :meth:`residues` and
+    ``int`` keys are reduced with the default *modulus* when one is
+    given. Like :class:`Mod` equality, keys with different moduli are
+    different keys.
+
+    >>> counts = ModDict(modulus=7)
+    >>> counts[Mod(3, 7)] = 1
+    >>> counts[10] += 1
+    >>> counts[Mod(3, 7)], Mod(3, 11) in counts
+    (2, False)
+    >>>
+
+    :param items: mapping or iterable of ``(key, value)`` pairs
+    :param int modulus: modulus of the ``int`` keys
+    :raises ValueError: *modulus* is not a non-zero integer
+    """
+
+    __slots__ = ('_moduli', '_modulus', '_size')
+
+    def __init__(self, items=(), modulus=None):
+        self._moduli = {}
+        self._modulus = None
+        if modulus is not None:
+            self._modulus = Mod(0, modulus)._modulus
+        self._size = 0
+        self.update(items)
+
+    def __repr__(self):
+        return "ModDict({{{}}})".format(", ".join(
+            "{!r}: {!r}".format(key, value) for key, value in self.items()
+        ))
+
+    @property
+    def modulus(self):
+        """Modulus of the ``int`` keys, ``None`` when they are rejected
+
+        :rtype: int
+        """
+        return None if self._modulus is None else int(self._modulus)
+
+    @property
+    def moduli(self):
+        """Moduli of the keys
+
+        :rtype: list
+        """
+        return [int(modulus) for modulus in self._moduli]
+
+    def residues(self, modulus):
+        """Values of the keys of a modulus, keyed by residue
+
+        :param int modulus: modulus of the keys
+        :rtype: dict
+        """
+        return dict(self._moduli.get(modulus, {}))
+
+    def _key(self, key):
+        # (modulus, residue) of a key, None for keys of other types
+        if isinstance(key, Mod):
+            return key._modulus, key._value
+        if isinstance(key, int) and self._modulus is not None:
+            return self._modulus, key % self._modulus
+        return None
+
+    def __getitem__(self, key):
+        found = self._key(key)
+        if found is None:
+            raise KeyError(key)
+        modulus, residue = found
+        try:
+            return self._moduli[modulus][residue]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        found = self._key(key)
+        if found is None:
+            return False
+        modulus, residue = found
+        return residue in self._moduli.get(modulus, ())
+
+    def __setitem__(self, key, value):
+        found = self._key(key)
+        if found is None:
+            raise ValueError("{!r} is not a Mod key".format(key))
+        modulus, residue = found
+        residues = self._moduli.get(modulus)
+        if residues is None:
+            residues = self._moduli[modulus] = {}
+        if residue not in residues:
+            self._size += 1
+        residues[residue] = value
+
+    def __delitem__(self, key):
+        found = self._key(key)
+        if found is None:
+            raise KeyError(key)
+        modulus, residue = found
+        residues = self._moduli.get(modulus)
+        if residues is None or residue not in residues:
+            raise KeyError(key)
+        del residues[residue]
+        self._size -= 1
+        if not residues:
+            del self._moduli[modulus]
+
+    def __iter__(self):
+        for modulus, residues in self._moduli.items():
+            for residue in residues:
+                yield Mod._new(residue, modulus)
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._moduli.clear()
+        self._size = 0
+
+
+def _lazy_inverse(value, modulus, checked):
+    # Modular inverse for compiled expressions, with the errors of Mod //
+    value %= modulus
+    if checked and value == 0:
+        raise ZeroDivisionError(
+            'integer division by {}'.format(Mod._new(value, modulus))
+        )
+    return Mod._new(value, modulus).inverse._value
+
+
+class _Expression:
+    # Placeholder recording the operations applied to it by lazy functions
+
+    __slots__ = ('_nodes', '_index')
+
+    def __init__(self, nodes, node):
+        self._nodes = nodes
+        self._index = len(nodes)
+        nodes.append(node)
+
+    def _operand(self, other):
+        if isinstance(other, _Expression) and other._nodes is self._nodes:
+            return other._index
+        if isinstance(other, Mod):
+            return _Expression(
+                self._nodes, ('mod', other._value, other._modulus)
+            )._index
+        if isinstance(other, int):
+            return _Expression(self._nodes, ('const', int(other)))._index
+        return None
+
+    def _apply(self, operation, *operands):
+        indexes = [self._operand(operand) for operand in operands]
+        if None in indexes:
+            return NotImplemented
+        return _Expression(self._nodes, (operation,) + tuple(indexes))
+
+    def __bool__(self):
+        raise TypeError("Lazy expressions have no truth value")
+
+    def __eq__(self, other):
+        raise TypeError("Lazy expressions cannot be compared")
+
+    __hash__ = None
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return _Expression(self._nodes, ('neg', self._index))
+
+    def __add__(self, other):
+        return self._apply('add', self, other)
+
+    def __radd__(self, other):
+        return self._apply('add', other, self)
+
+    def __sub__(self, other):
+        return self._apply('sub', self, other)
+
+    def __rsub__(self, other):
+        return self._apply('sub', other, self)
+
+    def __mul__(self, other):
+        return self._apply('mul', self, other)
+
+    def __rmul__(self, other):
+        return self._apply('mul', other, self)
+
+    def __floordiv__(self, other):
+        return self._apply('div', self, other)
+
+    def __rfloordiv__(self, other):
+        return self._apply('rdiv', other, self)
+
+    def __pow__(self, other):
+        return self._apply('pow', self, other)
+
+    def __rpow__(self, other):
+        return self._apply('pow', other, self)
+
+
+def _lazy_source(nodes, outputs, shape, limit):
+    # Source of a function computing the traced nodes with plain ints.
+    # Operations between int arguments and constants stay plain int
+    # operations, like they would without placeholders. The others are
+    # tracked in modulus widths: a value is only reduced once it grows
+    # *limit* times wider than the modulus, or when it is needed
+    # as an exponent or as a result
+    lines = []
+    names = []
+    raws = []
+    widths = []
+    reduced = []
+
+    def emit(index, expression, width, is_reduced):
+        name = 't{}'.format(len(lines))
+        lines.append('    {} = {}'.format(name, expression))
+        names[index], widths[index], reduced[index] = \
+            name, width, is_reduced
+        return name
+
+    def operand(index):
+        # Value usable in a modular operation, raw ints are reduced once
+        # except small constants
+        if nodes[index][0] == 'const' and \
+                abs(nodes[index][1]) < _HALF_WORD:
+            return names[index], 0
+        if widths[index] is None:
+            emit(index, '{} % modulus'.format(names[index]), 1, True)
+        return names[index], widths[index]
+
+    def canonical(index):
+        name, _ = operand(index)
+        if not reduced[index]:
+            emit(index, '{} % modulus'.format(name), 1, True)
+        return names[index]
+
+    for index, node in enumerate(nodes):
+        names.append(None)
+        raws.append(None)
+        widths.append(None)
+        reduced.append(False)
+        operation = node[0]
+        if operation == 'arg':
+            names[index] = raws[index] = 'v{}'.format(node[1])
+            if shape[node[1]]:
+                widths[index], reduced[index] = 1, True
+            continue
+        if operation == 'const':
+            names[index] = raws[index] = repr(node[1])
+            continue
+        if operation == 'mod':
+            names[index] = 'c{}'.format(index)
+            widths[index], reduced[index] = 1, True
+            continue
+
+        if all(widths[operand_index] is None for operand_index in node[1:]):
+            # int with int
+            operands = [names[operand_index] for operand_index in node[1:]]
+            if operation == 'neg':
+                expression = '-{}'.format(*operands)
+            elif operation == 'pow':
+                expression = '_power({}, {})'.format(*operands)
+            else:
+                symbol = {
+                    'add': '+', 'sub': '-', 'mul': '*', 'div': '//',
+                    'rdiv': '//',
+                }[operation]
+                expression = '{} {} {}'.format(operands[0], symbol,
+                                               operands[1])
+            raws[index] = emit(index, expression, None, False)
+            continue
+
+        if operation == 'neg':
+            name, width = operand(node[1])
+            emit(index, '-{}'.format(name), width, False)
+        elif operation in ('add', 'sub'):
+            left, left_width = operand(node[1])
+            right, right_width = operand(node[2])
+            symbol = '+' if operation == 'add' else '-'
+            emit(index, '{} {} {}'.format(left, symbol, right),
+                 max(left_width, right_width), False)
+        elif operation == 'pow':
+            base, _ = operand(node[1])
+            # Like Mod.__pow__, int exponents are used as is
+            exponent = raws[node[2]] or canonical(node[2])
+            emit(index, 'pow({}, {}, modulus)'.format(base, exponent),
+                 1, True)
+        else:
+            # Mod // x checks for zero, x // Mod only inverts
+            checked = widths[node[1]] is not None
+            left, left_width = operand(node[1])
+            right, right_width = operand(node[2])
+            if operation in ('div', 'rdiv'):
+                right = '_inverse({}, modulus, {})'.format(right, checked)
+                right_width = 1
+            emit(index, '{} * {}'.format(left, right),
+                 left_width + right_width, False)
+
+        if widths[index] > limit:
+            emit(index, '{} % modulus'.format(names[index]), 1, True)
+
+    results = [
+        names[index] if widths[index] is None else
+        '_new({}, modulus)'.format(canonical(index))
+        for index in outputs
+    ]
+    arguments = ['v{}'.format(position) for position in range(len(shape))]
+    return 'def _fused(modulus, {}):\n{}\n    return {}\n'.format(
+        ', '.join(arguments),
+        '\n'.join(lines) or '    pass',
+        ', '.join(results) + (',' if len(results) == 1 else '')
+    )
+
+
+def _lazy_power(base, exponent):
+    # int ** int in compiled expressions, negative exponents give floats
+    if exponent < 0:
+        raise _Uncompiled
+    return base ** exponent
+
+
+class _Uncompiled(Exception):
+    # Raised by compiled expressions that must run uncompiled
+    pass
+
+
+def _lazy_compile(function, shape, limit):
+    # Traces *function* with placeholders, returns the fused function
+    # and the moduli of the Mod constants it uses
+    nodes = []
+    arguments = [_Expression(nodes, ('arg', position))
+                 for position in range(len(shape))]
+    result = function(*arguments)
+
+    single = not isinstance(result, tuple)
+    outputs = []
+    for value in ((result,) if single else result):
+        if not isinstance(value, _Expression):
+            value = arguments[0]._operand(value) if arguments else None
+            if value is None:
+                raise TypeError("Lazy functions must return Mod numbers")
+            outputs.append(value)
+        else:
+            outputs.append(value._index)
+
+    namespace = {
+        '_new': Mod._new, '_inverse': _lazy_inverse, '_power': _lazy_power,
+    }
+    constants = []
+    for index, node in enumerate(nodes):
+        if node[0] == 'mod':
+            namespace['c{}'.format(index)] = node[1]
+            constants.append(node[2])
+
+    source = _lazy_source(nodes, outputs, shape, limit)
+    exec(compile(source, '<lazy {}>'.format(function.__name__), 'exec'),
+         namespace)
+    fused = namespace['_fused']
+    if single:
+        return lambda *values: fused(*values)[0], constants
+    return fused, constants
+
+
+def lazy(function):
+    """Compile a function of :class:`Mod` numbers into one fused
+    computation on plain integers.
+
+    The first call with a given shape of arguments, that is which
+    ones are :class:`Mod` numbers and which ones are ``int``, records
+    the operations with placeholders. The recording becomes a single
+    function on integers that only reduces intermediate values when
+    they grow much wider than the modulus. Later calls with the same
+    shape run that function directly.
+
+    The function must be made of ``+``, ``-``, ``*``, ``//`` and ``**``
+    only. When it needs anything else, branches on its arguments or
+    gets arguments that are neither ``int`` nor :class:`Mod`,
+    it is called as is.
+
+    >>> @lazy
+    ... def formula(a, b, c, d, e, f):
+    ...     return (a * b + c * d - e) ** 3 // f
+    >>> formula(Mod(2, 101), 3, Mod(4, 101), 5, 6, Mod(7, 101))
+    (3 % 101)
+    >>>
+
+    :param function: function of ``int`` and :class:`Mod` numbers
+        returning a :class:`Mod` or a tuple of :class:`Mod`
+    :rtype: function
+    :raises ValueError: the :class:`Mod` arguments have different moduli
+    """
+    cache = {}
+
+    @wraps(function)
+    def wrapper(*args):
+        modulus = None
+        shape = []
+        for argument in args:
+            if isinstance(argument, Mod):
+                if modulus is None:
+                    modulus = argument._modulus
+                elif argument._modulus != modulus:
+                    raise ValueError(
+                        "Not same modulus: {} != {}".format(
+                            modulus, argument._modulus
+                        )
+                    )
+                shape.append(True)
+            elif isinstance(argument, int):
+                shape.append(False)
+            else:
+                return function(*args)
+        if modulus is None:
+            return function(*args)
+
+        wide = modulus.bit_length() > _LAZY_WIDE_BITS
+        key = tuple(shape), wide
+        compiled = cache.get(key)
+        if compiled is None:
+            try:
+                compiled = _lazy_compile(
+                    function, key[0], 1 if wide else _LAZY_FACTOR
+                )
+            except Exception:
+                # Cannot be traced, always called as is for this shape
+                compiled = False
+            cache[key] = compiled
+        if not compiled:
+            return function(*args)
+
+        fused, constants = compiled
+        for constant in constants:
+            if constant != modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(modulus, constant)
+                )
+        try:
+            return fused(modulus, *[
+                argument._value if flag else argument
+                for argument, flag in zip(args, shape)
+            ])
+        except _Uncompiled:
+            return function(*args)
+
+    return wrapper
+
+
+# Mod methods counted by ModStats
+_STAT_METHODS = (
+    '__init__', 'copy', '__eq__', '__lt__', '__le__', '__gt__', '__ge__',
+    '__pos__', '__neg__', '__add__', '__radd__', '__sub__', '__rsub__',
+    '__mul__', '__rmul__', '__truediv__', '__rtruediv__', '__floordiv__',
+    '__rfloordiv__', '__pow__', '__rpow__', 'inverse', '_extended_gcd',
+    '_new',
+)
+
+
+class ModStats:
+    """Opt-in counters of :class:`Mod` operations, per modulus.
+
+    While enabled, the methods of :class:`Mod` are replaced by counting
+    wrappers that record the number of calls and the time spent in each
+    operation, the sizes of the exponents given to ``**`` and the
+    division steps of the extended Euclidean algorithm.
+    :meth:`disable` puts the original methods back, so that disabled
+    statistics cost nothing. Times include nested operations, ``a - b``
+    with an ``int`` on the left side also counts a negation and an
+    addition.
+
+    Constructions are counted in two rows: ``__init__`` for numbers
+    created by the caller, ``_new`` for the results of operations.
+    :attr:`gcd_steps` only measures the extended Euclidean algorithm
+    written in Python, which :attr:`Mod.inverse` runs when the
+    interpreter has no native modular inverse (before Python 3.8).
+    Inverses from the native ``pow`` or from :class:`ModTables` are
+    counted as calls but their steps are not measured.
+
+    Use the shared instance ``mod.stats``:
+
+    >>> stats.enable()
+    >>> _ = Mod(3, 7) + Mod(5, 7) * 2
+    >>> stats.disable()
+    >>> stats.counts[('__mul__', 7)], stats.counts[('__init__', 7)]
+    (1, 2)
+    >>> stats.counts[('_new', 7)]
+    2
+    >>> stats.reset()
+    >>>
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._times = {}
+        self._exponents = {}
+        self._steps = {}
+        self._callback = None
+        self._sample = 1
+        self._originals = None
+
+    @property
+    def enabled(self):
+        """Whether operations are being counted
+
+        :rtype: bool
+        """
+        return self._originals is not None
+
+    def enable(self, callback=None, sample=1):
+        """Start counting operations
+
+        :param callback: function called with the operation name, the
+            modulus and the time spent, in seconds
+        :param int sample: only call *callback* every *sample* calls
+            of each operation and modulus
+        """
+        self._callback = callback
+        self._sample = max(int(sample), 1)
+        if self._originals is not None:
+            return
+
+        self._originals = {name: Mod.__dict__[name] for name in _STAT_METHODS}
+        for name, method in self._originals.items():
+            if isinstance(method, property):
+                method = property(self._counted(name, method.fget))
+            elif isinstance(method, classmethod):
+                method = classmethod(self._counted(name, method.__func__))
+            else:
+                method = self._counted(name, method)
+            setattr(Mod, name, method)
+
+    def disable(self):
+        """Stop counting operations, the counters are kept"""
+        if self._originals is None:
+            return
+
+        for name, method in self._originals.items():
+            setattr(Mod, name, method)
+        self._originals = None
+
+    def reset(self):
+        """Clear the counters"""
+        self._counts.clear()
+        self._times.clear()
+        self._exponents.clear()
+        self._steps.clear()
+
+    def _counted(self, name, function):
+        counts = self._counts
+        times = self._times
+
+        def wrapper(number, *args, **kwargs):
+            started = perf_counter()
+            try:
+                if name == '_extended_gcd':
+                    *result, steps = _extended_gcd(
+                        number._value, number._modulus
+                    )
+                else:
+                    result = function(number, *args, **kwargs)
+            finally:
+                elapsed = perf_counter() - started
+                if name == '_new':
+                    # Class method, the modulus is the second argument
+                    key = name, args[1]
+                else:
+                    key = name, getattr(number, '_modulus', None)
+                counts[key] = count = counts.get(key, 0) + 1
+                times[key] = times.get(key, 0) + elapsed
+                if self._callback and not count % self._sample:
+                    self._callback(name, key[1], elapsed)
+
+            if name == '__pow__' and args and \
+                    isinstance(args[0], (int, Mod)):
+                sizes = self._exponents.setdefault(key[1], {})
+                size = int(args[0]).bit_length()
+                sizes[size] = sizes.get(size, 0) + 1
+            elif name == '_extended_gcd':
+                self._steps[key[1]] = self._steps.get(key[1], 0) + steps
+            return result
+
+        wrapper.__name__ = getattr(function, '__name__', name)
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    @property
+    def counts(self):
+        """Number of calls per ``(operation, modulus)``
+
+        :rtype: dict
+        """
+        return {
+            (name, int(modulus) if modulus is not None else None): count
+            for (name, modulus), count in self._counts.items()
+        }
+
+    @property
+    def times(self):
+        """Time spent in seconds per ``(operation, modulus)``
+
+        :rtype: dict
+        """
+        return {
+            (name, int(modulus) if modulus is not None else None): elapsed
+            for (name, modulus), elapsed in self._times.items()
+        }
+
+    @property
+    def exponent_sizes(self):
+        """Number of ``**`` calls per modulus and exponent size in bits
+
+        :rtype: dict
+        """
+        return {
+            int(modulus): dict(sizes)
+            for modulus, sizes in self._exponents.items()
+        }
+
+    @property
+    def gcd_steps(self):
+        """Division steps of the extended Euclidean algorithm per modulus
+
+        :rtype: dict
+        """
+        return {int(modulus): steps for modulus, steps in self._steps.items()}
+
+    def summary(self, limit=20):
+        """Table of the most expensive operations
+
+        :param int limit: number of rows
+        :rtype: str
+        """
+        rows = sorted(self.times.items(), key=lambda item: -item[1])
+        lines = ['{:<14} {:>24} {:>10} {:>12}'.format(
+            'operation', 'modulus', 'calls', 'time (ms)'
+        )]
+        counts = self.counts
+        for key, elapsed in rows[:limit]:
+            name, modulus = key
+            modulus = str(modulus)
+            if len(modulus) > 24:
+                modulus = '{}...({} bits)'.format(
+                    modulus[:8], int(modulus).bit_length()
+                )
+            lines.append('{:<14} {:>24} {:>10} {:>12.3f}'.format(
+                name, modulus, counts[key], elapsed * 1000
+            ))
+        return '\n'.join(lines)
+
+
+stats = ModStats()
+
+
+# Number of per-modulus rings kept alive by ModRing
+_RING_CACHE_SIZE = 1024
+
+_RINGS = OrderedDict()
+
+
+class ModRing:
+    """Integers modulo *n*, with cached metadata about the modulus.
+
+    Rings are interned: ``ModRing(n) is ModRing(n)`` as long as the ring
+    stays in the cache of the most recently used moduli.
+    Metadata is computed on first access and reused afterwards.
+    Calling the ring creates :class:`Mod` numbers.
+
+    >>> ring = ModRing(12)
+    >>> ring(17)
+    (5 % 12)
+    >>> ring.factorization
+    {2: 2, 3: 1}
+    >>> ring.phi, ring.carmichael, ring.is_field
+    (4, 2, False)
+    >>>
+
+    Factorization, :attr:`phi` and :attr:`carmichael` need the prime
+    factors of the modulus, they are only practical for moduli
+    that can be factored.
+
+    :param int modulus: modulus of the ring
+    :raises ValueError: *modulus* is not a non-zero integer
+    """
+
+    __slots__ = (
+        '_modulus', '_prime', '_factorization', '_phi', '_carmichael',
+        '_carmichael_factorization', '_barrett', '_square_root',
+        '__weakref__',
+    )
+
+    def __new__(cls, modulus):
+        ring = _RINGS.get(modulus)
+        if ring is not None:
+            _RINGS.move_to_end(modulus)
+            return ring
+
+        if not isinstance(modulus, Number):
+            raise ValueError("Modulus is not a number")
+
+        if modulus == 0:
+            raise ValueError("Modulus value cannot be zero")
+
+        if modulus != int(modulus):
+            raise ValueError("Modulus is not an integer")
+
+        ring = object.__new__(cls)
+        ring._modulus = int(modulus)
+        ring._prime = None
+        ring._factorization = None
+        ring._phi = None
+        ring._carmichael = None
+        ring._carmichael_factorization = None
+        ring._barrett = None
+        ring._square_root = None
+
+        _RINGS[ring._modulus] = ring
+        if len(_RINGS) > _RING_CACHE_SIZE:
+            _RINGS.popitem(last=False)
+        return ring
+
+    def __reduce__(self):
+        return ModRing, (self._modulus,)
+
+    def __repr__(self):
+        return "ModRing({})".format(self._modulus)
+
+    def __call__(self, value):
+        return Mod(value, self._modulus)
+
+    @property
+    def modulus(self):
+        """Modulus value
+
+        :rtype: int
+        """
+        return self._modulus
+
+    @property
+    def is_prime(self):
+        """Primality of the modulus, probable prime above 3.3 × 10²⁴
+
+        :rtype: bool
+        """
+        if self._prime is None:
+            self._prime = _is_prime(abs(self._modulus))
+        return self._prime
+
+    @property
+    def is_field(self):
+        """Whether every non-zero number has an inverse
+
+        :rtype: bool
+        """
+        return self._modulus > 0 and self.is_prime
+
+    @property
+    def factorization(self):
+        """Prime factors of the modulus and their exponents
+
+        :rtype: dict
+        """
+        if self._factorization is None:
+            self._factorization = _factorize(abs(self._modulus))
+        return dict(self._factorization)
+
+    @property
+    def phi(self):
+        """Euler's totient of the modulus
+
+        :rtype: int
+        """
+        if self._phi is None:
+            phi = 1
+            for prime, exponent in self.factorization.items():
+                phi *= (prime - 1) * prime**(exponent - 1)
+            self._phi = phi
+        return self._phi
+
+    @property
+    def carmichael(self):
+        """Carmichael function of the modulus, the exponent of its
+        multiplicative group
+
+        :rtype: int
+        """
+        if self._carmichael is None:
+            result = 1
+            for prime, exponent in self.factorization.items():
+                order = (prime - 1) * prime**(exponent - 1)
+                if prime == 2 and exponent > 2:
+                    order //= 2
+                result = result * order // gcd(result, order)
+            self._carmichael = result
+        return self._carmichael
+
+    @property
+    def carmichael_factorization(self):
+        """Prime factors of :attr:`carmichael` and their exponents
+
+        :rtype: dict
+        """
+        if self._carmichael_factorization is None:
+            self._carmichael_factorization = _factorize(self.carmichael)
+        return dict(self._carmichael_factorization)
+
+    @property
+    def barrett(self):
+        """Barrett reduction constants ``(shift, factor)``, with
+        ``factor = 4^k // n`` and ``shift = 2k`` for a *k*-bit modulus
+
+        :rtype: tuple
+        """
+        if self._barrett is None:
+            shift = 2 * abs(self._modulus).bit_length()
+            self._barrett = (shift, (1 << shift) // abs(self._modulus))
+        return self._barrett
+
+    @property
+    def tables(self):
+        """Lookup tables of the modulus, ``None`` when it is negative or
+        above the limit given to :func:`set_tables`
+
+        :rtype: ModTables
+        """
+        if 0 < self._modulus < _TABLE_LIMIT:
+            return _lookup_tables(self._modulus)
+        return None
+
+    def _square_root_constants(self):
+        # Tonelli-Shanks constants of an odd prime modulus p:
+        # p - 1 = odd × 2^shift and a non-residue raised to odd
+        if self._square_root is None:
+            prime = abs(self._modulus)
+            odd, shift = prime - 1, 0
+            while not odd & 1:
+                odd >>= 1
+                shift += 1
+            residue = 2
+            while pow(residue, (prime - 1) // 2, prime) != prime - 1:
+                residue += 1
+            self._square_root = odd, shift, pow(residue, odd, prime)
+        return self._square_root
+
+    def reduce(self, value):
+        """Barrett reduction of a value in ``[0, n²)``
+
+        :param int value: value to reduce
+        :rtype: int
+        """
+        shift, factor = self.barrett
+        modulus = abs(self._modulus)
+        remainder = value - ((value * factor) >> shift) * modulus
+        while remainder >= modulus:
+            remainder -= modulus
+        return remainder % self._modulus
+
+
+# Moduli below this limit get lookup tables, see set_tables
+_TABLE_LIMIT = 0
+
+# Size of the cached lookup tables, in bytes
+_TABLE_MEMORY = 1 << 24
+
+# Optional lookup tables, see set_tables
+_TABLE_MULTIPLICATION = False
+_TABLE_LOGARITHM = False
+
+# Bytes taken by a list slot, the int objects are shared between tables
+_SLOT_SIZE = 8
+
+_TABLES = OrderedDict()
+_TABLE_BYTES = 0
+
+
+class ModTables:
+    """Lookup tables of a small modulus *n*, see :func:`set_tables`.
+
+    >>> tables = ModTables(7, multiplication=True, logarithm=True)
+    >>> tables.inverse[3], tables.multiplication[3][5]
+    (5, 1)
+    >>> tables.antilog[tables.log[3] * 4 % 6] == 3**4 % 7
+    True
+    >>>
+
+    :param int modulus: positive modulus
+    :param bool multiplication: build the multiplication table
+    :param bool logarithm: build the logarithm tables, for a prime modulus
+    """
+
+    __slots__ = ('modulus', 'inverse', 'multiplication', 'generator', 'log',
+                 'antilog', 'size')
+
+    def __init__(self, modulus, multiplication=False, logarithm=False):
+        self.modulus = modulus
+        #: Inverses of the values, ``None`` for non-invertible values
+        self.inverse = [None] * modulus
+        #: Products ``multiplication[x][y]``, or ``None``
+        self.multiplication = None
+        #: Smallest primitive root of a prime modulus, or ``None``
+        self.generator = None
+        #: Logarithms of the non-zero values in base :attr:`generator`,
+        #: or ``None``
+        self.log = None
+        #: Powers of the generator, or ``None``
+        self.antilog = None
+        #: Memory used by the tables, in bytes
+        self.size = modulus * _SLOT_SIZE
+
+        # Tables reference the same int objects
+        values = list(range(modulus))
+        if logarithm and ModRing(modulus).is_prime:
+            order = modulus - 1
+            self.antilog = [0] * order
+            self.log = [None] * modulus
+            value = 1
+            generator = self.generator = _primitive_root(modulus)
+            for exponent in range(order):
+                self.antilog[exponent] = values[value]
+                self.log[value] = exponent
+                value = value * generator % modulus
+            for value in range(1, modulus):
+                self.inverse[value] = self.antilog[-self.log[value] % order]
+            self.size += (2 * modulus - 1) * _SLOT_SIZE
+        else:
+            for value in range(modulus):
+                if self.inverse[value] is None and gcd(value, modulus) == 1:
+                    inverse = _extended_gcd(value, modulus)[1] % modulus
+                    self.inverse[value] = values[inverse]
+                    self.inverse[inverse] = values[value]
+
+        if multiplication:
+            self.multiplication = [
+                [values[value * other % modulus] for other in range(modulus)]
+                for value in range(modulus)
+            ]
+            self.size += modulus * modulus * _SLOT_SIZE
+
+
+def _primitive_root(prime):
+    # Smallest generator of the multiplicative group of a prime
+    factors = _factorize(prime - 1)
+    generator = 1
+    while any(pow(generator, (prime - 1) // factor, prime) == 1
+              for factor in factors):
+        generator += 1
+    return generator
+
+
+def _table_log(tables, base, target):
+    # Smallest x with base^x == target from logarithm tables, None when
+    # target is not a power of base
+    if not target:
+        return None
+    order = tables.modulus - 1
+    known, wanted = tables.log[base], tables.log[target]
+    divisor = gcd(known, order)
+    if wanted % divisor:
+        return None
+    order //= divisor
+    inverse = _extended_gcd(known // divisor, order)[1]
+    return wanted // divisor * inverse % order
+
+
+def _lookup_tables(modulus):
+    # Tables of a positive modulus below _TABLE_LIMIT, built on first use
+    # and evicted least recently used first
+    global _TABLE_BYTES
+
+    tables = _TABLES.get(modulus)
+    if tables is not None:
+        _TABLES.move_to_end(modulus)
+        return tables
+
+    modulus = int(modulus)
+    multiplication = _TABLE_MULTIPLICATION and \
+        modulus * modulus * _SLOT_SIZE <= _TABLE_MEMORY
+    tables = ModTables(modulus, multiplication, _TABLE_LOGARITHM)
+    _TABLES[modulus] = tables
+    _TABLE_BYTES += tables.size
+    while _TABLE_BYTES > _TABLE_MEMORY and len(_TABLES) > 1:
+        _, evicted = _TABLES.popitem(last=False)
+        _TABLE_BYTES -= evicted.size
+    return tables
+
+
+class CRTBasis:
+    """Chinese remainder theorem for a fixed set of pairwise coprime
+    moduli.
+
+    The Garner coefficients are computed once, then each combination
+    costs one multiplication and one small reduction per modulus.
+
+    >>> basis = CRTBasis([3, 5, 7])
+    >>> basis.combine([2, 3, 2])
+    (23 % 105)
+    >>> basis.split(23)
+    ((2 % 3), (3 % 5), (2 % 7))
+    >>>
+
+    :param moduli: pairwise coprime positive moduli
+    :raises ValueError: the moduli are missing, not positive
+        or not pairwise coprime
+    """
+
+    __slots__ = ('_moduli', '_modulus', '_prefixes', '_coefficients')
+
+    def __init__(self, moduli):
+        self._moduli = tuple(int(modulus) for modulus in moduli)
+        if not self._moduli:
+            raise ValueError("No modulus")
+
+        prefix = 1
+        prefixes = []
+        coefficients = []
+        for modulus in self._moduli:
+            if modulus < 1:
+                raise ValueError("Moduli must be positive")
+            if gcd(prefix, modulus) != 1:
+                raise ValueError("Moduli are not pairwise coprime")
+            # coefficient = (m_0 × ... × m_i-1)^-1 mod m_i
+            prefixes.append(prefix)
+            factor = Mod._new(prefix % modulus, modulus)
+            coefficients.append(factor.inverse._value)
+            prefix *= modulus
+
+        self._modulus = prefix
+        self._prefixes = tuple(prefixes)
+        self._coefficients = tuple(coefficients)
+
+    def __repr__(self):
+        return "CRTBasis({})".format(list(self._moduli))
+
+    @property
+    def moduli(self):
+        """Moduli of the basis
+
+        :rtype: tuple
+        """
+        return self._moduli
+
+    @property
+    def modulus(self):
+        """Product of the moduli
+
+        :rtype: int
+        """
+        return self._modulus
+
+    def _check(self, residues):
+        # Mod residues must match the modulus of their channel
+        for residue, modulus in zip(residues, self._moduli):
+            if isinstance(residue, Mod) and residue._modulus != modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        modulus, residue._modulus
+                    )
+                )
+
+    def _combine(self, residues):
+        # Garner's algorithm: x = v_0 + v_1 × m_0 + v_2 × m_0 × m_1 + ...
+        value = 0
+        for residue, modulus, prefix, coefficient in zip(
+                residues, self._moduli, self._prefixes, self._coefficients):
+            digit = (int(residue) - value) * coefficient % modulus
+            value += digit * prefix
+        return value
+
+    def combine(self, residues):
+        """Number congruent to each residue modulo the matching modulus
+
+        :param residues: one ``int`` or :class:`Mod` per modulus
+        :rtype: Mod
+        :raises ValueError: the number of residues does not match
+            or a :class:`Mod` residue has another modulus
+        """
+        residues = list(residues)
+        if len(residues) != len(self._moduli):
+            raise ValueError(
+                "Expected {} residues, got {}".format(
+                    len(self._moduli), len(residues)
+                )
+            )
+        self._check(residues)
+        return Mod._new(self._combine(residues), self._modulus)
+
+    def combine_many(self, rows):
+        """:meth:`combine` applied to many rows of residues
+
+        :param rows: iterable of residue sequences
+        :rtype: list
+        :raises ValueError: a row has the wrong length
+            or a :class:`Mod` residue has another modulus
+        """
+        check = self._check
+        combine = self._combine
+        modulus = self._modulus
+        size = len(self._moduli)
+        numbers = []
+        for residues in rows:
+            if len(residues) != size:
+                raise ValueError(
+                    "Expected {} residues, got {}".format(size, len(residues))
+                )
+            check(residues)
+            numbers.append(Mod._new(combine(residues), modulus))
+        return numbers
+
+    def split(self, number):
+        """Residues of a number modulo each modulus
+
+        :param number: ``int`` or :class:`Mod` modulo :attr:`modulus`
+        :rtype: tuple
+        :raises ValueError: *number* has another modulus
+        """
+        if isinstance(number, Mod) and number._modulus != self._modulus:
+            raise ValueError(
+                "Not same modulus: {} != {}".format(
+                    self._modulus, number._modulus
+                )
+            )
+        value = int(number)
+        return tuple(
+            Mod._new(value % modulus, modulus) for modulus in self._moduli
+        )
+
+
+# Number of tasks submitted to an executor by RNS operations
+_RNS_CHUNKS = 16
+
+_RNS_BASES = {}
+_RNS_MODULI = {}
+
+
+def _rns_basis(bits, width):
+    # Largest primes below 2^width until their product reaches 2^bits
+    key = (bits, width)
+    if key not in _RNS_BASES:
+        moduli = []
+        total = 0
+        candidate = (1 << width) - 1
+        while total < bits:
+            if _is_prime(candidate):
+                moduli.append(candidate)
+                total += candidate.bit_length() - 1
+            candidate -= 2
+        _RNS_BASES[key] = CRTBasis(moduli)
+    return _RNS_BASES[key]
+
+
+def _rns_moduli(basis):
+    # Moduli of a basis as a uint64 NumPy array, cached per basis
+    moduli = _RNS_MODULI.get(basis.moduli)
+    if moduli is None:
+        moduli = numpy.array(basis.moduli, dtype=numpy.uint64)
+        _RNS_MODULI[basis.moduli] = moduli
+    return moduli
+
+
+def _rns_channels(operation, left, right, moduli):
+    # Channel-wise operation on plain int residues, runs in pool workers
+    if operation == 'add':
+        return [(x + y) % m for x, y, m in zip(left, right, moduli)]
+    if operation == 'sub':
+        return [(x - y) % m for x, y, m in zip(left, right, moduli)]
+    return [x * y % m for x, y, m in zip(left, right, moduli)]
+
+
+class RNS:
+    """Integer in a residue number system: one residue per modulus
+    of a :class:`CRTBasis`.
+
+    Additions, subtractions and multiplications act on each channel
+    independently, wrapping around the product of the moduli.
+    The integer is only rebuilt with the Chinese remainder theorem
+    when :func:`int` or :meth:`to_mod` is called.
+    Channels live in a NumPy array when NumPy is installed and every
+    modulus fits in 32 bits, so that operations are vectorized.
+
+    >>> basis = CRTBasis([251, 253, 255, 256])
+    >>> x = RNS(1234, basis)
+    >>> int(x * x + 5)
+    1522761
+    >>> x.residues
+    ((230 % 251), (222 % 253), (214 % 255), (210 % 256))
+    >>>
+
+    :param value: ``int`` or :class:`Mod`
+    :param basis: :class:`CRTBasis` or iterable of pairwise coprime moduli
+    """
+
+    __slots__ = ('_basis', '_channels', '_vector')
+
+    def __init__(self, value, basis):
+        if not isinstance(basis, CRTBasis):
+            basis = CRTBasis(basis)
+        value = int(value)
+        self._basis = basis
+        self._vector = self._is_vectorized(basis)
+        self._channels = self._pack(
+            [value % modulus for modulus in basis.moduli]
+        )
+
+    @staticmethod
+    def _is_vectorized(basis):
+        return numpy is not None and max(basis.moduli) <= _HALF_WORD
+
+    def _pack(self, residues):
+        if self._vector:
+            return numpy.array(residues, dtype=numpy.uint64)
+        return tuple(residues)
+
+    def _make(self, channels):
+        number = object.__new__(RNS)
+        number._basis = self._basis
+        number._vector = self._vector
+        number._channels = channels
+        return number
+
+    @classmethod
+    def from_residues(cls, residues, basis):
+        """Build a number from its residues
+
+        :param residues: one ``int`` or :class:`Mod` per modulus
+        :param basis: :class:`CRTBasis` or iterable of moduli
+        :rtype: RNS
+        """
+        number = cls(0, basis)
+        residues = [int(residue) for residue in residues]
+        if len(residues) != len(number._basis.moduli):
+            raise ValueError(
+                "Expected {} residues, got {}".format(
+                    len(number._basis.moduli), len(residues)
+                )
+            )
+        number._channels = number._pack([
+            residue % modulus
+            for residue, modulus in zip(residues, number._basis.moduli)
+        ])
+        return number
+
+    @staticmethod
+    def basis(bits, width=31):
+        """Basis of primes below ``2^width`` whose product has at least
+        *bits* bits
+
+        :param int bits: size of the integers to represent
+        :param int width: size of each prime
+        :rtype: CRTBasis
+        """
+        return _rns_basis(bits, width)
+
+    def __repr__(self):
+        return "RNS({}, {!r})".format(int(self), self._basis)
+
+    def __int__(self):
+        return int(self._basis.combine(self._plain()))
+
+    def to_mod(self):
+        """Rebuild the number modulo the product of the moduli
+
+        :rtype: Mod
+        """
+        return self._basis.combine(self._plain())
+
+    def _plain(self):
+        if self._vector:
+            return self._channels.tolist()
+        return list(self._channels)
+
+    @property
+    def residues(self):
+        """Residue of each channel
+
+        :rtype: tuple
+        """
+        return tuple(
+            Mod._new(residue, modulus)
+            for residue, modulus in zip(self._plain(), self._basis.moduli)
+        )
+
+    def _convert(self, other):
+        if isinstance(other, RNS):
+            if other._basis.moduli != self._basis.moduli:
+                raise ValueError("Not same basis")
+            return other
+        if isinstance(other, (int, Mod)):
+            return RNS(other, self._basis)
+        return None
+
+    def _apply(self, operation, other, executor):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+
+        left, right = self._channels, converted._channels
+        if executor is None and self._vector:
+            moduli = _rns_moduli(self._basis)
+            if operation == 'add':
+                channels = (left + right) % moduli
+            elif operation == 'sub':
+                channels = (left + (moduli - right)) % moduli
+            else:
+                channels = left * right % moduli
+            return self._make(channels)
+
+        left, right = self._plain(), converted._plain()
+        moduli = self._basis.moduli
+        if executor is None:
+            return self._make(self._pack(
+                _rns_channels(operation, left, right, moduli)
+            ))
+
+        # Split the channels in one chunk per task
+        size = -(-len(moduli) // _RNS_CHUNKS)
+        slices = [slice(start, start + size)
+                  for start in range(0, len(moduli), size)]
+        chunks = executor.map(
+            _rns_channels,
+            [operation] * len(slices),
+            [left[part] for part in slices],
+            [right[part] for part in slices],
+            [moduli[part] for part in slices],
+        )
+        return self._make(self._pack(
+            [residue for chunk in chunks for residue in chunk]
+        ))
+
+    def add(self, other, executor=None):
+        """Channel-wise addition, optionally spread over an executor
+
+        :param other: ``int``, :class:`Mod` or :class:`RNS`
+        :param executor: ``concurrent.futures`` executor
+        :rtype: RNS
+        """
+        return self._apply('add', other, executor)
+
+    def sub(self, other, executor=None):
+        """Channel-wise subtraction, optionally spread over an executor
+
+        :param other: ``int``, :class:`Mod` or :class:`RNS`
+        :param executor: ``concurrent.futures`` executor
+        :rtype: RNS
+        """
+        return self._apply('sub', other, executor)
+
+    def mul(self, other, executor=None):
+        """Channel-wise multiplication, optionally spread over an executor
+
+        :param other: ``int``, :class:`Mod` or :class:`RNS`
+        :param executor: ``concurrent.futures`` executor
+        :rtype: RNS
+        """
+        return self._apply('mul', other, executor)
+
+    def __add__(self, other):
+        return self._apply('add', other, None)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._apply('sub', other, None)
+
+    def __rsub__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+        return converted._apply('sub', self, None)
+
+    def __mul__(self, other):
+        return self._apply('mul', other, None)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return RNS(0, self._basis) - self
+
+    def __eq__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+        return self._plain() == converted._plain()
+
+    __hash__ = None
+
+
+# Polynomial multiplication switches from schoolbook to Karatsuba,
+# then to number-theoretic transforms as operands grow
+_SCHOOLBOOK_SIZE = 32
+_NTT_SIZE = 256
+
+# Divisions and multipoint evaluations switch to Newton iteration
+# and subproduct trees above this size
+_NEWTON_SIZE = 256
+
+_NTT_ROOTS = {}
+_NTT_PRIMES = {}
+_NTT_TABLES = {}
+
+
+def _ntt_root(prime, size):
+    # Primitive size-th root of unity modulo prime, size divides prime - 1
+    key = (prime, size)
+    root = _NTT_ROOTS.get(key)
+    if root is None:
+        for base in range(2, prime):
+            root = pow(base, (prime - 1) // size, prime)
+            if size == 1 or pow(root, size // 2, prime) == prime - 1:
+                break
+        _NTT_ROOTS[key] = root
+    return root
+
+
+def _ntt_primes(size):
+    # Primes below 2^31 that support transforms of the given size
+    valuation = max(size.bit_length() - 1, 20)
+    primes = _NTT_PRIMES.get(valuation)
+    if primes is None:
+        step = 1 << valuation
+        primes = [
+            candidate for candidate in range(
+                ((1 << 31) - 1) // step * step + 1, step, -step
+            )
+            if _is_prime(candidate)
+        ]
+        _NTT_PRIMES[valuation] = primes
+    return primes
+
+
+def _bit_reversal(size):
+    order = [0]
+    while len(order) < size:
+        order = [2 * index for index in order] + \
+            [2 * index + 1 for index in order]
+    return order
+
+
+def _ntt_table(prime, size, invert):
+    # Bit reversal order and powers of the root of unity, cached
+    key = (prime, size, invert)
+    table = _NTT_TABLES.get(key)
+    if table is None:
+        root = _ntt_root(prime, size)
+        if invert:
+            root = pow(root, size - 1, prime)
+        powers = [1] * max(size // 2, 1)
+        for index in range(1, len(powers)):
+            powers[index] = powers[index - 1] * root % prime
+        table = (_bit_reversal(size), powers)
+        if numpy is not None and prime <= _HALF_WORD:
+            table = tuple(numpy.array(part, dtype=numpy.uint64)
+                          for part in table)
+        _NTT_TABLES[key] = table
+    return table
+
+
+def _ntt(values, prime, invert=False):
+    # Iterative Cooley-Tukey transform, len(values) is a power of two
+    size = len(values)
+    order, powers = _ntt_table(prime, size, invert)
+    if numpy is not None and prime <= _HALF_WORD:
+        modulus = numpy.uint64(prime)
+        data = numpy.array(values, dtype=numpy.uint64)[order]
+        length = 2
+        while length <= size:
+            half = length // 2
+            twiddles = powers[::size // length][:half]
+            data = data.reshape(-1, length)
+            low = data[:, :half]
+            high = data[:, half:] * twiddles % modulus
+            data = numpy.concatenate(
+                [(low + high) % modulus, (low + modulus - high) % modulus],
+                axis=1,
+            ).reshape(-1)
+            length *= 2
+        if invert:
+            data = data * numpy.uint64(pow(size, prime - 2, prime)) % modulus
+        return data.tolist()
+
+    data = [values[index] for index in order]
+    length = 2
+    while length <= size:
+        half = length // 2
+        stride = size // length
+        for start in range(0, size, length):
+            for offset in range(half):
+                low = data[start + offset]
+                high = data[start + offset + half] * \
+                    powers[offset * stride] % prime
+                data[start + offset] = (low + high) % prime
+                data[start + offset + half] = (low - high) % prime
+        length *= 2
+    if invert:
+        factor = pow(size, prime - 2, prime)
+        data = [value * factor % prime for value in data]
+    return data
+
+
+def _ntt_multiply(left, right, prime):
+    # Product of two coefficient lists modulo an NTT-friendly prime
+    length = len(left) + len(right) - 1
+    size = 1 << (length - 1).bit_length()
+    left = _ntt([value % prime for value in left] +
+                [0] * (size - len(left)), prime)
+    right = _ntt([value % prime for value in right] +
+                 [0] * (size - len(right)), prime)
+    product = [x * y % prime for x, y in zip(left, right)]
+    return _ntt(product, prime, invert=True)[:length]
+
+
+def _is_ntt_prime(modulus, size):
+    if numpy is not None and modulus > _HALF_WORD:
+        return False
+    return (modulus - 1) % size == 0 and ModRing(modulus).is_prime
+
+
+def _schoolbook(left, right):
+    result = [0] * (len(left) + len(right) - 1)
+    for index, value in enumerate(left):
+        if value:
+            for offset, other in enumerate(right, index):
+                result[offset] += value * other
+    return result
+
+
+def _karatsuba(left, right):
+    # Unreduced product of two coefficient lists
+    if len(left) < len(right):
+        left, right = right, left
+    if len(right) <= _SCHOOLBOOK_SIZE:
+        return _schoolbook(left, right)
+
+    half = len(left) // 2
+    if len(right) <= half:
+        # Unbalanced operands: split the longest one only
+        low = _karatsuba(left[:half], right)
+        high = _karatsuba(left[half:], right)
+        result = low + [0] * (len(left) + len(right) - 1 - len(low))
+        for index, value in enumerate(high, half):
+            result[index] += value
+        return result
+
+    left_low, left_high = left[:half], left[half:]
+    right_low, right_high = right[:half], right[half:]
+    low = _karatsuba(left_low, right_low)
+    high = _karatsuba(left_high, right_high)
+    middle = _karatsuba(_poly_add(left_low, left_high),
+                        _poly_add(right_low, right_high))
+
+    result = [0] * (len(left) + len(right) - 1)
+    for index, value in enumerate(low):
+        result[index] += value
+        middle[index] -= value
+    for index, value in enumerate(high):
+        result[index + 2 * half] += value
+        middle[index] -= value
+    for index, value in enumerate(middle):
+        if index + half < len(result):
+            result[index + half] += value
+    return result
+
+
+def _poly_add(left, right):
+    if len(left) < len(right):
+        left, right = right, left
+    result = list(left)
+    for index, value in enumerate(right):
+        result[index] += value
+    return result
+
+
+def _poly_trim(coefficients):
+    while coefficients and not coefficients[-1]:
+        coefficients.pop()
+    return coefficients
+
+
+def _poly_mul(left, right, modulus):
+    # Reduced product of two reduced coefficient lists
+    if not left or not right:
+        return []
+
+    shortest = min(len(left), len(right))
+    if shortest <= _NTT_SIZE:
+        return [value % modulus for value in _karatsuba(left, right)]
+
+    length = len(left) + len(right) - 1
+    size = 1 << (length - 1).bit_length()
+    if _is_ntt_prime(modulus, size):
+        return _ntt_multiply(left, right, modulus)
+
+    # Several NTT primes whose product exceeds any coefficient
+    bound = shortest * (modulus - 1)**2
+    primes = []
+    product = 1
+    for prime in _ntt_primes(size):
+        primes.append(prime)
+        product *= prime
+        if product > bound:
+            break
+    else:
+        return [value % modulus for value in _karatsuba(left, right)]
+
+    basis = CRTBasis(primes)
+    columns = [_ntt_multiply(left, right, prime) for prime in primes]
+    return [
+        basis._combine(residues) % modulus for residues in zip(*columns)
+    ]
+
+
+def _series_inverse(coefficients, length, modulus):
+    # Inverse of a power series modulo x^length, by Newton iteration
+    inverse = [Mod._new(coefficients[0], modulus).inverse._value]
+    precision = 1
+    while precision < length:
+        precision = min(2 * precision, length)
+        error = _poly_mul(coefficients[:precision], inverse, modulus)
+        error = [-value % modulus for value in error[:precision]]
+        error[0] = (error[0] + 2) % modulus
+        inverse = _poly_mul(inverse, error, modulus)[:precision]
+    return inverse
+
+
+def _poly_divmod(left, right, modulus):
+    # Quotient and remainder of reduced coefficient lists
+    if not right:
+        raise ZeroDivisionError('polynomial division by zero')
+    if len(left) < len(right):
+        return [], list(left)
+
+    try:
+        leading = Mod._new(right[-1], modulus).inverse._value
+    except ValueError:
+        raise ValueError(
+            "the leading coefficient {} cannot be inverted".format(
+                Mod._new(right[-1], modulus)
+            )
+        ) from None
+
+    length = len(left) - len(right) + 1
+    if min(length, len(right)) >= _NEWTON_SIZE:
+        # rev(quotient) = rev(left) / rev(right) mod x^length
+        inverse = _series_inverse(right[::-1], length, modulus)
+        quotient = _poly_mul(left[::-1][:length], inverse, modulus)
+        quotient = quotient[:length][::-1]
+        product = _poly_mul(right, quotient, modulus)
+        remainder = [
+            (value - product[index]) % modulus
+            for index, value in enumerate(left[:len(right) - 1])
+        ]
+        return _poly_trim(quotient), _poly_trim(remainder)
+
+    remainder = list(left)
+    quotient = [0] * length
+    for index in range(length - 1, -1, -1):
+        factor = remainder[index + len(right) - 1] * leading % modulus
+        quotient[index] = factor
+        if factor:
+            for offset, value in enumerate(right, index):
+                remainder[offset] = (remainder[offset] - factor * value) % \
+                    modulus
+    return _poly_trim(quotient), _poly_trim(remainder[:len(right) - 1])
+
+
+class ModPoly:
+    """Polynomial with integer coefficients modulo *n*.
+
+    Coefficients are given from the constant term upwards.
+    Arithmetic operations accept ``int`` and :class:`Mod` constants.
+    Products use schoolbook multiplication for small operands,
+    then Karatsuba, then number-theoretic transforms: directly for
+    NTT-friendly primes, through several primes and the Chinese
+    remainder theorem for other moduli.
+
+    >>> poly = ModPoly([1, 2, 3], 7)
+    >>> poly
+    ModPoly([1, 2, 3] % 7)
+    >>> poly * poly
+    ModPoly([1, 4, 3, 5, 2] % 7)
+    >>> poly(2)
+    (3 % 7)
+    >>> divmod(poly * poly + 1, poly)
+    (ModPoly([1, 2, 3] % 7), ModPoly([1] % 7))
+    >>>
+
+    :param coefficients: iterable of ``int`` or :class:`Mod`
+    :param int modulus: positive modulus of the coefficients
+    :raises ValueError: *modulus* is not a positive integer
+    """
+
+    __slots__ = ('_coefficients', '_modulus')
+
+    def __init__(self, coefficients, modulus):
+        if not isinstance(modulus, Number):
+            raise ValueError("Modulus is not a number")
+
+        if modulus != int(modulus) or modulus < 1:
+            raise ValueError("Modulus is not a positive integer")
+
+        self._modulus = int(modulus)
+        self._coefficients = tuple(_poly_trim(
+            [int(value) % self._modulus for value in coefficients]
+        ))
+
+    @classmethod
+    def _new(cls, coefficients, modulus):
+        # Unchecked constructor: reduced and trimmed coefficient list
+        poly = object.__new__(cls)
+        poly._coefficients = tuple(coefficients)
+        poly._modulus = modulus
+        return poly
+
+    def __repr__(self):
+        return "ModPoly({} % {})".format(
+            list(self._coefficients), self._modulus
+        )
+
+    def __len__(self):
+        return len(self._coefficients)
+
+    def __getitem__(self, index):
+        if 0 <= index < len(self._coefficients):
+            return Mod._new(self._coefficients[index], self._modulus)
+        return Mod._new(0, self._modulus)
+
+    def __bool__(self):
+        return bool(self._coefficients)
+
+    def __hash__(self):
+        return hash((self._coefficients, self._modulus))
+
+    @property
+    def modulus(self):
+        """Modulus of the coefficients
+
+        :rtype: int
+        """
+        return self._modulus
+
+    @property
+    def coefficients(self):
+        """Coefficients from the constant term upwards
+
+        :rtype: tuple
+        """
+        return self._coefficients
+
+    @property
+    def degree(self):
+        """Degree of the polynomial, -1 for the zero polynomial
+
+        :rtype: int
+        """
+        return len(self._coefficients) - 1
+
+    def monic(self):
+        """Polynomial divided by its leading coefficient
+
+        :rtype: ModPoly
+        :raises ValueError: the leading coefficient cannot be inverted
+        """
+        if not self._coefficients:
+            return self
+        leading = Mod._new(self._coefficients[-1], self._modulus).inverse
+        return self * leading
+
+    # Evaluation
+
+    def __call__(self, point):
+        """Value at *point*, with Horner's method
+
+        :param point: ``int`` or :class:`Mod`
+        :rtype: Mod
+        """
+        point = int(self._convert_point(point))
+        modulus = self._modulus
+        result = 0
+        for coefficient in reversed(self._coefficients):
+            result = (result * point + coefficient) % modulus
+        return Mod._new(result, modulus)
+
+    def evaluate_many(self, points):
+        """Values at many points
+
+        Runs a vectorized Horner scheme on NumPy arrays when possible,
+        a subproduct tree for large batches otherwise.
+
+        :param points: iterable of ``int`` or :class:`Mod`
+        :rtype: list
+        """
+        modulus = self._modulus
+        points = [int(self._convert_point(point)) % modulus
+                  for point in points]
+
+        if numpy is not None and modulus <= _NATIVE_MODULUS:
+            values = numpy.array(points, dtype=numpy.uint64)
+            result = numpy.zeros(len(points), dtype=numpy.uint64)
+            wide = numpy.uint64(modulus)
+            for coefficient in reversed(self._coefficients):
+                result = _array_addmod(
+                    _array_mulmod(result, values, modulus),
+                    numpy.uint64(coefficient), wide,
+                )
+            values = result.tolist()
+        elif min(len(points), len(self._coefficients)) >= _NEWTON_SIZE:
+            values = self._evaluate_tree(points)
+        else:
+            values = [int(self(point)) for point in points]
+
+        return [Mod._new(int(value), modulus) for value in values]
+
+    def _evaluate_tree(self, points):
+        # Remainders of the polynomial down a product tree of (x - a_i)
+        modulus = self._modulus
+        tree = [[[-point % modulus, 1] for point in points]]
+        while len(tree[-1]) > 1:
+            level = tree[-1]
+            tree.append([
+                _poly_mul(level[index], level[index + 1], modulus)
+                if index + 1 < len(level) else level[index]
+                for index in range(0, len(level), 2)
+            ])
+
+        remainders = [list(self._coefficients)]
+        for level in reversed(tree):
+            remainders = [
+                _poly_divmod(remainders[index // 2], node, modulus)[1]
+                for index, node in enumerate(level)
+            ]
+        return [remainder[0] if remainder else 0 for remainder in remainders]
+
+    # Comparison operators
+
+    def _convert_point(self, point):
+        if isinstance(point, Mod) and point._modulus != self._modulus:
+            raise ValueError(
+                "Not same modulus: {} != {}".format(
+                    self._modulus, point._modulus
+                )
+            )
+        return point
+
+    def _convert(self, other):
+        if isinstance(other, ModPoly):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            return other
+
+        if isinstance(other, (int, Mod)):
+            value = int(self._convert_point(other)) % self._modulus
+            return self._new([value] if value else [], self._modulus)
+
+        return None
+
+    def __eq__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+        return self._coefficients == converted._coefficients
+
+    # Arithmetic operations
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        modulus = self._modulus
+        return self._new(
+            [-value % modulus for value in self._coefficients], modulus
+        )
+
+    def __add__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+
+        modulus = self._modulus
+        total = _poly_add(self._coefficients, converted._coefficients)
+        return self._new(
+            _poly_trim([value % modulus for value in total]), modulus
+        )
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+        return self + (-converted)
+
+    def __rsub__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+        return converted + (-self)
+
+    def __mul__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+
+        modulus = self._modulus
+        product = _poly_mul(
+            list(self._coefficients), list(converted._coefficients), modulus
+        )
+        return self._new(_poly_trim(product), modulus)
+
+    __rmul__ = __mul__
+
+    def __divmod__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+
+        quotient, remainder = _poly_divmod(
+            list(self._coefficients), list(converted._coefficients),
+            self._modulus,
+        )
+        return (self._new(quotient, self._modulus),
+                self._new(remainder, self._modulus))
+
+    def __floordiv__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[0]
+
+    def __mod__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[1]
+
+    def __pow__(self, exponent, modulo=None):
+        if not isinstance(exponent, int) or exponent < 0:
+            raise ValueError("Exponent must be a non-negative integer")
+
+        if modulo is not None:
+            modulo = self._convert(modulo)
+            base = self % modulo
+        else:
+            base = self
+
+        result = self._convert(1)
+        while exponent:
+            if exponent & 1:
+                result = result * base
+                if modulo is not None:
+                    result = result % modulo
+            exponent >>= 1
+            if exponent:
+                base = base * base
+                if modulo is not None:
+                    base = base % modulo
+        return result
+
+    def gcd(self, other):
+        """Monic greatest common divisor, with Euclid's algorithm
+
+        :param other: :class:`ModPoly`
+        :rtype: ModPoly
+        :raises ValueError: a leading coefficient cannot be inverted,
+            usually because the modulus is not prime
+        """
+        left, right = self, self._convert(other)
+        while right:
+            left, right = right, left % right
+        return left.monic()
+
+
+def _matrix_dot(left, right, modulus):
+    # Reduced product of two int matrices stored as lists of rows,
+    # each dot product is accumulated in plain ints and reduced once
+    size = len(right[0]) if right else 0
+    if not left or not size or not right:
+        return [[0] * size for _ in left]
+
+    if numpy is None:
+        columns = list(zip(*right))
+        return [[sum(map(mul, row, column)) % modulus for column in columns]
+                for row in left]
+
+    if modulus > _HALF_WORD:
+        product = numpy.array(left, dtype=object).dot(
+            numpy.array(right, dtype=object)
+        )
+        return (product % modulus).tolist()
+
+    # Block the inner dimension so that uint64 sums cannot overflow
+    wide = numpy.uint64(modulus)
+    block = max(((1 << 64) - 1) // max((modulus - 1)**2, 1), 1)
+    left = numpy.array(left, dtype=numpy.uint64)
+    right = numpy.array(right, dtype=numpy.uint64)
+    result = numpy.zeros((left.shape[0], right.shape[1]), dtype=numpy.uint64)
+    for start in range(0, left.shape[1], block):
+        partial = left[:, start:start + block].dot(right[start:start + block])
+        result = (result + partial % wide) % wide
+    return result.tolist()
+
+
+def _row_reduce(rows, modulus, columns):
+    # Reduced row echelon form of the first *columns* columns,
+    # returns (rows, pivot columns, determinant of the square part)
+    if numpy is not None and rows and rows[0]:
+        if modulus <= _HALF_WORD:
+            scalar, dtype = numpy.uint64, numpy.uint64
+        else:
+            scalar, dtype = int, object
+        data = numpy.array(rows, dtype=dtype)
+        wide = scalar(modulus)
+    else:
+        data = [list(row) for row in rows]
+
+    pivots = []
+    determinant = 1
+    row = 0
+    for column in range(columns):
+        if row == len(rows):
+            break
+
+        pivot = None
+        for index in range(row, len(rows)):
+            value = int(data[index][column])
+            if gcd(value, modulus) == 1:
+                pivot = index
+                break
+            if value:
+                pivot = False
+        if pivot is False:
+            raise ValueError(
+                "no invertible pivot in column {} modulo {}".format(
+                    column, modulus
+                )
+            )
+        if pivot is None:
+            determinant = 0
+            continue
+
+        if pivot != row:
+            determinant = -determinant
+            if isinstance(data, list):
+                data[pivot], data[row] = data[row], data[pivot]
+            else:
+                data[[pivot, row]] = data[[row, pivot]]
+
+        value = int(data[row][column])
+        determinant = determinant * value % modulus
+        inverse = Mod._new(value, modulus).inverse._value
+
+        if isinstance(data, list):
+            pivot_row = [item * inverse % modulus for item in data[row]]
+            data[row] = pivot_row
+            for index, other in enumerate(data):
+                factor = other[column]
+                if index != row and factor:
+                    data[index] = [
+                        (item - factor * pivot_item) % modulus
+                        for item, pivot_item in zip(other, pivot_row)
+                    ]
+        else:
+            pivot_row = data[row] * scalar(inverse) % wide
+            data[row] = pivot_row
+            factors = data[:, column] % wide
+            factors[row] = 0
+            data = (data + (wide - factors)[:, None] * pivot_row % wide) % wide
+
+        pivots.append(column)
+        row += 1
+
+    if len(pivots) < min(columns, len(rows)) or len(rows) != columns:
+        determinant = 0
+    if not isinstance(data, list):
+        data = data.tolist()
+    return data, pivots, determinant % modulus
+
+
+def _bareiss(rows):
+    # Fraction-free determinant over the integers
+    data = [list(row) for row in rows]
+    size = len(data)
+    sign, previous = 1, 1
+    for step in range(size - 1):
+        if not data[step][step]:
+            for index in range(step + 1, size):
+                if data[index][step]:
+                    data[step], data[index] = data[index], data[step]
+                    sign = -sign
+                    break
+            else:
+                return 0
+        pivot = data[step][step]
+        for index in range(step + 1, size):
+            row = data[index]
+            for column in range(step + 1, size):
+                row[column] = (
+                    row[column] * pivot - row[step] * data[step][column]
+                ) // previous
+        previous = pivot
+    return sign * data[-1][-1] if size else 1
+
+
+class ModMatrix:
+    """Dense matrix with integer entries modulo *n*.
+
+    ``@`` multiplies matrices with dot products accumulated in plain
+    integers and reduced once, vectorized with NumPy when available.
+    ``+``, ``-`` and ``*`` act elementwise with matrices, ``int``
+    and :class:`Mod` scalars, ``**`` raises square matrices to integer
+    powers by squaring.
+    Elimination-based methods need invertible pivots, which is always
+    the case when the modulus is prime.
+
+    >>> fibonacci = ModMatrix([[1, 1], [1, 0]], 1000)
+    >>> fibonacci**10
+    ModMatrix([[89, 55], [55, 34]] % 1000)
+    >>> ModMatrix([[2, 1], [1, 1]], 7).solve([3, 2])
+    [(1 % 7), (1 % 7)]
+    >>>
+
+    :param rows: iterable of rows of ``int`` or :class:`Mod`
+    :param int modulus: positive modulus of the entries
+    :raises ValueError: rows of different lengths,
+        or *modulus* is not a positive integer
+    """
+
+    __slots__ = ('_rows', '_modulus')
+
+    def __init__(self, rows, modulus):
+        if not isinstance(modulus, Number):
+            raise ValueError("Modulus is not a number")
+
+        if modulus != int(modulus) or modulus < 1:
+            raise ValueError("Modulus is not a positive integer")
+
+        self._modulus = int(modulus)
+        self._rows = [
+            [int(value) % self._modulus for value in row] for row in rows
+        ]
+        if len(set(len(row) for row in self._rows)) > 1:
+            raise ValueError("Rows have different lengths")
+
+    @classmethod
+    def _new(cls, rows, modulus):
+        # Unchecked constructor: rows of reduced ints
+        matrix = object.__new__(cls)
+        matrix._rows = rows
+        matrix._modulus = modulus
+        return matrix
+
+    @classmethod
+    def identity(cls, size, modulus):
+        """Identity matrix
+
+        :param int size: number of rows and columns
+        :param int modulus: modulus of the entries
+        :rtype: ModMatrix
+        """
+        return cls([[int(row == column) for column in range(size)]
+                    for row in range(size)], modulus)
+
+    def __repr__(self):
+        return "ModMatrix({} % {})".format(self._rows, self._modulus)
+
+    def __getitem__(self, index):
+        row, column = index
+        return Mod._new(self._rows[row][column], self._modulus)
+
+    def __hash__(self):
+        return hash((tuple(map(tuple, self._rows)), self._modulus))
+
+    @property
+    def modulus(self):
+        """Modulus of the entries
+
+        :rtype: int
+        """
+        return self._modulus
+
+    @property
+    def shape(self):
+        """Number of rows and columns
+
+        :rtype: tuple
+        """
+        return len(self._rows), len(self._rows[0]) if self._rows else 0
+
+    @property
+    def rows(self):
+        """Entries as a tuple of rows of ``int``
+
+        :rtype: tuple
+        """
+        return tuple(tuple(row) for row in self._rows)
+
+    def transpose(self):
+        """Transposed matrix
+
+        :rtype: ModMatrix
+        """
+        return self._new([list(column) for column in zip(*self._rows)],
+                         self._modulus)
+
+    # Comparison operators
+
+    def _convert(self, other):
+        if isinstance(other, ModMatrix):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            if other.shape != self.shape:
+                raise ValueError(
+                    "Not same shape: {} != {}".format(self.shape, other.shape)
+                )
+            return other._rows
+
+        if isinstance(other, Mod):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            return int(other._value)
+
+        if isinstance(other, int):
+            return other % self._modulus
+
+        return None
+
+    def __eq__(self, other):
+        if not isinstance(other, ModMatrix):
+            return NotImplemented
+        return self._modulus == other._modulus and self._rows == other._rows
+
+    # Arithmetic operations
+
+    def _elementwise(self, other, operation):
+        converted = self._convert(other)
+        if converted is None:
+            return NotImplemented
+
+        modulus = self._modulus
+        if isinstance(converted, int):
+            rows = [[operation(value, converted) % modulus for value in row]
+                    for row in self._rows]
+        else:
+            rows = [[operation(value, item) % modulus
+                     for value, item in zip(row, other_row)]
+                    for row, other_row in zip(self._rows, converted)]
+        return self._new(rows, modulus)
+
+    def __pos__(self):
+        return self
+
+    def __neg__(self):
+        return self._elementwise(-1, mul)
+
+    def __add__(self, other):
+        return self._elementwise(other, add)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._elementwise(other, sub)
+
+    def __rsub__(self, other):
+        return (-self)._elementwise(other, add)
+
+    def __mul__(self, other):
+        return self._elementwise(other, mul)
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, other):
+        if not isinstance(other, ModMatrix):
+            return NotImplemented
+        if other._modulus != self._modulus:
+            raise ValueError(
+                "Not same modulus: {} != {}".format(
+                    self._modulus, other._modulus
+                )
+            )
+        if self.shape[1] != other.shape[0]:
+            raise ValueError(
+                "Shapes {} and {} cannot be multiplied".format(
+                    self.shape, other.shape
+                )
+            )
+        return self._new(
+            _matrix_dot(self._rows, other._rows, self._modulus),
+            self._modulus,
+        )
+
+    def _square(self):
+        rows, columns = self.shape
+        if rows != columns:
+            raise ValueError("Matrix is not square: {}".format(self.shape))
+        return rows
+
+    def __pow__(self, exponent):
+        if not isinstance(exponent, int):
+            return NotImplemented
+
+        size = self._square()
+        base = self
+        if exponent < 0:
+            base, exponent = self.inverse, -exponent
+
+        result = ModMatrix.identity(size, self._modulus)
+        while exponent:
+            if exponent & 1:
+                result = result @ base
+            exponent >>= 1
+            if exponent:
+                base = base @ base
+        return result
+
+    # Linear algebra
+
+    def rank(self):
+        """Rank of the matrix
+
+        :rtype: int
+        :raises ValueError: no invertible pivot for a non-zero column
+        """
+        return len(_row_reduce(self._rows, self._modulus, self.shape[1])[1])
+
+    def determinant(self):
+        """Determinant of a square matrix
+
+        :rtype: Mod
+        :raises ValueError: the matrix is not square
+        """
+        size = self._square()
+        try:
+            determinant = _row_reduce(self._rows, self._modulus, size)[2]
+        except ValueError:
+            # Non-invertible pivots, fall back to exact integer elimination
+            determinant = _bareiss(self._rows)
+        return Mod._new(determinant % self._modulus, self._modulus)
+
+    @property
+    def inverse(self):
+        """Inverse of a square matrix
+
+        :rtype: ModMatrix
+        :raises ValueError: the matrix cannot be inverted
+        """
+        size = self._square()
+        augmented = [
+            row + [int(index == column) for column in range(size)]
+            for index, row in enumerate(self._rows)
+        ]
+        modulus = self._modulus
+        try:
+            reduced, pivots, _ = _row_reduce(augmented, modulus, size)
+        except ValueError:
+            # No unit pivot, the matrix is still invertible over a
+            # composite modulus when its determinant is a unit
+            return self._adjugate_inverse()
+        if len(pivots) != size:
+            raise ValueError("the matrix cannot be inverted")
+        return self._new([row[size:] for row in reduced], modulus)
+
+    def _adjugate_inverse(self):
+        # adjugate × det⁻¹, with cofactors computed over the integers
+        modulus = self._modulus
+        size = len(self._rows)
+        determinant = _bareiss(self._rows) % modulus
+        if gcd(determinant, modulus) != 1:
+            raise ValueError(
+                "the matrix cannot be inverted: no unit pivot and the "
+                "determinant {} is not invertible modulo {}".format(
+                    determinant, modulus
+                )
+            )
+        factor = Mod._new(determinant, modulus).inverse._value
+
+        def cofactor(row, column):
+            minor = [
+                values[:column] + values[column + 1:]
+                for index, values in enumerate(self._rows) if index != row
+            ]
+            sign = -1 if (row + column) % 2 else 1
+            return sign * _bareiss(minor)
+
+        return self._new([
+            [cofactor(column, row) * factor % modulus
+             for column in range(size)]
+            for row in range(size)
+        ], modulus)
+
+    def solve(self, vector):
+        """A solution *x* of ``self @ x = vector``
+
+        :param vector: one ``int`` or :class:`Mod` per row
+        :rtype: list
+        :raises ValueError: the system has no solution
+        """
+        rows, columns = self.shape
+        vector = [int(value) % self._modulus for value in vector]
+        if len(vector) != rows:
+            raise ValueError(
+                "Expected {} values, got {}".format(rows, len(vector))
+            )
+
+        augmented = [row + [value] for row, value in zip(self._rows, vector)]
+        reduced, pivots, _ = _row_reduce(augmented, self._modulus, columns)
+        if any(row[-1] for row in reduced[len(pivots):]):
+            raise ValueError("the system has no solution")
+
+        solution = [0] * columns
+        for row, column in zip(reduced, pivots):
+            solution[column] = row[-1]
+        return [Mod._new(value, self._modulus) for value in solution]
+
+    def kernel(self):
+        """Basis of the null space: vectors *x* with ``self @ x = 0``
+
+        :rtype: list
+        """
+        columns = self.shape[1]
+        reduced, pivots, _ = _row_reduce(self._rows, self._modulus, columns)
+        modulus = self._modulus
+        basis = []
+        for free in range(columns):
+            if free in pivots:
+                continue
+            vector = [0] * columns
+            vector[free] = 1
+            for row, column in zip(reduced, pivots):
+                vector[column] = -row[free] % modulus
+            basis.append([Mod._new(value, modulus) for value in vector])
+        return basis
+
+
+class FixedBase:
+    """Precomputed powers of a fixed base for repeated exponentiation.
+
+    The table holds ``base^(d × 2^(w × i))`` for every *w*-bit digit
+    *d* and position *i*, so that raising the base to an exponent of
+    up to *max_bits* bits costs one multiplication per non-zero digit
+    and no squaring at all.
+
+    >>> generator = FixedBase(Mod(3, 61423), 16)
+    >>> generator.pow(40619)
+    (15824 % 61423)
+    >>> generator.pow(40619) == Mod(3, 61423)**40619
+    True
+    >>>
+
+    :param Mod base: base of the powers
+    :param int max_bits: largest exponent size served from the table
+    :param int width: window width *w* in bits
+    :raises ValueError: *base* is not a :class:`Mod` number
+    """
+
+    __slots__ = ('_base', '_bits', '_width', '_table')
+
+    def __init__(self, base, max_bits, width=_WINDOW_WIDTH):
+        if not isinstance(base, Mod):
+            raise ValueError("Base is not a Mod number")
+        if max_bits < 1 or width < 1:
+            raise ValueError("Sizes must be positive")
+
+        self._base = base
+        self._bits = max_bits
+        self._width = width
+
+        modulus = base._modulus
+        table = []
+        power = base._value
+        for _ in range(-(-max_bits // width)):
+            row = [1 % modulus, power]
+            for _ in range(2, 1 << width):
+                row.append(row[-1] * power % modulus)
+            table.append(row)
+            # Next position: power^(2^w) = power^(2^w - 1) × power
+            power = row[-1] * power % modulus
+        self._table = table
+
+    def __repr__(self):
+        return "FixedBase({!r}, {})".format(self._base, self._bits)
+
+    @property
+    def base(self):
+        """Base of the powers
+
+        :rtype: Mod
+        """
+        return self._base
+
+    def pow(self, exponent):
+        """Base raised to *exponent*
+
+        Exponents wider than *max_bits* fall back to the native ``pow``.
+
+        :param exponent: ``int`` or :class:`Mod`
+        :rtype: Mod
+        """
+        exponent = int(exponent)
+        if exponent < 0:
+            return self.pow(-exponent).inverse
+        if exponent.bit_length() > self._bits:
+            return self._base**exponent
+
+        modulus = self._base._modulus
+        mask = (1 << self._width) - 1
+        result = 1 % modulus
+        for row in self._table:
+            digit = exponent & mask
+            if digit:
+                result = result * row[digit] % modulus
+            exponent >>= self._width
+            if not exponent:
+                break
+        return Mod._new(result, modulus)
+
+    def pow_many(self, exponents):
+        """Base raised to each exponent
+
+        :param exponents: iterable of ``int`` or :class:`Mod`
+        :rtype: list
+        """
+        return [self.pow(exponent) for exponent in exponents]
+
+
+# Chunks submitted per worker by pow_many and inverse_many
+_PARALLEL_CHUNKS = 4
+
+
+def _pack_values(values, width, signed=True):
+    # Fixed-width little-endian buffer of ints
+    if not signed and numpy is not None and width in (1, 2, 4, 8):
+        return numpy.array(values, dtype='<u{}'.format(width)).tobytes()
+    return b''.join(
+        value.to_bytes(width, 'little', signed=signed) for value in values
+    )
+
+
+def _unpack_values(buffer, width, signed=True):
+    if not signed and numpy is not None and width in (1, 2, 4, 8):
+        return numpy.frombuffer(buffer, dtype='<u{}'.format(width)).tolist()
+    view = memoryview(buffer)
+    return [
+        int.from_bytes(view[start:start + width], 'little', signed=signed)
+        for start in range(0, len(view), width)
+    ]
+
+
+def _pow_chunk(buffer, width, modulus, exponent):
+    # Runs in pool workers: powers of the packed residues of one chunk
+    modulus = _backend_modulus(modulus)
+    values = [
+        pow(value % modulus, abs(exponent), modulus)
+        for value in _unpack_values(buffer, width)
+    ]
+    if exponent < 0:
+        inverses = _batch_invert(values, modulus)
+        if None in inverses:
+            value = values[inverses.index(None)]
+            raise ValueError("the value {} cannot be inverted".format(
+                Mod._new(value, modulus)
+            ))
+        values = inverses
+    return _pack_values([int(value) for value in values], width)
+
+
+def _invert_chunk(buffer, width, modulus):
+    # Runs in pool workers: inverses of the packed residues of one chunk,
+    # with the indexes of the values that cannot be inverted
+    modulus = _backend_modulus(modulus)
+    values = [value % modulus for value in _unpack_values(buffer, width)]
+    inverses = _batch_invert(values, modulus)
+    missing = [index for index, value in enumerate(inverses) if value is None]
+    return _pack_values([int(value or 0) for value in inverses], width), \
+        missing
+
+
+def _run_chunks(task, values, modulus, arguments, workers, executor):
+    # Maps *task* over fixed-width chunks of *values*, in input order
+    if workers is None:
+        workers = os.cpu_count() or 1
+    width = abs(modulus).bit_length() // 8 + 1
+    size = max(-(-len(values) // (workers * _PARALLEL_CHUNKS)), 1)
+    chunks = [
+        _pack_values(values[start:start + size], width)
+        for start in range(0, len(values), size)
+    ]
+    count = len(chunks)
+    arguments = [[width] * count, [modulus] * count] + \
+        [[argument] * count for argument in arguments]
+
+    if executor is not None:
+        return list(executor.map(task, chunks, *arguments))
+    if workers == 1:
+        return list(map(task, chunks, *arguments))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(task, chunks, *arguments))
+
+
+def pow_many(bases, exponent, modulus=None, workers=None, executor=None):
+    """Raise many numbers to the same power in a pool of processes.
+
+    The bases are split in chunks that travel to the workers as
+    fixed-width byte buffers instead of pickled :class:`Mod` numbers,
+    results come back in input order.
+
+    >>> pow_many([2, 3, Mod(4, 7)], 2, 7, workers=1)
+    [(4 % 7), (2 % 7), (2 % 7)]
+    >>>
+
+    :param bases: iterable of ``int`` or :class:`Mod`
+    :param exponent: ``int`` or :class:`Mod` exponent
+    :param int modulus: modulus of the ``int`` bases,
+        defaults to the modulus of the first :class:`Mod`
+    :param int workers: number of processes, defaults to the CPU count,
+        ``1`` computes in the current process
+    :param executor: ``concurrent.futures`` executor to reuse
+        instead of starting a new pool
+    :rtype: list
+    :raises ValueError: the bases do not share the same modulus
+        or one of them cannot be inverted for a negative exponent
+    """
+    values, modulus = _common_values(bases, modulus)
+    if not values:
+        return []
+
+    modulus = int(modulus)
+    exponent = _reduce_exponent(int(exponent), modulus)
+    chunks = _run_chunks(
+        _pow_chunk, values, modulus, [exponent], workers, executor
+    )
+    stored = _backend_modulus(modulus)
+    width = abs(modulus).bit_length() // 8 + 1
+    return [
+        Mod._new(value % stored, stored)
+        for chunk in chunks for value in _unpack_values(chunk, width)
+    ]
+
+
+def inverse_many(numbers, modulus=None, workers=None, executor=None):
+    """Modular inverses of many numbers in a pool of processes.
+
+    Each worker inverts its chunk with Montgomery's trick,
+    see :meth:`Mod.batch_inverse`. Values that cannot be inverted
+    do not raise, their inverse is ``None``.
+
+    >>> inverse_many([2, 3, 4], 9, workers=1)
+    [(5 % 9), None, (7 % 9)]
+    >>>
+
+    :param numbers: iterable of ``int`` or :class:`Mod`
+    :param int modulus: modulus of the ``int`` numbers,
+        defaults to the modulus of the first :class:`Mod`
+    :param int workers: number of processes, defaults to the CPU count,
+        ``1`` computes in the current process
+    :param executor: ``concurrent.futures`` executor to reuse
+        instead of starting a new pool
+    :rtype: list
+    :raises ValueError: the numbers do not share the same modulus
+    """
+    values, modulus = _common_values(numbers, modulus)
+    if not values:
+        return []
+
+    modulus = int(modulus)
+    chunks = _run_chunks(
+        _invert_chunk, values, modulus, [], workers, executor
+    )
+    stored = _backend_modulus(modulus)
+    width = abs(modulus).bit_length() // 8 + 1
+    results = []
+    for chunk, missing in chunks:
+        start = len(results)
+        results.extend(
+            Mod._new(value % stored, stored)
+            for value in _unpack_values(chunk, width)
+        )
+        for index in missing:
+            results[start + index] = None
+    return results
+
+
+# Residues below this bound have products that fit in 64 bits
+_HALF_WORD = 1 << 32
+
+# Largest modulus stored in a native uint64 buffer, sums of two residues
+# still fit in 64 bits
+_NATIVE_MODULUS = 1 << 63
+
+# Largest modulus for which the long double quotient estimate is exact
+# enough to recover products from their low 64 bits
+_WIDE_MODULUS = 1 << 62
+
+_LONG_DOUBLE = (
+    numpy is not None and numpy.finfo(numpy.longdouble).nmant >= 63
+)
+
+
+def _array_addmod(left, right, modulus):
+    # Both operands are reduced uint64 residues and modulus <= 2^63,
+    # so the sum cannot wrap around
+    total = left + right
+    return numpy.where(total >= modulus, total - modulus, total)
+
+
+def _array_mulmod(left, right, modulus):
+    # Elementwise ``left * right % modulus`` on uint64 residues that
+    # never overflows, even when the residues are 63 bits wide
+    if modulus <= _HALF_WORD:
+        return left * right % numpy.uint64(modulus)
+
+    if _LONG_DOUBLE and modulus <= _WIDE_MODULUS:
+        # Estimate the quotient with a 64-bit mantissa, it is off by one
+        # at most, then fix the remainder with wrapping 64-bit arithmetic
+        wide = numpy.longdouble
+        left = numpy.asarray(left)
+        right = numpy.asarray(right)
+        quotient = (
+            left.astype(wide) * right.astype(wide) / wide(modulus)
+        ).astype(numpy.uint64)
+        remainder = (left * right - quotient * numpy.uint64(modulus))
+        remainder = remainder.view(numpy.int64) % numpy.int64(modulus)
+        return remainder.astype(numpy.uint64)
+
+    # Widest moduli: exact Python ints beat any emulated 128-bit product
+    left, right = numpy.broadcast_arrays(left, right)
+    return numpy.array(
+        [x * y % modulus for x, y in zip(left.tolist(), right.tolist())],
+        dtype=numpy.uint64,
+    )
+
+
+class ModArray:
+    """Vector of integers sharing the same modulus.
+
+    Residues are stored in a NumPy ``uint64`` buffer when the modulus
+    fits in 63 bits and in an ``object`` buffer otherwise.
+    Operations are applied elementwise and follow the same rules as
+    :class:`Mod`: an ``int`` or a :class:`Mod` operand is broadcast,
+    a ``float`` operand gives a ``float`` array.
+
+    >>> vector = ModArray([1, 2, 3], 5)
+    >>> vector * 4
+    ModArray([4, 3, 2] % 5)
+    >>> vector.sum()
+    (1 % 5)
+    >>>
+
+    :param values: iterable of integers or NumPy integer array
+    :param int modulus: modulus shared by all the values
+    :raises ValueError: *modulus* is not a non-zero integer
+    :raises ImportError: NumPy is not installed
+    """
+
+    __slots__ = ('_values', '_modulus')
+
+    def __init__(self, values, modulus):
+        if numpy is None:
+            raise ImportError("ModArray requires numpy")
+
+        if not isinstance(modulus, Number):
+            raise ValueError("Modulus is not a number")
+
+        if modulus == 0:
+            raise ValueError("Modulus value cannot be zero")
+
+        if modulus != int(modulus):
+            raise ValueError("Modulus is not an integer")
+
+        self._modulus = int(modulus)
+        self._values = self._reduce(values, self._modulus)
+
+    @classmethod
+    def _new(cls, values, modulus):
+        # Unchecked constructor: *values* must be a reduced buffer
+        # with the dtype expected for *modulus*
+        array = object.__new__(cls)
+        array._values = values
+        array._modulus = modulus
+        return array
+
+    @staticmethod
+    def _is_native(modulus):
+        return 0 < modulus <= _NATIVE_MODULUS
+
+    @classmethod
+    def _reduce(cls, values, modulus):
+        if not cls._is_native(modulus):
+            return numpy.array(
+                [int(value) % modulus for value in values], dtype=object
+            ).reshape(-1)
+
+        if isinstance(values, numpy.ndarray):
+            if values.dtype.kind == 'u':
+                return values.astype(numpy.uint64) % numpy.uint64(modulus)
+            if values.dtype.kind == 'i':
+                values = values.astype(numpy.int64)
+                if modulus == _NATIVE_MODULUS:
+                    # 2^63 divides 2^64, wrapping around is harmless
+                    return values.astype(numpy.uint64) % numpy.uint64(modulus)
+                return (values % numpy.int64(modulus)).astype(numpy.uint64)
+
+        return numpy.array(
+            [int(value) % modulus for value in values], dtype=numpy.uint64
+        ).reshape(-1)
+
+    def __repr__(self):
+        return "ModArray({} % {})".format(self.tolist(), self._modulus)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        modulus = self._modulus
+        for value in self._values:
+            yield Mod._new(int(value), modulus)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._new(self._values[index], self._modulus)
+        return Mod._new(int(self._values[index]), self._modulus)
+
+    @property
+    def modulus(self):
+        """Modulus value
+
+        :rtype: int
+        """
+        return self._modulus
+
+    @property
+    def values(self):
+        """Read-only view of the residues
+
+        :rtype: numpy.ndarray
+        """
+        view = self._values.view()
+        view.flags.writeable = False
+        return view
+
+    def tolist(self):
+        """Residues as a list of ``int``
+
+        :rtype: list
+        """
+        return [int(value) for value in self._values]
+
+    def copy(self, modulus=None):
+        """Copy the array
+
+        :param int modulus: modulus of the new array
+        :rtype: ModArray
+        """
+        if not modulus:
+            return self._new(self._values.copy(), self._modulus)
+        return ModArray(self.tolist(), modulus)
+
+    # Reductions
+
+    def sum(self):
+        """Sum of the values
+
+        :rtype: Mod
+        """
+        if self._values.dtype == object:
+            total = sum(self._values.tolist())
+        else:
+            # Split in 32-bit halves so that NumPy sums cannot overflow
+            low = self._values & numpy.uint64(_HALF_WORD - 1)
+            high = self._values >> numpy.uint64(32)
+            total = 0
+            step = _HALF_WORD - 1
+            for start in range(0, len(low), step):
+                total += int(low[start:start + step].sum())
+                total += int(high[start:start + step].sum()) << 32
+        return Mod._new(total % self._modulus, self._modulus)
+
+    def prod(self):
+        """Product of the values
+
+        :rtype: Mod
+        """
+        modulus = self._modulus
+        values = self._values
+        if values.dtype == object:
+            result = 1 % modulus
+            for value in values.tolist():
+                result = result * value % modulus
+            return Mod._new(result, modulus)
+
+        # Pairwise product tree, log2(n) vectorized multiplications
+        while len(values) > 1:
+            if len(values) % 2:
+                values = numpy.append(values, numpy.uint64(1))
+            values = _array_mulmod(values[0::2], values[1::2], modulus)
+        result = int(values[0]) if len(values) else 1
+        return Mod._new(result % modulus, modulus)
+
+    # Conversions
+
+    def _scalar(self, value):
+        if self._values.dtype == object:
+            return value
+        return numpy.uint64(value)
+
+    def _convert(self, other):
+        if isinstance(other, ModArray):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            if len(other) != len(self):
+                raise ValueError(
+                    "Not same length: {} != {}".format(len(self), len(other))
+                )
+            return other._values
+
+        if isinstance(other, Mod):
+            if other._modulus != self._modulus:
+                raise ValueError(
+                    "Not same modulus: {} != {}".format(
+                        self._modulus, other._modulus
+                    )
+                )
+            return self._scalar(other._value)
+
+        if isinstance(other, (int, numpy.integer)):
+            return self._scalar(int(other) % self._modulus)
+
+        return None
+
+    def _float(self):
+        return self._values.astype(float)
+
+    # Comparison operators
+
+    def __eq__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return self._float() == other
+        return self._values == converted
+
+    def __ne__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return self._float() != other
+        return self._values != converted
+
+    __hash__ = None
+
+    # Arithmetic operations
+
+    def _add(self, left, right):
+        if self._values.dtype == object:
+            return (left + right) % self._modulus
+        return _array_addmod(left, right, numpy.uint64(self._modulus))
+
+    def _sub(self, left, right):
+        if self._values.dtype == object:
+            return (left - right) % self._modulus
+        modulus = numpy.uint64(self._modulus)
+        return _array_addmod(left, (modulus - right) % modulus, modulus)
+
+    def _mul(self, left, right):
+        if self._values.dtype == object:
+            return (left * right) % self._modulus
+        return _array_mulmod(left, right, self._modulus)
+
+    def __pos__(self):
+        return self.copy()
+
+    def __neg__(self):
+        return self._new(self._sub(self._scalar(0), self._values),
+                         self._modulus)
+
+    def __add__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return self._float() + other
+        return self._new(self._add(self._values, converted), self._modulus)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return self._float() - other
+        return self._new(self._sub(self._values, converted), self._modulus)
+
+    def __rsub__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return other - self._float()
+        return self._new(self._sub(converted, self._values), self._modulus)
+
+    def __mul__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return self._float() * other
+        return self._new(self._mul(self._values, converted), self._modulus)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return self._float() / float(other)
+
+    def __rtruediv__(self, other):
+        return float(other) / self._float()
+
+    @property
+    def inverse(self):
+        """Modular inverse of each value
+
+        :rtype: ModArray
+        :raises ValueError: one of the values cannot be inverted
+        """
+        inverses, invertible = self.batch_inverse()
+        if not invertible.all():
+            value = self[int(numpy.argmin(invertible))]
+            raise ValueError("the value {} cannot be inverted".format(value))
+        return inverses
+
+    def batch_inverse(self):
+        """Modular inverse of each value, with Montgomery's trick.
+
+        Values that cannot be inverted do not raise, their inverse
+        is set to ``0`` and they are flagged in the returned mask.
+
+        :return: inverses and boolean mask of the invertible values
+        :rtype: tuple(ModArray, numpy.ndarray)
+        """
+        modulus = self._modulus
+        values = self._values
+        if values.dtype == object:
+            inverses = _batch_invert(values.tolist(), modulus)
+            invertible = numpy.array(
+                [value is not None for value in inverses], dtype=bool
+            )
+            inverses = numpy.array(
+                [value or 0 for value in inverses], dtype=object
+            ).reshape(-1)
+            return self._new(inverses, modulus), invertible
+
+        invertible = numpy.gcd(values, numpy.uint64(modulus)) == 1
+        values = numpy.where(invertible, values, numpy.uint64(1 % modulus))
+
+        # Product tree, one inversion at the root, then each child
+        # inverse is its parent inverse times its sibling
+        levels = []
+        level = values
+        while len(level) > 1:
+            if len(level) % 2:
+                level = numpy.append(level, numpy.uint64(1 % modulus))
+            levels.append(level)
+            level = _array_mulmod(level[0::2], level[1::2], modulus)
+
+        inverses = level
+        if len(level):
+            root = Mod._new(int(level[0]), modulus).inverse._value
+            inverses = numpy.array([root], dtype=numpy.uint64)
+        for level in reversed(levels):
+            inverses = inverses[:len(level) // 2]
+            children = numpy.empty(len(level), dtype=numpy.uint64)
+            children[0::2] = _array_mulmod(inverses, level[1::2], modulus)
+            children[1::2] = _array_mulmod(inverses, level[0::2], modulus)
+            inverses = children
+
+        inverses = numpy.where(
+            invertible, inverses[:len(values)], numpy.uint64(0)
+        )
+        return self._new(inverses, modulus), invertible
+
+    def __floordiv__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return self._float() // other
+
+        if not isinstance(other, ModArray):
+            # Scalar divisor: a single inversion
+            if not converted:
+                raise ZeroDivisionError('integer division by zero')
+            inverse = Mod._new(int(converted), self._modulus).inverse
+            return self._new(
+                self._mul(self._values, self._scalar(int(inverse._value))),
+                self._modulus,
+            )
+
+        if not converted.all():
+            raise ZeroDivisionError('integer division by zero')
+        return self * other.inverse
+
+    def __rfloordiv__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return other // self._float()
+
+        if not self._values.all():
+            raise ZeroDivisionError('integer division by zero')
+        return self.inverse * other
+
+    def __pow__(self, other):
+        if isinstance(other, Mod):
+            # Same modulus check as the other operators, the exponent
+            # itself is not reduced
+            self._convert(other)
+            other = int(other._value)
+        if not isinstance(other, (int, numpy.integer)):
+            return self._float() ** other
+
+        exponent = int(other)
+        base = self
+        if exponent < 0:
+            base, exponent = self.inverse, -exponent
+
+        # Square-and-multiply over the whole buffer at once
+        result = numpy.full(
+            self._values.shape, 1 % self._modulus,
+            dtype=self._values.dtype,
+        )
+        square = base._values
+        while exponent:
+            if exponent & 1:
+                result = self._mul(result, square)
+            exponent >>= 1
+            if exponent:
+                square = self._mul(square, square)
+        return self._new(result, self._modulus)
+
+    def __rpow__(self, other):
+        converted = self._convert(other)
+        if converted is None:
+            return other ** self._float()
+
+        base = int(converted)
+        modulus = self._modulus
+        values = [pow(base, int(value), modulus) for value in self._values]
+        return self._new(
+            numpy.array(values, dtype=self._values.dtype), modulus
+        )
+
+
+# Header of residue files: magic, version, reserved byte, residue width,
+# residue count and modulus size, followed by the modulus itself and
+# padding up to a multiple of 8 bytes
+_FILE_MAGIC = b'MODR'
+_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct('<4sBBHQI')
+
+
+class ModView:
+    """Read-only sequence of residues in the binary file format
+    written by :meth:`save`.
+
+    A file starts with a header that records the modulus and the width
+    of the residues, followed by the residues as fixed-width
+    little-endian integers, see :meth:`Mod.pack_many`.
+    :meth:`load` maps the file in memory instead of reading it, and
+    residues are only decoded when they are accessed.
+
+    >>> view = ModView(ModView.dumps([3, 5, 8], 7))
+    >>> len(view), view[2], view.tolist()
+    (3, (1 % 7), [3, 5, 1])
+    >>>
+
+    :param buffer: bytes-like object holding a whole file
+    :raises ValueError: the buffer is not a residue file
+    """
+
+    __slots__ = ('_data', '_modulus', '_width', '_handle')
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if not view.readonly:
+            view = memoryview(bytes(view))
+        if len(view) < _FILE_HEADER.size:
+            raise ValueError("Not a residue file")
+        magic, version, _, width, count, size = \
+            _FILE_HEADER.unpack_from(view)
+        if magic != _FILE_MAGIC or version != _FILE_VERSION or not width:
+            raise ValueError("Not a residue file")
+
+        start = _FILE_HEADER.size + size
+        modulus = int.from_bytes(
+            view[_FILE_HEADER.size:start], 'little', signed=True
+        )
+        if not modulus:
+            raise ValueError("Modulus value cannot be zero")
+
+        start += -start % 8
+        if len(view) < start + count * width:
+            raise ValueError("Truncated residue file")
+
+        self._modulus = modulus
+        self._width = width
+        self._data = view[start:start + count * width]
+        self._handle = None
+
+    @staticmethod
+    def dumps(numbers, modulus=None, width=None):
+        """Numbers in the residue file format
+
+        Use ``width=8`` with moduli up to ``2^63`` so that
+        :meth:`to_array` does not copy the residues.
+
+        :param numbers: :class:`ModArray` or iterable of ``int``
+            or :class:`Mod`
+        :param int modulus: modulus of the ``int`` numbers,
+            defaults to the modulus of the first :class:`Mod`
+        :param int width: size in bytes of each residue
+        :rtype: bytes
+        :raises ValueError: the numbers do not share the same modulus
+        """
+        if isinstance(numbers, ModArray) and modulus is None:
+            modulus = numbers._modulus
+        else:
+            numbers = list(numbers)
+            if modulus is None:
+                _, modulus = _common_values(numbers, modulus)
+                if modulus is None:
+                    raise ValueError("Modulus is missing")
+        modulus = int(modulus)
+        width = width or _residue_width(modulus)
+        data = Mod.pack_many(numbers, modulus, width)
+
+        size = (modulus.bit_length() + 8) // 8
+        header = _FILE_HEADER.pack(
+            _FILE_MAGIC, _FILE_VERSION, 0, width, len(data) // width, size
+        ) + modulus.to_bytes(size, 'little', signed=True)
+        return header + bytes(-len(header) % 8) + data
+
+    @classmethod
+    def save(cls, file, numbers, modulus=None, width=None):
+        """Write numbers to a residue file, see :meth:`dumps`
+
+        :param file: path or binary file object
+        :param numbers: :class:`ModArray` or iterable of ``int``
+            or :class:`Mod`
+        :param int modulus: modulus of the ``int`` numbers
+        :param int width: size in bytes of each residue
+        """
+        data = cls.dumps(numbers, modulus, width)
+        if hasattr(file, 'write'):
+            file.write(data)
+            return
+        with open(file, 'wb') as handle:
+            handle.write(data)
+
+    @classmethod
+    def load(cls, file):
+        """Map a residue file in memory
+
+        Falls back to reading the whole file when it cannot be mapped.
+
+        :param file: path or binary file object
+        :rtype: ModView
+        """
+        if not hasattr(file, 'read'):
+            with open(file, 'rb') as handle:
+                return cls.load(handle)
+
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            return cls(file.read())
+        try:
+            view = cls(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+        view._handle = buffer
+        return view
+
+    def close(self):
+        """Close the view and release the memory map of a loaded file
+
+        Arrays returned by :meth:`to_array` share the memory of the map,
+        it is then unmapped once the last of them is freed. Closing
+        twice does nothing, other uses of a closed view raise
+        :class:`ValueError`.
+        """
+        data, handle = self._data, self._handle
+        self._data = None
+        self._handle = None
+        if handle is not None:
+            try:
+                data.release()
+                handle.close()
+            except BufferError:
+                # Exported to NumPy arrays
+                pass
+
+    @property
+    def closed(self):
+        """Whether :meth:`close` was called
+
+        :rtype: bool
+        """
+        return self._data is None
+
+    def _buffer(self):
+        # Packed residues, checked for use after close
+        if self._data is None:
+            raise ValueError("view is closed")
+        return self._data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __repr__(self):
+        if self._data is None:
+            return "ModView(<closed> % {})".format(self._modulus)
+        return "ModView(<{} residues> % {})".format(len(self), self._modulus)
+
+    def __len__(self):
+        return len(self._buffer()) // self._width
+
+    def __getitem__(self, index):
+        data = self._buffer()
+        width = self._width
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[position]
+                        for position in range(start, stop, step)]
+            return Mod.unpack_many(
+                data[start * width:max(start, stop) * width],
+                self._modulus, width,
+            )
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ModView index out of range")
+        start = index * width
+        return Mod(
+            int.from_bytes(data[start:start + width], 'little'),
+            self._modulus,
+        )
+
+    def __iter__(self):
+        return iter(self[:])
+
+    @property
+    def modulus(self):
+        """Modulus value
+
+        :rtype: int
+        """
+        return self._modulus
+
+    @property
+    def width(self):
+        """Size in bytes of each residue
+
+        :rtype: int
+        """
+        return self._width
+
+    @property
+    def data(self):
+        """Read-only view of the packed residues
+
+        :rtype: memoryview
+        :raises ValueError: the view is closed
+        """
+        return self._buffer()
+
+    def tolist(self):
+        """Residues as a list of ``int``
+
+        :rtype: list
+        """
+        modulus = self._modulus
+        return [
+            value % modulus
+            for value in _unpack_values(self._buffer(), self._width,
+                                        signed=False)
+        ]
+
+    def to_array(self):
+        """Residues as a :class:`ModArray`
+
+        With 8-byte residues and a modulus up to ``2^63`` on
+        a little-endian machine, the array shares the memory of the
+        view instead of copying it. The residues of a file are trusted
+        to be reduced.
+
+        :rtype: ModArray
+        :raises ImportError: NumPy is not installed
+        :raises ValueError: the view is closed
+        """
+        if numpy is None:
+            raise ImportError("ModArray requires numpy")
+
+        if self._width == 8 and ModArray._is_native(self._modulus):
+            values = numpy.frombuffer(self._buffer(), dtype='<u8')
+            return ModArray._new(
+                values.astype(numpy.uint64, copy=False), self._modulus
+            )
+        return ModArray(self.tolist(), self._modulus)
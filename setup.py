@@ -56,6 +56,7 @@ setup(
     platforms='any',
     py_modules=['mod'],
     zip_safe=True,
+    extras_require={'gmpy2': ['gmpy2'], 'numpy': ['numpy']},
     # Test setup
     setup_requires=['pytest-runner'],
     tests_require='pytest',
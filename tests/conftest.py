@@ -0,0 +1,26 @@
+from pytest import fixture, skip
+
+import mod
+
+
+# Moduli shared by the tests that run over many moduli: trivial, small,
+# machine word limits, GMP-sized and negative
+MODULI = [
+    1, 2, 17, 257, 2**32 + 15, 2**61 - 1, 2**63 - 25, 2**63, 2**64,
+    2**89 - 1, 2**521 - 1, -13,
+]
+
+
+@fixture(autouse=True, params=['int', 'gmpy2'])
+def backend(request):
+    if request.param == 'gmpy2' and mod.gmpy2 is None:
+        skip('gmpy2 is not installed')
+
+    mod.set_backend(request.param)
+    yield request.param
+    mod.set_backend()
+
+
+@fixture(params=MODULI)
+def modulus(request):
+    return request.param
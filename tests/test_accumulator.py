@@ -0,0 +1,112 @@
+import random
+
+from pytest import fixture, raises
+
+from mod import Mod, ModAccumulator
+
+
+@fixture
+def values(modulus):
+    generator = random.Random(modulus)
+    return [generator.randrange(-2**1300, 2**1300) for _ in range(200)]
+
+
+def int_prod(values, modulus):
+    product = 1
+    for value in values:
+        product = product * value % modulus
+    return product % modulus
+
+
+def test_small_numbers():
+    assert Mod.sum([3, 5, 6], 7) == Mod(0, 7)
+    assert Mod.sum([Mod(3, 7), 12, -1]) == Mod(0, 7)
+    assert Mod.prod([3, 5, 6], 7) == Mod(6, 7)
+    assert Mod.dot([1, 2, 3], [4, 5, 6], 7) == Mod(4, 7)
+    assert Mod.sum([2**64 - 1] * 3, 2**64) == Mod(2**64 - 3, 2**64)
+
+
+def test_sum_prod(modulus, values):
+    numbers = [Mod(value, modulus) for value in values]
+    mixed = [value if index % 2 else Mod(value, modulus)
+             for index, value in enumerate(values)]
+    total = sum(values) % modulus
+    product = int_prod(values, modulus)
+
+    assert Mod.sum(numbers) == Mod(total, modulus)
+    assert Mod.sum(mixed) == Mod(total, modulus)
+    assert Mod.sum(values, modulus) == Mod(total, modulus)
+    assert Mod.sum(values, modulus).modulus == modulus
+    assert Mod.prod(numbers) == Mod(product, modulus)
+    assert Mod.prod(mixed) == Mod(product, modulus)
+    assert Mod.prod(values, modulus) == Mod(product, modulus)
+
+    assert Mod.sum([], modulus) == Mod(0, modulus)
+    assert Mod.prod([], modulus) == Mod(1, modulus)
+
+
+def test_dot(modulus, values):
+    left, right = values[:100], values[100:]
+    expected = Mod(sum(x * y for x, y in zip(left, right)), modulus)
+    assert Mod.dot(left, right, modulus) == expected
+    assert Mod.dot([Mod(x, modulus) for x in left], right) == expected
+    assert Mod.dot([], [], modulus) == Mod(0, modulus)
+
+
+def test_invalid_numbers():
+    with raises(ValueError):
+        Mod.sum([1, 2, 3])
+
+    with raises(ValueError):
+        Mod.sum([])
+
+    with raises(ValueError):
+        Mod.prod([Mod(1, 7), Mod(1, 11)])
+
+    with raises(ValueError):
+        Mod.dot([1, 2], [Mod(3, 7)])
+
+    with raises(ValueError):
+        Mod.dot([Mod(1, 7)], [Mod(1, 11)])
+
+
+def test_accumulator(modulus, values):
+    total = ModAccumulator(0, modulus)
+    product = ModAccumulator(Mod(1, modulus), modulus)
+    inner = ModAccumulator(5, modulus)
+    for value in values:
+        total += Mod(value, modulus)
+        total -= value // 3
+        product *= value
+        inner.add_product(Mod(value, modulus), value)
+
+    expected = sum(value - value // 3 for value in values)
+    assert total.value == Mod(expected, modulus)
+    assert product.value == Mod(int_prod(values, modulus), modulus)
+    assert inner.value == Mod(5 + sum(value**2 for value in values), modulus)
+    assert inner.value.modulus == inner.modulus == modulus
+
+
+def test_accumulator_in_place():
+    total = ModAccumulator(3, 7)
+    alias = total
+    total += 5
+    total *= Mod(3, 7)
+    assert total is alias
+    assert total.value == Mod(3, 7)
+    assert repr(total) == 'ModAccumulator(3 % 7)'
+
+    with raises(ValueError):
+        total += Mod(1, 11)
+
+    with raises(ValueError):
+        total.add_product(2, 2.5)
+
+    with raises(TypeError):
+        total += 2.5
+
+    with raises(TypeError):
+        hash(total)
+
+    with raises(ValueError):
+        ModAccumulator(0, 0)
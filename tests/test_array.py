@@ -0,0 +1,161 @@
+import random
+from math import gcd
+
+from pytest import fixture, importorskip, raises
+
+from mod import Mod, ModArray
+
+numpy = importorskip('numpy')
+
+
+@fixture
+def operands(modulus):
+    generator = random.Random(modulus)
+    left = [generator.randrange(-2**70, 2**70) for _ in range(64)]
+    right = [generator.randrange(-2**70, 2**70) for _ in range(64)]
+    return left, right
+
+
+def test_new_array():
+    vector = ModArray([7, 24, -3], 17)
+    assert vector.tolist() == [7, 7, 14]
+    assert vector.modulus == 17
+    assert len(vector) == 3
+    assert vector[1] == Mod(7, 17)
+    assert list(vector) == [Mod(7, 17), Mod(7, 17), Mod(14, 17)]
+
+    with raises(ValueError):
+        ModArray([1, 2], 0)
+
+    with raises(ValueError):
+        ModArray([1, 2], 7.5)
+
+
+def test_dtype():
+    assert ModArray([1], 2**63).values.dtype == numpy.uint64
+    assert ModArray([1], 2**63 + 1).values.dtype == object
+    assert ModArray([1], -7).values.dtype == object
+
+
+def test_from_numpy():
+    values = numpy.array([-1, 5, -2**63], dtype=numpy.int64)
+    assert ModArray(values, 7).tolist() == [6, 5, (-2**63) % 7]
+    assert ModArray(values, 2**63).tolist() == [2**63 - 1, 5, 0]
+
+
+def test_elementwise(modulus, operands):
+    left, right = operands
+    vector = ModArray(left, modulus)
+    other = ModArray(right, modulus)
+    pairs = list(zip(left, right))
+
+    assert (vector + other).tolist() == [(x + y) % modulus for x, y in pairs]
+    assert (vector - other).tolist() == [(x - y) % modulus for x, y in pairs]
+    assert (vector * other).tolist() == [x * y % modulus for x, y in pairs]
+    assert (-vector).tolist() == [-x % modulus for x in left]
+    assert (vector**11).tolist() == [pow(x, 11, modulus) for x in left]
+
+
+def test_small_values():
+    vector = ModArray([3, 5, 16], 17)
+    assert (vector * vector).tolist() == [9, 8, 1]
+    assert (vector + ModArray([14, 12, 1], 17)).tolist() == [0, 0, 0]
+    assert (vector**3).tolist() == [10, 6, 16]
+    assert (2**vector).tolist() == [8, 15, 1]
+    assert vector.sum() == Mod(7, 17) and vector.prod() == Mod(2, 17)
+
+    # (2^63 - 1)^2 = 2^126 - 2^64 + 1 ≡ 1 - 0 + 1 (mod 2^63)
+    assert (ModArray([2**63 - 1], 2**63)**2).tolist() == [1]
+
+
+def test_scalars(modulus, operands):
+    left, _ = operands
+    vector = ModArray(left, modulus)
+
+    assert (vector + 5).tolist() == [(x + 5) % modulus for x in left]
+    assert (5 - vector).tolist() == [(5 - x) % modulus for x in left]
+    assert (vector * Mod(3, modulus)).tolist() == \
+        [x * 3 % modulus for x in left]
+    assert (Mod(3, modulus) * vector).tolist() == \
+        [x * 3 % modulus for x in left]
+    assert (3**vector).tolist() == \
+        [pow(3, x % modulus, modulus) for x in left]
+
+
+def test_reductions(modulus, operands):
+    left, _ = operands
+    vector = ModArray(left, modulus)
+
+    product = 1
+    for value in left:
+        product = product * value % modulus
+    assert vector.prod() == Mod(product, modulus)
+    assert vector.sum() == Mod(sum(left), modulus)
+    assert ModArray([], modulus).sum() == Mod(0, modulus)
+    assert ModArray([], 7).prod() == 1
+
+
+def test_floordiv():
+    vector = ModArray([7, 14, 4], 17)
+    # 6^-1 = 3, 7^-1 = 5, 14^-1 = 11 and 4^-1 = 13 modulo 17
+    assert (vector // 6).tolist() == [4, 8, 12]
+    assert (14 // vector).tolist() == [2, 1, 12]
+
+    assert (vector // Mod(6, 17)).tolist() == [4, 8, 12]
+    assert (vector // vector).tolist() == [1, 1, 1]
+    assert (ModArray([3, 6], 2**89 - 1) // 3).tolist() == [1, 2]
+
+    with raises(ZeroDivisionError):
+        vector // 17
+
+    with raises(ZeroDivisionError):
+        vector // ModArray([1, 0, 1], 17)
+
+    with raises(ValueError, match='cannot be inverted'):
+        ModArray([2, 4], 8) // 2
+
+    with raises(ValueError):
+        ModArray([2, 3], 4).inverse
+
+
+def test_batch_inverse(modulus, operands):
+    left, _ = operands
+    residues = [value % modulus for value in left + [0, 1]]
+    inverses, invertible = ModArray(residues, modulus).batch_inverse()
+
+    expected = [gcd(value, modulus) == 1 for value in residues]
+    assert invertible.tolist() == expected
+    for value, inverse, flag in zip(residues, inverses.tolist(), expected):
+        if flag:
+            assert value * inverse % modulus == 1 % modulus
+        else:
+            assert inverse == 0
+
+    inverses, invertible = ModArray([2, 3, 4, 5], 6).batch_inverse()
+    assert inverses.tolist() == [0, 0, 0, 5]
+    assert invertible.tolist() == [False, False, False, True]
+
+
+def test_float():
+    vector = ModArray([2, 3], 5)
+    modified = vector + 2.5
+    assert modified.dtype == float
+    assert modified.tolist() == [4.5, 5.5]
+
+
+def test_objects_interaction():
+    with raises(ValueError):
+        ModArray([1, 2], 17) + ModArray([1, 2], 19)
+
+    with raises(ValueError):
+        ModArray([1, 2], 17) + Mod(1, 19)
+
+    with raises(ValueError):
+        ModArray([1, 2], 17) + ModArray([1, 2, 3], 17)
+
+    with raises(ValueError):
+        ModArray([2, 3], 7) ** Mod(2, 5)
+
+    assert (ModArray([2, 3], 7) ** Mod(9, 7)).tolist() == [4, 2]
+
+    assert (ModArray([1, 2], 17) == Mod(2, 17)).tolist() == [False, True]
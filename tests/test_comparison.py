@@ -1,4 +1,7 @@
-from pytest import fixture
+from decimal import Decimal
+from fractions import Fraction
+
+from pytest import fixture, raises
 
 from mod import Mod
 
@@ -10,17 +13,17 @@ def number():
 
 @fixture
 def same_list():
-    return [7, 7.0, 24, Mod(7, 17), Mod(24, 17), Mod(2, 5)]
+    return [7, 7.0, Mod(7, 17), Mod(24, 17)]
 
 
 @fixture
 def smaller_list():
-    return [3, 3.0, 20, Mod(3, 17), Mod(20, 17), Mod(1, 5)]
+    return [3, 3.0, -10, Mod(3, 17), Mod(20, 17)]
 
 
 @fixture
 def bigger_list():
-    return [8, 8.0, 28, Mod(8, 17), Mod(28, 17), Mod(3, 5)]
+    return [8, 8.0, 20, 24, Mod(8, 17), Mod(28, 17)]
 
 
 def test_eq(number, same_list, smaller_list, bigger_list):
@@ -28,13 +31,13 @@ def test_eq(number, same_list, smaller_list, bigger_list):
         assert number == other
         assert other == number
 
-    for other in smaller_list + bigger_list:
+    for other in smaller_list + bigger_list + [Mod(2, 5)]:
         assert not number == other
         assert not other == number
 
 
 def test_ne(number, same_list, smaller_list, bigger_list):
-    for other in smaller_list + bigger_list:
+    for other in smaller_list + bigger_list + [Mod(2, 5)]:
         assert number != other
         assert other != number
 
@@ -43,6 +46,24 @@ def test_ne(number, same_list, smaller_list, bigger_list):
         assert not other != number
 
 
+def test_other_modulus():
+    # Different moduli are never equal and cannot be ordered
+    assert Mod(7, 17) != Mod(2, 5) and Mod(3, 7) != Mod(3, 11)
+    assert Mod(3, 7) != Mod(3, -7)
+    for compare in [lambda a, b: a < b, lambda a, b: a <= b,
+                    lambda a, b: a > b, lambda a, b: a >= b]:
+        with raises(ValueError, match='Not same modulus'):
+            compare(Mod(7, 17), Mod(2, 5))
+
+
+def test_other_types():
+    number = Mod(7, 17)
+    for other in ['7', None, [7]]:
+        assert not number == other and number != other
+        assert not number < other and not number <= other
+        assert not number > other and not number >= other
+
+
 def test_lt(number, same_list, smaller_list, bigger_list):
     for other in bigger_list:
         assert number < other
@@ -97,3 +118,35 @@ def test_ge(number, same_list, smaller_list, bigger_list):
 
     for other in smaller_list:
         assert not other >= number
+
+
+def test_hash():
+    numbers = [Mod(value, modulus)
+               for modulus in [7, 11, 13, -7] for value in range(7)]
+    assert len(set(numbers)) == len(numbers)
+    for number in numbers:
+        same = Mod(int(number) + 3 * number.modulus, number.modulus)
+        assert number == same and hash(number) == hash(same)
+        assert hash(number) == hash(int(number))
+    assert hash(Mod(2**127 - 2, 2**127 - 1)) == \
+        hash(Mod(-1, 2**127 - 1))
+    assert {Mod(3, 7): 1, Mod(3, 11): 2}[Mod(10, 7)] == 1
+    assert Mod(5, 7) in {5} and 5 in {Mod(5, 7)}
+
+
+def test_hash_consistency():
+    # Equal objects have equal hashes, whatever their types
+    values = [0, 1, 3, 5, 10, 12, -2, -4]
+    numbers = [Mod(value, modulus)
+               for modulus in [1, 7, 11, -7] for value in values]
+    others = values + [float(value) for value in values] + \
+        [Fraction(value) for value in values] + [Decimal(5), 5.5, True]
+    for number in numbers:
+        for other in numbers + others:
+            if number == other:
+                assert hash(number) == hash(other)
+            assert (number == other) == (other == number)
+
+    assert Mod(5, 7) != 12 and 12 not in [Mod(5, 7)]
+    assert Mod(5, 7) not in {12} and Mod(5, 7) not in {12: 'x'}
+    assert {5: 'x'}[Mod(5, 7)] == 'x'
@@ -0,0 +1,93 @@
+import random
+from math import gcd
+
+from pytest import raises
+
+from mod import CRTBasis, Mod
+
+
+def lcm(left, right):
+    return left * right // gcd(left, right)
+
+
+def test_crt():
+    number = Mod.crt(Mod(2, 3), Mod(3, 5), Mod(2, 7))
+    assert int(number) == 23
+    assert number.modulus == 105
+
+    assert Mod.crt(Mod(4, 9)) == Mod(4, 9)
+
+    with raises(ValueError):
+        Mod.crt()
+
+    with raises(ValueError):
+        Mod.crt(Mod(2, 3), 5)
+
+
+def test_crt_not_coprime():
+    generator = random.Random(0)
+    for _ in range(500):
+        moduli = [generator.randint(1, 60) for _ in range(3)]
+        value = generator.randrange(10**6)
+        number = Mod.crt(*[Mod(value, modulus) for modulus in moduli])
+
+        expected = 1
+        for modulus in moduli:
+            expected = lcm(expected, modulus)
+        assert number.modulus == expected
+        assert int(number) == value % expected
+
+    with raises(ValueError):
+        Mod.crt(Mod(1, 4), Mod(2, 6))
+
+
+def test_split():
+    assert Mod(23, 105).split() == (Mod(2, 3), Mod(3, 5), Mod(2, 7))
+    assert [number.modulus for number in Mod(23, 360).split()] == [8, 9, 5]
+    assert Mod(7, 12).split([4, 6]) == (Mod(3, 4), Mod(1, 6))
+    assert Mod.crt(*Mod(1234, 2**4 * 3**5 * 7).split()) == Mod(1234, 27216)
+
+    with raises(ValueError):
+        Mod(7, 12).split([5])
+
+
+def test_basis():
+    moduli = [2**61 - 1, 2**31 - 1, 1000003, 65537]
+    basis = CRTBasis(moduli)
+    assert basis.moduli == tuple(moduli)
+    assert basis.modulus == (2**61 - 1) * (2**31 - 1) * 1000003 * 65537
+
+    generator = random.Random(1)
+    values = [generator.randrange(basis.modulus) for _ in range(50)]
+    for value in values:
+        residues = basis.split(value)
+        assert [number.modulus for number in residues] == moduli
+        assert int(basis.combine(residues)) == value
+        assert basis.combine(residues) == Mod.crt(*residues)
+
+    rows = [[value % modulus for modulus in moduli] for value in values]
+    assert [int(number) for number in basis.combine_many(rows)] == values
+
+    with raises(ValueError):
+        basis.combine([1, 2])
+
+
+def test_basis_other_modulus():
+    basis = CRTBasis([3, 5, 7])
+    assert basis.combine([Mod(2, 3), 3, Mod(2, 7)]) == Mod(23, 105)
+    assert basis.split(Mod(23, 105)) == basis.split(23)
+
+    with raises(ValueError, match='Not same modulus'):
+        basis.combine([Mod(2, 5), 3, 2])
+
+    with raises(ValueError, match='Not same modulus'):
+        basis.combine_many([[2, 3, 2], [2, 3, Mod(2, 5)]])
+
+    with raises(ValueError, match='Not same modulus'):
+        basis.split(Mod(23, 106))
+
+
+def test_basis_errors():
+    for moduli in [[], [6, 4], [3, 0], [5, -7]]:
+        with raises(ValueError):
+            CRTBasis(moduli)
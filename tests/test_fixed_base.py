@@ -0,0 +1,79 @@
+import random
+
+from pytest import fixture, mark, raises
+
+from mod import FixedBase, Mod
+
+
+@fixture(params=[101, 61423, 2**127 - 1, 2**521 - 1])
+def base(request):
+    modulus = request.param
+    return Mod(random.Random(modulus).randrange(2, modulus), modulus)
+
+
+def int_pow(base, exponent):
+    return Mod(pow(int(base), exponent, base.modulus), base.modulus)
+
+
+def test_small_base():
+    # RSA keys of the README: 3 × 40619 ≡ 1 (mod φ(61423))
+    table = FixedBase(Mod(3, 61423), 16)
+    assert table.pow(40619) == Mod(15824, 61423)
+    assert FixedBase(Mod(15824, 61423), 16).pow(3) == 3
+    assert FixedBase(Mod(2, 101), 8, width=3).pow(100) == 1
+
+
+@mark.parametrize('width', [1, 3, 4, 6])
+def test_pow(base, width):
+    generator = random.Random(width)
+    table = FixedBase(base, 300, width=width)
+    assert table.base == base
+    exponents = [0, 1, 2, 15, 16, 17, 2**299, generator.getrandbits(300)]
+    for exponent in exponents:
+        assert table.pow(exponent) == int_pow(base, exponent)
+        assert table.pow(exponent).modulus == base.modulus
+    assert table.pow_many(exponents) == \
+        [int_pow(base, value) for value in exponents]
+
+
+def test_pow_fallback(base):
+    table = FixedBase(base, 8)
+    assert table.pow(2**100 + 3) == int_pow(base, 2**100 + 3)
+    assert table.pow(Mod(77, base.modulus)) == int_pow(base, 77)
+
+    inverted = FixedBase(Mod(3, 7), 8).pow(-2)
+    assert inverted == Mod(3, 7)**-2 == 4
+
+
+def test_new_table():
+    with raises(ValueError):
+        FixedBase(3, 8)
+
+    with raises(ValueError):
+        FixedBase(Mod(3, 7), 0)
+
+
+def test_multi_pow(base):
+    generator = random.Random(base.modulus)
+    other = Mod(generator.randrange(2, base.modulus), base.modulus)
+    third = Mod(generator.randrange(2, base.modulus), base.modulus)
+    first, second = generator.getrandbits(200), generator.getrandbits(90)
+
+    expected = int_pow(base, first) * int_pow(other, second) * third
+    assert Mod.multi_pow((base, first), (other, second), (third, 1)) == \
+        expected
+    assert Mod.multi_pow((base, 0)) == 1
+    assert Mod.multi_pow((Mod(3, 7), -1), (Mod(2, 7), 2)) == \
+        Mod(3, 7).inverse * 4
+
+    with raises(ValueError):
+        Mod.multi_pow()
+
+    with raises(ValueError):
+        Mod.multi_pow((Mod(3, 7), 1), (Mod(3, 11), 1))
+
+    with raises(ValueError):
+        Mod.multi_pow((2, 10), (Mod(3, 101), 20))
+
+    with raises(ValueError):
+        Mod.multi_pow((Mod(3, 101), 20), (2, 10))
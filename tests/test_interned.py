@@ -0,0 +1,55 @@
+import pickle
+
+from pytest import raises
+
+import mod
+from mod import Mod
+
+
+def test_interned():
+    number = Mod.interned(10, 7)
+    assert number == Mod(3, 7)
+    assert number is Mod.interned(3, 7)
+    assert number is Mod.interned(-4, 7)
+    assert number is Mod.interned(3.0, 7.0)
+    assert Mod.interned(2**12 + 5, 2**20) is not \
+        Mod.interned(2**12 + 5, 2**20)
+    assert Mod.interned(5, 2**127 - 1) is Mod.interned(5, 2**127 - 1)
+    assert Mod.interned(-5, -7) is Mod.interned(2, -7)
+    assert Mod.interned(-5, -7) == Mod(-5, -7)
+
+    with raises(ValueError):
+        Mod.interned(3, 0)
+
+    with raises(ValueError):
+        Mod.interned('3', 7)
+
+
+def test_shared_instances_are_unchanged():
+    number = Mod.interned(3, 7)
+    total = number
+    total += 5
+    total *= 2
+    assert total == Mod(2, 7)
+    assert -number == 4 and number**2 == 2 and number // 3 == 1
+    assert Mod.interned(3, 7) == Mod(3, 7)
+
+    copy = number.copy()
+    assert copy == number and copy is not number
+    assert number.copy(5) == Mod(3, 5)
+    assert pickle.loads(pickle.dumps(number)) == number
+    assert {number: 1}[Mod(3, 7)] == 1
+
+
+def test_pool_eviction():
+    mod._INTERNED.clear()
+    first = Mod.interned(1, 3)
+    for modulus in range(4, 4 + mod._INTERN_MODULI):
+        Mod.interned(1, modulus)
+    assert 3 not in mod._INTERNED
+    assert len(mod._INTERNED) == mod._INTERN_MODULI
+    assert Mod.interned(1, 3) == first
+
+    Mod.interned(1, 2**20)
+    assert len(mod._INTERNED[2**20]) == mod._INTERN_SIZE
+    assert len(mod._INTERNED[3]) == 3
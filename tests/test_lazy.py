@@ -0,0 +1,159 @@
+import random
+
+from pytest import raises
+
+from mod import Mod, lazy
+
+
+def formula(a, b, c, d, e, f):
+    return (a * b + c * d - e) ** 3 // f
+
+
+def polynomial(x, y):
+    total = 0
+    for power in range(20):
+        total = total * x + y * power
+    return total, -total + 3 ** x
+
+
+def int_polynomial(x, y, power_of_three, modulus):
+    total = sum(y * power * x**(19 - power) for power in range(20))
+    return total % modulus, (power_of_three - total) % modulus
+
+
+def test_small_formula():
+    # (2 × 3 + 4 × 5 - 6)^3 = 8000 ≡ 21 and 7^-1 ≡ 29 (mod 101),
+    # 21 × 29 = 609 ≡ 3
+    compiled = lazy(formula)
+    assert compiled(Mod(2, 101), 3, 4, 5, 6, 7) == Mod(3, 101)
+    assert compiled(2, 3, 4, 5, 6, Mod(7, 101)) == Mod(3, 101)
+    assert compiled(2, Mod(3, 101), 4, 5, 6, 7) == Mod(3, 101)
+
+
+def test_formula(modulus):
+    compiled = lazy(formula)
+    generator = random.Random(modulus)
+    for _ in range(20):
+        values = [generator.randrange(-2**600, 2**600) for _ in range(6)]
+        for shape in range(0, 64, 7):
+            args = [Mod(value, modulus) if shape >> position & 1 else value
+                    for position, value in enumerate(values)]
+            if not any(isinstance(arg, Mod) for arg in args):
+                continue
+            args[5] = Mod(values[5] | 1, modulus)
+            try:
+                expected = formula(*args)
+            except (ValueError, ZeroDivisionError) as error:
+                with raises(type(error)):
+                    compiled(*args)
+                continue
+            result = compiled(*args)
+            assert result == expected
+            assert result.modulus == modulus
+
+
+def test_multiple_outputs(modulus):
+    compiled = lazy(polynomial)
+    for x, y in [(3, 5), (2**70, -1), (0, 0)]:
+        residue = x % modulus
+        expected = int_polynomial(x, y, pow(3, residue, modulus), modulus)
+        assert compiled(Mod(x, modulus), y) == \
+            tuple(Mod(value, modulus) for value in expected)
+
+        small = x % 1000
+        expected = int_polynomial(small, y, 3**small, modulus)
+        assert compiled(small, Mod(y, modulus)) == \
+            tuple(Mod(value, modulus) for value in expected)
+
+
+def test_exponents():
+    compiled = lazy(lambda base, exponent: base ** exponent * 2)
+    assert compiled(Mod(3, 7), 10**20) == Mod(3, 7) ** 10**20 * 2
+    assert compiled(Mod(3, 7), -5) == Mod(3, 7) ** -5 * 2
+    assert compiled(Mod(3, 7), Mod(12, 7)) == Mod(3, 7) ** 5 * 2
+    assert compiled(3, Mod(12, 7)) == 3 ** Mod(12, 7) * 2
+
+    with raises(ValueError):
+        compiled(Mod(2, 8), -1)
+
+
+def test_division():
+    compiled = lazy(lambda a, b: a // b)
+    assert compiled(Mod(3, 7), 5) == Mod(3, 7) // 5
+    assert compiled(3, Mod(5, 7)) == 3 // Mod(5, 7)
+
+    with raises(ZeroDivisionError):
+        compiled(Mod(3, 7), 14)
+
+    with raises(ValueError):
+        compiled(3, Mod(0, 7))
+
+    with raises(ValueError):
+        compiled(Mod(3, 8), 2)
+
+
+def test_int_operations():
+    compiled = lazy(lambda a, b, c: (a // b + c, a * b))
+    assert compiled(7, 2, Mod(0, 5)) == (Mod(3, 5), 14)
+    assert compiled(7, Mod(2, 5), 0) == (Mod(1, 5), Mod(4, 5))
+
+    power = lazy(lambda a, b, c: a ** b + c)
+    assert power(2, 3, Mod(1, 7)) == Mod(2, 7)
+    assert power(2, -1, Mod(1, 7)) == 1.5
+    assert power(2, 3, Mod(1, 7)) == Mod(2, 7)
+
+
+def test_constants():
+    key = Mod(5, 7)
+    compiled = lazy(lambda a: a * key + 1)
+    assert compiled(Mod(3, 7)) == Mod(3, 7) * key + 1
+
+    with raises(ValueError):
+        compiled(Mod(3, 11))
+
+    with raises(ValueError):
+        lazy(formula)(Mod(1, 7), 1, Mod(1, 11), 1, 1, 1)
+
+
+def test_fallback():
+    calls = []
+
+    def branching(a, b):
+        calls.append(a)
+        if a > b:
+            return a - b
+        return b - a
+
+    compiled = lazy(branching)
+    assert compiled(Mod(5, 7), 2) == 3
+    assert compiled(Mod(1, 7), 2) == 1
+    assert compiled.__name__ == 'branching'
+
+    divide = lazy(lambda a, b: a / b)
+    assert divide(Mod(3, 7), 2) == 1.5
+
+    add = lazy(lambda a, b: a + b)
+    assert add(Mod(3, 7), 2.5) == 5.5
+    assert add(3, 4) == 7
+    assert add(Mod(3, 7), 6) == Mod(2, 7)
+
+
+def test_fallback_on_any_tracing_error():
+    calls = []
+
+    def inverse(a, b):
+        if isinstance(a, Mod):
+            calls.append(a)
+        return a.inverse * b
+
+    compiled = lazy(inverse)
+    assert compiled(Mod(3, 7), 2) == inverse(Mod(3, 7), 2) == Mod(3, 7)
+    assert compiled(Mod(2, 7), 1) == Mod(4, 7)
+    assert calls == [Mod(3, 7), Mod(3, 7), Mod(2, 7)]
+
+    def rebuild(k, a):
+        return Mod(k, 7) + a
+
+    compiled = lazy(rebuild)
+    assert compiled(3, Mod(5, 7)) == Mod(1, 7)
+    assert compiled(4, Mod(5, 7)) == Mod(2, 7)
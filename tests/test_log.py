@@ -0,0 +1,95 @@
+import random
+
+from pytest import raises
+
+import mod
+from mod import Mod
+
+
+def test_prime_moduli():
+    generator = random.Random(19)
+    for modulus in [3, 101, 1000003, 2**31 - 1, 2**61 - 1]:
+        for base in [2, 5, generator.randrange(2, modulus)]:
+            if base % modulus == 0:
+                continue
+            for exponent in [0, 1, generator.randrange(modulus)]:
+                power = Mod(base, modulus)**exponent
+                result = power.log(base)
+                assert Mod(base, modulus)**result == power
+                assert 0 <= result <= exponent
+
+
+def test_composite_moduli():
+    generator = random.Random(20)
+    for modulus in [1, 2, 8, 1000, 2**20, 3**10 * 7, 2**31 * 31, -91]:
+        for _ in range(10):
+            base = Mod(generator.randrange(1, 2**40), modulus)
+            if base.ring.modulus != 1 and \
+                    mod.gcd(int(base), abs(modulus)) != 1:
+                continue
+            exponent = generator.randrange(1000)
+            power = base**exponent
+            result = power.log(base)
+            assert base**result == power
+            assert result <= exponent
+
+
+def test_smallest_logarithm():
+    assert Mod(1, 7).log(2) == 0
+    assert Mod(4, 7).log(Mod(2, 7)) == 2
+    assert Mod(2, 7).log(2) == 1
+    assert Mod(0, 1).log(0) == 0
+
+
+def test_invalid_logarithms():
+    with raises(ValueError):
+        Mod(3, 7).log(2)
+
+    with raises(ValueError):
+        Mod(4, 8).log(2)
+
+    with raises(ValueError):
+        Mod(0, 7).log(3)
+
+    with raises(ValueError):
+        Mod(3, 7).log(Mod(3, 11))
+
+    with raises(ValueError):
+        Mod(3, 7).log(2.5)
+
+
+def test_pollard_rho(monkeypatch):
+    monkeypatch.setattr(mod, '_BABY_STEP_SIZE', 4)
+    modulus = 2**61 - 1
+    generator = random.Random(21)
+    for _ in range(5):
+        exponent = generator.randrange(modulus)
+        assert (Mod(37, modulus)**exponent).log(37) == \
+            exponent % Mod(37, modulus).ring.carmichael
+
+    # Squares modulo the safe prime 2000303 = 2 × 1000151 + 1
+    prime, order = 2000303, 1000151
+    element = pow(5, 2, prime)
+    for exponent in [1, 2, 999999, 123456]:
+        target = pow(element, exponent, prime)
+        assert mod._rho_log(element, target, order, prime) == exponent
+
+
+def test_baby_step_cache(monkeypatch):
+    monkeypatch.setattr(mod, '_BABY_STEP_CACHE_SIZE', 1000)
+    monkeypatch.setattr(mod, '_BABY_STEPS', mod.OrderedDict())
+    monkeypatch.setattr(mod, '_BABY_STEP_ENTRIES', 0)
+
+    # 1000002 = 2 × 3 × 166667, one table of 409 entries per base
+    modulus = 1000003
+    for exponent in range(1, 50):
+        assert (Mod(2, modulus)**exponent).log(2) == exponent
+    assert len(mod._BABY_STEPS) == 1
+    table, _, size = next(iter(mod._BABY_STEPS.values()))
+    assert size == 409 and len(table) == size
+
+    for base in [2, 3, 5, 2]:
+        assert (Mod(base, modulus)**12345).log(base) == 12345
+    assert len(mod._BABY_STEPS) == 2
+    assert mod._BABY_STEP_ENTRIES == 818
+    assert list(mod._BABY_STEPS)[-1][0] == pow(2, 6, modulus)
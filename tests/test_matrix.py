@@ -0,0 +1,152 @@
+import random
+from itertools import permutations
+
+from pytest import raises
+
+import mod
+from mod import Mod, ModMatrix
+
+
+def brute_determinant(rows, modulus):
+    total = 0
+    for permutation in permutations(range(len(rows))):
+        inversions = sum(
+            1 for index, value in enumerate(permutation)
+            for other in permutation[index + 1:] if value > other
+        )
+        product = 1
+        for row, column in zip(rows, permutation):
+            product *= row[column]
+        total += (-1)**inversions * product
+    return total % modulus
+
+
+def random_rows(generator, rows, columns, modulus):
+    return [[generator.randrange(modulus) for _ in range(columns)]
+            for _ in range(rows)]
+
+
+def test_new_matrix():
+    matrix = ModMatrix([[8, Mod(2, 7)], [-1, 0]], 7)
+    assert matrix.rows == ((1, 2), (6, 0))
+    assert matrix.shape == (2, 2)
+    assert matrix[1, 0] == Mod(6, 7)
+    assert ModMatrix.identity(2, 7) == ModMatrix([[1, 0], [0, 1]], 7)
+
+    with raises(ValueError):
+        ModMatrix([[1, 2], [3]], 7)
+
+    with raises(ValueError):
+        ModMatrix([[1]], 0)
+
+
+def test_elementwise():
+    matrix = ModMatrix([[1, 2], [3, 4]], 5)
+    assert matrix + 1 == ModMatrix([[2, 3], [4, 0]], 5)
+    assert 1 - matrix == ModMatrix([[0, 4], [3, 2]], 5)
+    assert matrix * Mod(2, 5) == ModMatrix([[2, 4], [1, 3]], 5)
+    assert matrix - matrix == ModMatrix([[0, 0], [0, 0]], 5)
+    assert -matrix == ModMatrix([[4, 3], [2, 1]], 5)
+
+    with raises(ValueError):
+        matrix + ModMatrix([[1, 2], [3, 4]], 7)
+
+
+def test_matmul():
+    generator = random.Random(3)
+    for modulus in [7, 2**31 - 1, 2**61 - 1]:
+        left = random_rows(generator, 3, 40, modulus)
+        right = random_rows(generator, 40, 4, modulus)
+        expected = [
+            [sum(row[k] * right[k][column] for k in range(40)) % modulus
+             for column in range(4)]
+            for row in left
+        ]
+        product = ModMatrix(left, modulus) @ ModMatrix(right, modulus)
+        assert product == ModMatrix(expected, modulus)
+
+        with raises(ValueError):
+            ModMatrix(left, modulus) @ ModMatrix(left, modulus)
+
+
+def test_matmul_pure_python(monkeypatch):
+    monkeypatch.setattr(mod, 'numpy', None)
+    matrix = ModMatrix([[1, 2], [3, 4]], 7)
+    assert matrix @ matrix == ModMatrix([[0, 3], [1, 1]], 7)
+    assert matrix.inverse @ matrix == ModMatrix.identity(2, 7)
+
+
+def test_pow():
+    fibonacci = ModMatrix([[1, 1], [1, 0]], 10**9 + 7)
+    previous, current = 0, 1
+    for _ in range(1000):
+        previous, current = current, (previous + current) % (10**9 + 7)
+    assert fibonacci**1000 == ModMatrix(
+        [[current, previous], [previous, (current - previous) % (10**9 + 7)]],
+        10**9 + 7,
+    )
+    assert fibonacci**0 == ModMatrix.identity(2, 10**9 + 7)
+    assert fibonacci**-3 @ fibonacci**3 == fibonacci**0
+
+
+def test_determinant():
+    generator = random.Random(3)
+    for modulus in [7, 12, 2**61 - 1]:
+        for size in range(5):
+            rows = random_rows(generator, size, size, modulus)
+            determinant = ModMatrix(rows, modulus).determinant()
+            assert int(determinant) == brute_determinant(rows, modulus)
+
+    singular = ModMatrix([[1, 2], [2, 4]], 7)
+    assert singular.determinant() == 0
+
+
+def test_inverse_solve():
+    # det = -2 ≡ 5 and 5^-1 ≡ 3 (mod 7): inverse = 3 × [[4, -2], [-3, 1]]
+    matrix = ModMatrix([[1, 2], [3, 4]], 7)
+    assert matrix.inverse == ModMatrix([[5, 1], [5, 3]], 7)
+    assert matrix.solve([1, 0]) == [Mod(5, 7), Mod(5, 7)]
+
+    generator = random.Random(5)
+    for modulus in [7, 2**31 - 1, 2**61 - 1]:
+        matrix = ModMatrix(random_rows(generator, 6, 6, modulus), modulus)
+        while brute_determinant(matrix.rows, modulus) == 0:
+            matrix = ModMatrix(random_rows(generator, 6, 6, modulus),
+                               modulus)
+        assert matrix @ matrix.inverse == ModMatrix.identity(6, modulus)
+
+        vector = [generator.randrange(modulus) for _ in range(6)]
+        solution = [int(value) for value in matrix.solve(vector)]
+        assert [
+            sum(row[k] * solution[k] for k in range(6)) % modulus
+            for row in matrix.rows
+        ] == vector
+
+    with raises(ValueError):
+        ModMatrix([[1, 2], [2, 4]], 7).inverse
+
+    with raises(ValueError):
+        ModMatrix([[1, 2], [2, 4]], 7).solve([1, 1])
+
+
+def test_inverse_without_unit_pivot():
+    matrix = ModMatrix([[2, 3], [3, 2]], 6)
+    assert matrix.determinant() == 1
+    assert matrix @ matrix.inverse == ModMatrix.identity(2, 6)
+
+    matrix = ModMatrix([[2, 3, 4], [3, 2, 1], [4, 1, 5]], 6)
+    assert matrix @ matrix.inverse == ModMatrix.identity(3, 6)
+
+    with raises(ValueError, match='no unit pivot'):
+        ModMatrix([[2, 0], [0, 3]], 6).inverse
+
+
+def test_rank_kernel():
+    matrix = ModMatrix([[1, 2, 3], [2, 4, 6], [1, 0, 1]], 7)
+    assert matrix.rank() == 2
+    kernel = matrix.kernel()
+    assert len(kernel) == 1
+    vector = ModMatrix([[int(value)] for value in kernel[0]], 7)
+    assert matrix @ vector == ModMatrix([[0], [0], [0]], 7)
+    assert ModMatrix.identity(3, 7).kernel() == []
+    assert ModMatrix([[1, 2, 3], [2, 4, 6]], 7).solve([1, 2])[0] == 1
@@ -1,5 +1,10 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
 from pytest import raises
 
+import mod
 from mod import Mod
 
 
@@ -34,6 +39,35 @@ def test_modulus():
         number.modulus = 21
 
 
+def test_backend(backend):
+    number = Mod(7, 17)
+    assert type(int(number)) is int
+    assert type(number.modulus) is int
+    assert type(int(number**5 + 3)) is int
+    assert type(int(number.inverse)) is int
+
+
+def test_auto_backend():
+    if mod.gmpy2 is None:
+        pytest.skip('gmpy2 is not installed')
+
+    mod.set_backend('auto', threshold=64)
+    assert type(Mod(7, 2**61 - 1)._modulus) is int
+    assert type(Mod(7, 2**127 - 1)._modulus) is mod.gmpy2.mpz
+    assert type(int(Mod(7, 2**127 - 1))) is int
+
+    with raises(ValueError):
+        mod.set_backend('float')
+
+
+def test_slots():
+    number = Mod(7, 17)
+    assert not hasattr(number, '__dict__')
+
+    with raises(AttributeError):
+        number.other = 21
+
+
 def test_copy():
     number = Mod(7, 17)
     assert int(number) == 7
@@ -45,7 +79,7 @@ def test_copy():
     assert other.modulus == 17
 
     other = number.copy(modulus=5)
-    assert number == other
+    assert number != other
     assert int(other) == 2
     assert other.modulus == 5
 
@@ -64,6 +98,43 @@ def test_inverse():
     assert product.modulus == 17
 
 
+def test_inverse_fallback(monkeypatch):
+    monkeypatch.setattr(mod, '_NATIVE_INVERSE', False)
+    for modulus in [17, 2**61 - 1, -17]:
+        for value in [1, 2, 7, modulus - 1]:
+            number = Mod(value, modulus)
+            assert number * number.inverse == Mod(1, modulus)
+
+    with raises(ValueError):
+        Mod(6, 9).inverse
+
+
+def test_inverse_errors():
+    for number in [Mod(0, 17), Mod(6, 9), Mod(3, -9)]:
+        with raises(ValueError):
+            number.inverse
+
+    number = Mod(3, -7)
+    assert int(number * number.inverse) == int(Mod(1, -7))
+
+
+def test_batch_inverse():
+    numbers = [Mod(7, 17), 3, Mod(0, 17), 34, Mod(16, 17)]
+    inverses = Mod.batch_inverse(numbers, 17)
+    assert inverses == [Mod(7, 17).inverse, Mod(3, 17).inverse, None, None,
+                        Mod(16, 17)]
+    assert inverses[0].modulus == 17
+
+    assert Mod.batch_inverse([Mod(2, 9), 3, 4]) == [5, None, 7]
+    assert Mod.batch_inverse([]) == []
+
+    with raises(ValueError):
+        Mod.batch_inverse([1, 2])
+
+    with raises(ValueError):
+        Mod.batch_inverse([Mod(2, 9), Mod(2, 7)])
+
+
 def test_objects_interaction():
     for other in [Mod(12, 17), 12]:
         number = Mod(7, 17) + other
@@ -80,3 +151,41 @@ def test_objects_interaction():
 
     with raises(ValueError):
         Mod(7, 17) + Mod(12, 19)
+
+
+class Integer(int):
+    pass
+
+
+def test_operand_types():
+    # Exact int, Mod and float operands and the Number fallback agree
+    number = Mod(5, 7)
+    for other in [3, True, Integer(3), Mod(3, 7)]:
+        assert number + other == Mod(5 + int(other), 7)
+        assert other + number == Mod(5 + int(other), 7)
+        assert number - other == Mod(5 - int(other), 7)
+        assert other - number == Mod(int(other) - 5, 7)
+        assert number * other == Mod(5 * int(other), 7)
+        assert number**other == Mod(5**int(other), 7)
+        assert type(number + other) is Mod
+
+    assert number == 5 and number == Integer(5) and 5 == number
+    assert number != 12 and number != Integer(12) and 12 != number
+    assert number == 5.0 and number < 5.5 and not number < 4.5
+    assert number != 5.9 and number < 12 and not number > 12
+    assert number != Mod(12, 14) and Mod(12, 14) != number
+    assert not number == Mod(4, 14) and number < Mod(6, 7)
+    assert number != '5' and not number < '5'
+    assert Mod(1, 7) == True and Mod(0, 7) < True  # noqa: E712
+
+    for other in [2.5, Fraction(1, 2), Decimal('2.5')]:
+        assert number + other == 5 + other
+        assert number * other == 5 * other
+        assert number - other == 5 - other
+
+    assert Mod(Integer(10), Integer(7)) == 3
+    assert type(Mod(Integer(10), 7)._value) is type(Mod(10, 7)._value)
+
+    for operation in ['__add__', '__sub__', '__mul__', '__pow__']:
+        with raises(ValueError):
+            getattr(number, operation)(Mod(1, 11))
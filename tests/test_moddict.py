@@ -0,0 +1,64 @@
+from pytest import raises
+
+from mod import Mod, ModDict
+
+
+def test_mod_keys():
+    table = ModDict()
+    for modulus in [7, 11, -7]:
+        for value in range(20):
+            table[Mod(value, modulus)] = value
+
+    assert len(table) == 7 + 11 + 7
+    assert table[Mod(3, 7)] == 17 and table[Mod(3, 11)] == 14
+    assert Mod(3, 7) in table and Mod(3, 13) not in table
+    assert 3 not in table and 'a' not in table
+    assert sorted(table.moduli) == [-7, 7, 11]
+    assert table.residues(7)[3] == 17
+    assert table.residues(13) == {}
+    assert set(table) == {Mod(value, modulus)
+                          for modulus in [7, 11, -7] for value in range(20)}
+    assert table.modulus is None
+
+    with raises(KeyError):
+        table[Mod(3, 13)]
+
+    with raises(KeyError):
+        table[3]
+
+    with raises(ValueError):
+        table[3] = 1
+
+    with raises(ValueError):
+        table['a'] = 1
+
+
+def test_int_keys():
+    table = ModDict({Mod(3, 7): 'three', 12: 'five'}, modulus=7)
+    assert table.modulus == 7
+    assert table[10] == 'three' and table[Mod(5, 7)] == 'five'
+    assert table == {Mod(3, 7): 'three', Mod(5, 7): 'five'}
+    table[Mod(3, 11)] = 'other'
+    assert len(table) == 3 and table[3] == 'three'
+
+    with raises(ValueError):
+        ModDict(modulus=0)
+
+
+def test_delete():
+    table = ModDict(modulus=5)
+    table.update([(1, 'a'), (2, 'b'), (Mod(1, 3), 'c')])
+    del table[6]
+    assert len(table) == 2 and 1 not in table
+    assert table.pop(Mod(1, 3)) == 'c'
+    assert table.moduli == [5]
+    assert repr(table) == "ModDict({(2 % 5): 'b'})"
+
+    with raises(KeyError):
+        del table[1]
+
+    with raises(KeyError):
+        del table[Mod(1, 3)]
+
+    table.clear()
+    assert len(table) == 0 and not table.moduli
@@ -212,6 +212,18 @@ def test_floordiv_is_reversed_multiplication():
         (number * 7) // 7
 
 
+def test_floordiv_not_invertible():
+    number = Mod(6, 9)
+    assert number // 2 == 3
+    assert number // 2 * 2 == number
+
+    with pytest.raises(ValueError):
+        number // 3
+
+    with pytest.raises(ValueError):
+        2 // number
+
+
 def test_ifloordiv():
     number = Mod(7, 17)
     assert number == 7
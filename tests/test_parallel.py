@@ -0,0 +1,63 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+
+import pytest
+from pytest import raises
+
+from mod import Mod, inverse_many, pow_many
+
+
+@pytest.fixture
+def numbers(modulus):
+    generator = random.Random(modulus)
+    return [generator.randrange(-2**2100, 2**2100) for _ in range(50)]
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_pow_many(modulus, numbers, workers):
+    expected = [Mod(pow(number, 65537, modulus), modulus)
+                for number in numbers]
+    results = pow_many(numbers, 65537, modulus, workers=workers)
+    assert results == expected
+    assert [result.modulus for result in results] == [modulus] * 50
+    assert pow_many([], 3, modulus) == []
+
+
+def test_pow_many_mods():
+    numbers = [Mod(value, 101) for value in range(1, 101)]
+    with ProcessPoolExecutor(2) as executor:
+        results = pow_many(numbers, -3, executor=executor)
+    assert results == [number**-3 for number in numbers]
+
+    with raises(ValueError):
+        pow_many([2, 3, 4], -1, 9, workers=1)
+
+    with raises(ValueError):
+        pow_many([Mod(2, 7), Mod(2, 11)], 2)
+
+    with raises(ValueError):
+        pow_many([2, 3], 2)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_inverse_many(modulus, numbers, workers):
+    numbers = numbers + [0, 3, -1]
+    results = inverse_many(numbers, modulus, workers=workers)
+    for number, inverse in zip(numbers, results):
+        if gcd(number, modulus) == 1:
+            assert number * int(inverse) % modulus == 1 % modulus
+        else:
+            assert inverse is None
+    assert inverse_many([], modulus) == []
+
+
+def test_inverse_many_mods():
+    numbers = [Mod(value, 9) for value in range(20)]
+    with ProcessPoolExecutor(2) as executor:
+        results = inverse_many(numbers, executor=executor)
+    assert results == Mod.batch_inverse(numbers)
+    assert results[3] is None and results[2] == 5
+
+    with raises(ValueError):
+        inverse_many([Mod(2, 7), 3], 11)
@@ -0,0 +1,128 @@
+import random
+
+import pytest
+from pytest import raises
+
+import mod
+from mod import Mod, ModPoly
+
+
+def naive_product(left, right):
+    modulus = left.modulus
+    result = [0] * (len(left) + len(right))
+    for index, value in enumerate(left.coefficients):
+        for offset, other in enumerate(right.coefficients):
+            result[index + offset] += value * other
+    return ModPoly(result, modulus)
+
+
+def random_poly(generator, size, modulus):
+    return ModPoly([generator.randrange(modulus) for _ in range(size)],
+                   modulus)
+
+
+@pytest.fixture(params=[998244353, 2**61 - 1, 10**9 + 7, 2**127 - 1, 12])
+def modulus(request):
+    return request.param
+
+
+def test_new_poly():
+    poly = ModPoly([8, Mod(2, 7), -1, 0, 7], 7)
+    assert poly.coefficients == (1, 2, 6)
+    assert poly.degree == 2
+    assert poly.modulus == 7
+    assert poly[1] == Mod(2, 7)
+    assert poly[5] == Mod(0, 7)
+    assert ModPoly([0, 7], 7).degree == -1
+    assert not ModPoly([], 7)
+
+    for modulus in [0, -7, 7.5]:
+        with raises(ValueError):
+            ModPoly([1], modulus)
+
+
+def test_arithmetic():
+    left = ModPoly([1, 2, 3], 7)
+    right = ModPoly([6, 5], 7)
+    assert left + right == ModPoly([0, 0, 3], 7)
+    assert left - right == ModPoly([2, 4, 3], 7)
+    assert 1 - left == ModPoly([0, 5, 4], 7)
+    assert -left == ModPoly([6, 5, 4], 7)
+    assert left * 3 == ModPoly([3, 6, 2], 7)
+    assert Mod(3, 7) * left == ModPoly([3, 6, 2], 7)
+    assert left * right == ModPoly([6, 3, 0, 1], 7)
+    assert left**3 == left * left * left
+    assert left**0 == 1
+
+    with raises(ValueError):
+        left + ModPoly([1], 5)
+
+
+@pytest.mark.parametrize('sizes', [(5, 3), (40, 40), (300, 290), (900, 20)])
+def test_mul(modulus, sizes):
+    generator = random.Random(modulus)
+    left = random_poly(generator, sizes[0], modulus)
+    right = random_poly(generator, sizes[1], modulus)
+    assert left * right == naive_product(left, right)
+
+
+def test_mul_pure_python(monkeypatch):
+    monkeypatch.setattr(mod, 'numpy', None)
+    monkeypatch.setattr(mod, '_NTT_TABLES', {})
+    generator = random.Random(0)
+    for modulus in [998244353, 2**61 - 1]:
+        left = random_poly(generator, 300, modulus)
+        right = random_poly(generator, 280, modulus)
+        assert left * right == naive_product(left, right)
+
+
+@pytest.mark.parametrize('sizes', [(10, 4), (100, 100), (700, 300)])
+def test_divmod(sizes):
+    generator = random.Random(sizes[0])
+    modulus = 2**61 - 1
+    left = random_poly(generator, sizes[0], modulus)
+    right = random_poly(generator, sizes[1], modulus)
+    quotient, remainder = divmod(left, right)
+    assert quotient * right + remainder == left
+    assert remainder.degree < right.degree
+    assert left // right == quotient
+    assert left % right == remainder
+
+    with raises(ZeroDivisionError):
+        divmod(left, ModPoly([], modulus))
+
+    with raises(ValueError):
+        divmod(ModPoly([1, 2, 3], 12), ModPoly([1, 2], 12))
+
+
+def test_gcd():
+    common = ModPoly([3, 1], 17)
+    left = common * ModPoly([1, 0, 1], 17)
+    right = common * ModPoly([5, 2], 17) * 3
+    assert left.gcd(right) == common
+    assert left.gcd(1) == 1
+
+
+def test_pow_modulo():
+    base = ModPoly([1, 1], 13)
+    modulo = ModPoly([1, 0, 0, 1], 13)
+    expected = base**100 % modulo
+    assert pow(base, 100, modulo) == expected
+    assert expected.degree < 3
+
+
+def test_evaluate(modulus):
+    generator = random.Random(modulus)
+    poly = random_poly(generator, 300, modulus)
+    points = [generator.randrange(modulus) for _ in range(300)]
+    expected = []
+    for point in points:
+        value = 0
+        for coefficient in reversed(poly.coefficients):
+            value = (value * point + coefficient) % modulus
+        expected.append(value)
+
+    assert [int(poly(point)) for point in points] == expected
+    assert poly.evaluate_many(points) == expected
+    assert poly._evaluate_tree(points) == expected
+    assert poly(Mod(points[0], modulus)).modulus == modulus
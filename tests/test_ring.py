@@ -0,0 +1,84 @@
+from math import gcd
+
+from pytest import raises
+
+from mod import Mod, ModRing
+
+
+def brute_phi(modulus):
+    values = range(1, modulus + 1)
+    return sum(1 for value in values if gcd(value, modulus) == 1)
+
+
+def brute_carmichael(modulus):
+    units = [value for value in range(modulus) if gcd(value, modulus) == 1]
+    exponent = 1
+    while any(pow(unit, exponent, modulus) != 1 % modulus for unit in units):
+        exponent += 1
+    return exponent
+
+
+def test_new_ring():
+    ring = ModRing(17)
+    assert ring.modulus == 17
+    assert ring is ModRing(17)
+    assert ring is Mod(3, 17).ring
+    assert ring(20) == Mod(3, 17)
+    assert ring(20).modulus == 17
+
+    with raises(ValueError):
+        ModRing(0)
+
+    with raises(ValueError):
+        ModRing(7.5)
+
+    with raises(ValueError):
+        ModRing('7')
+
+
+def test_primality():
+    primes = [2, 3, 17, 2**61 - 1, 2**127 - 1]
+    composites = [1, 4, 561, 2**61 + 1, (2**31 - 1) * (2**61 - 1)]
+    for modulus in primes:
+        assert ModRing(modulus).is_prime
+        assert ModRing(modulus).is_field
+    for modulus in composites:
+        assert not ModRing(modulus).is_prime
+        assert not ModRing(modulus).is_field
+    assert ModRing(-17).is_prime
+    assert not ModRing(-17).is_field
+
+
+def test_factorization():
+    assert ModRing(1).factorization == {}
+    assert ModRing(360).factorization == {2: 3, 3: 2, 5: 1}
+    assert ModRing(-360).factorization == {2: 3, 3: 2, 5: 1}
+
+    modulus = 101**5 * (2**31 - 1) * (2**61 - 1)**2
+    assert ModRing(modulus).factorization == {
+        101: 5, 2**31 - 1: 1, 2**61 - 1: 2,
+    }
+
+
+def test_phi_carmichael():
+    for modulus in range(1, 200):
+        ring = ModRing(modulus)
+        assert ring.phi == brute_phi(modulus)
+        assert ring.carmichael == brute_carmichael(modulus)
+
+
+def test_barrett():
+    ring = ModRing(1000003)
+    shift, factor = ring.barrett
+    assert factor == (1 << shift) // 1000003
+    for value in [0, 1, 1000002, 1000003, 1000003**2 - 1, 123456789012]:
+        assert ring.reduce(value) == value % 1000003
+
+
+def test_pow_with_known_carmichael():
+    ring = ModRing(1000)
+    assert ring.carmichael == 100
+    exponent = 7**500
+    assert Mod(3, 1000)**exponent == pow(3, exponent, 1000)
+    assert Mod(2, 1000)**exponent == pow(2, exponent, 1000)
+    assert Mod(3, 1000)**-exponent == Mod(pow(3, exponent, 1000), 1000).inverse
@@ -0,0 +1,63 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import fixture, raises
+
+from mod import CRTBasis, Mod, RNS
+
+
+@fixture(params=['word', 'wide'])
+def basis(request):
+    if request.param == 'word':
+        return RNS.basis(1024)
+    return CRTBasis([2**61 - 1, 2**89 - 1, 2**107 - 1, 2**127 - 1])
+
+
+def test_new_number(basis):
+    number = RNS(1234, basis)
+    assert int(number) == 1234
+    assert number.to_mod() == Mod(1234, basis.modulus)
+    assert number.residues == basis.split(1234)
+    assert RNS.from_residues(number.residues, basis) == number
+    assert int(RNS(Mod(-1, basis.modulus), basis)) == basis.modulus - 1
+
+    with raises(ValueError):
+        RNS.from_residues([1, 2], basis)
+
+
+def test_basis():
+    basis = RNS.basis(300, width=20)
+    assert basis.modulus.bit_length() > 300
+    assert all(modulus < 2**20 for modulus in basis.moduli)
+    assert RNS.basis(300, width=20) is basis
+
+
+def test_arithmetic(basis):
+    generator = random.Random(2)
+    bits = basis.modulus.bit_length() // 2 - 8
+    left, right, extra = [generator.getrandbits(bits) for _ in range(3)]
+    x, y, z = [RNS(value, basis) for value in [left, right, extra]]
+
+    assert int(x * y + z) == left * right + extra
+    assert int(x * y - z) == left * right - extra
+    assert int(7 * x - 3) == 7 * left - 3
+    assert int(3 - x) == (3 - left) % basis.modulus
+    assert int(-x) == -left % basis.modulus
+    assert int(x + Mod(5, 17)) == left + 5
+
+
+def test_executor(basis):
+    x, y = RNS(123456789, basis), RNS(987654321, basis)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert int(x.mul(y, executor)) == 123456789 * 987654321
+        assert int(x.add(y, executor)) == 123456789 + 987654321
+        assert int(y.sub(x, executor)) == 987654321 - 123456789
+
+
+def test_objects_interaction():
+    x = RNS(5, [3, 5, 7])
+    with raises(ValueError):
+        x + RNS(5, [3, 5, 11])
+
+    with raises(TypeError):
+        x + 1.5
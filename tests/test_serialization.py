@@ -0,0 +1,191 @@
+import io
+import pickle
+import random
+
+import pytest
+from pytest import raises
+
+import mod
+from mod import Mod, ModArray, ModView
+
+
+@pytest.fixture
+def numbers(modulus):
+    generator = random.Random(modulus)
+    return [Mod(generator.randrange(-2**2100, 2**2100), modulus)
+            for _ in range(100)]
+
+
+def test_bytes(modulus, numbers):
+    width = len(Mod(-1, abs(modulus)).to_bytes())
+    for number in numbers:
+        data = number.to_bytes()
+        assert len(data) == width
+        assert Mod.from_bytes(data, modulus) == number
+        assert Mod.from_bytes(data, modulus).modulus == modulus
+        assert Mod.from_bytes(number.to_bytes(width + 3), modulus) == number
+
+    assert Mod(1000, 65537).to_bytes() == (1000).to_bytes(3, 'little')
+    assert Mod(0, 1).to_bytes() == b'\x00'
+
+
+def test_pack_many(modulus, numbers):
+    data = Mod.pack_many(numbers)
+    assert data == b''.join(number.to_bytes() for number in numbers)
+    assert Mod.unpack_many(data, modulus) == numbers
+    assert Mod.pack_many([int(number) for number in numbers], modulus) == \
+        data
+
+    wide = Mod.pack_many(numbers, width=300)
+    assert len(wide) == 300 * len(numbers)
+    assert Mod.unpack_many(wide, modulus, 300) == numbers
+    assert Mod.pack_many([], modulus) == b''
+    assert Mod.unpack_many(b'', modulus) == []
+
+
+def test_pack_many_errors():
+    with raises(ValueError):
+        Mod.pack_many([Mod(300, 1000)], width=1)
+
+    with raises(ValueError):
+        Mod.pack_many([Mod(1, 7), Mod(1, 11)])
+
+    with raises(ValueError):
+        Mod.unpack_many(b'\x00\x00\x00', 1000)
+
+    with raises(ValueError):
+        Mod.unpack_many(b'\x00', 0)
+
+
+def test_pickle(modulus, numbers, backend):
+    for number in numbers[:5]:
+        loaded = pickle.loads(pickle.dumps(number))
+        assert loaded == number
+        assert loaded.modulus == modulus
+        assert type(loaded._modulus) is type(number._modulus)
+    assert pickle.loads(pickle.dumps(numbers)) == numbers
+
+
+def test_view(modulus, numbers):
+    view = ModView(ModView.dumps(numbers))
+    assert len(view) == len(numbers)
+    assert view.modulus == modulus
+    assert view.width == len(numbers[0].to_bytes())
+    assert list(view) == numbers
+    assert view.tolist() == [int(number) for number in numbers]
+    assert view[-1] == numbers[-1]
+    assert view[10:20] == numbers[10:20]
+    assert view[::7] == numbers[::7]
+    assert view[50:10] == []
+    assert bytes(view.data) == Mod.pack_many(numbers)
+
+    with raises(IndexError):
+        view[len(numbers)]
+
+
+def test_files(tmp_path, modulus, numbers):
+    path = tmp_path / 'residues.mod'
+    ModView.save(str(path), numbers)
+    with ModView.load(str(path)) as view:
+        assert list(view) == numbers
+
+    stream = io.BytesIO()
+    ModView.save(stream, [int(number) for number in numbers], modulus)
+    stream.seek(0)
+    assert list(ModView.load(stream)) == numbers
+
+
+def test_invalid_files(tmp_path):
+    data = ModView.dumps([1, 2, 3], 7)
+    with raises(ValueError):
+        ModView(data[:-1])
+
+    with raises(ValueError):
+        ModView(b'MODX' + data[4:])
+
+    with raises(ValueError):
+        ModView(b'')
+
+    with raises(ValueError):
+        ModView.dumps([1, 2])
+
+    path = tmp_path / 'empty.mod'
+    path.write_bytes(b'')
+    with raises(ValueError):
+        ModView.load(str(path))
+
+
+def test_arrays(tmp_path):
+    numpy = pytest.importorskip('numpy')
+    vector = ModArray(range(1000), 2**61 - 1) * 12345678901
+    path = tmp_path / 'array.mod'
+    ModView.save(str(path), vector, width=8)
+
+    view = ModView.load(str(path))
+    array = view.to_array()
+    assert array.tolist() == vector.tolist()
+    assert array.modulus == vector.modulus
+    assert not array.values.flags.owndata
+    assert ((array + 1) * 2).tolist() == ((vector + 1) * 2).tolist()
+    del array
+
+    view.close()
+    assert ModView(ModView.dumps(vector)).to_array().tolist() == \
+        vector.tolist()
+
+    wide = ModArray(range(10), 2**89 - 1)
+    assert ModView(ModView.dumps(wide)).to_array().tolist() == wide.tolist()
+    assert Mod.pack_many(wide) == Mod.pack_many(list(wide))
+    assert numpy.frombuffer(Mod.pack_many(vector), dtype='<u8').tolist() == \
+        vector.tolist()
+
+
+def test_arrays_outlive_view(tmp_path):
+    pytest.importorskip('numpy')
+    vector = ModArray(range(100), 2**61 - 1)
+    path = tmp_path / 'array.mod'
+    ModView.save(str(path), vector, width=8)
+
+    with ModView.load(str(path)) as view:
+        array = view.to_array()
+    assert array.tolist() == vector.tolist()
+    with raises(ValueError, match='view is closed'):
+        len(view)
+
+    view = ModView.load(str(path))
+    other = view.to_array()
+    view.close()
+    view.close()
+    assert (other * 2).tolist() == (vector * 2).tolist()
+
+
+def test_closed_view(tmp_path):
+    path = tmp_path / 'residues.mod'
+    ModView.save(str(path), [3, 5, 8], 7)
+    for view in [ModView.load(str(path)), ModView(ModView.dumps([3], 7))]:
+        assert not view.closed
+        view.close()
+        assert view.closed
+        assert repr(view) == 'ModView(<closed> % 7)'
+        for use in [len, list, lambda view: view[0], lambda view: view.data,
+                    ModView.tolist]:
+            with raises(ValueError, match='view is closed'):
+                use(view)
+        view.close()
+
+
+def test_read_only_data():
+    data = bytearray(ModView.dumps([1, 2, 3], 7))
+    view = ModView(data)
+    data[-8:] = bytes(8)
+    assert view.data.readonly
+    assert view.tolist() == [1, 2, 3]
+
+
+def test_without_numpy(monkeypatch):
+    monkeypatch.setattr(mod, 'numpy', None)
+    numbers = [Mod(value, 2**61 - 1) for value in range(0, 10**6, 997)]
+    data = Mod.pack_many(numbers)
+    assert Mod.unpack_many(data, 2**61 - 1) == numbers
+    assert ModView(ModView.dumps(numbers)).tolist() == \
+        [int(number) for number in numbers]
@@ -0,0 +1,67 @@
+import random
+
+from pytest import raises
+
+from mod import Mod, ModRing
+
+
+def brute_squares(modulus):
+    return {value * value % modulus for value in range(modulus)}
+
+
+def test_small_moduli():
+    for modulus in range(1, 150):
+        squares = brute_squares(modulus)
+        for value in range(modulus):
+            number = Mod(value, modulus)
+            assert number.is_square() == (value in squares)
+            if value in squares:
+                assert number.sqrt()**2 == number
+            else:
+                with raises(ValueError):
+                    number.sqrt()
+
+
+def test_prime_cases():
+    # p ≡ 3 mod 4, p ≡ 5 mod 8, Tonelli-Shanks and Cipolla
+    primes = [2**127 - 1, 2**255 - 19, 2**64 - 2**32 + 1, 3 * 2**30 + 1,
+              7 * 2**120 + 1, 1000003]
+    generator = random.Random(7)
+    for prime in primes:
+        for _ in range(20):
+            square = Mod(generator.randrange(prime), prime)**2
+            root = square.sqrt()
+            assert root**2 == square
+            assert int(root) <= prime // 2
+            assert square.is_square()
+
+
+def test_non_residue():
+    prime = 2**64 - 2**32 + 1
+    odd, shift, factor = ModRing(prime)._square_root_constants()
+    assert odd * 2**shift == prime - 1 and odd % 2
+    assert not Mod(7, prime).is_square()
+    with raises(ValueError):
+        Mod(7, prime).sqrt()
+
+
+def test_composite_moduli():
+    moduli = [2**10, 3**7, 2**5 * 3**4 * 5**3, (2**61 - 1)**2 * 101,
+              2**64, (2**31 - 1) * 17]
+    generator = random.Random(11)
+    for modulus in moduli:
+        for _ in range(20):
+            value = generator.randrange(modulus)
+            square = Mod(value, modulus)**2
+            assert square.is_square()
+            assert square.sqrt()**2 == square
+            # Squares of multiples of the prime factors
+            square = Mod(value * 2 * 3, modulus)**2
+            assert square.sqrt()**2 == square
+
+
+def test_negative_modulus():
+    root = Mod(2, -7).sqrt()
+    assert root.modulus == -7
+    assert root**2 == Mod(2, -7)
+    assert not Mod(3, -7).is_square()
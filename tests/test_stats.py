@@ -0,0 +1,108 @@
+import pytest
+
+import mod
+from mod import Mod, stats
+
+
+@pytest.fixture
+def counting():
+    stats.reset()
+    stats.enable()
+    yield stats
+    stats.disable()
+    stats.reset()
+
+
+def test_disabled_by_default():
+    assert not stats.enabled
+    add = Mod.__add__
+    stats.enable()
+    assert stats.enabled
+    assert Mod.__add__ is not add
+    stats.disable()
+    assert Mod.__add__ is add
+    assert not stats.enabled
+
+
+def test_counts(counting):
+    number = Mod(3, 7)
+    other = Mod(5, 11)
+    for _ in range(3):
+        number = number * 2 + 1
+    assert (number == 4) is False
+    assert number <= 6
+    assert hash(number) == hash(Mod(3, 7))
+    -other
+    other ** 10
+    other ** Mod(3, 11)
+    other.inverse
+    3 - other
+
+    counts = counting.counts
+    assert counts[('__init__', 7)] == 2
+    assert counts[('__init__', 11)] == 2
+    assert counts[('__mul__', 7)] == 3
+    assert counts[('__add__', 7)] == 3
+    assert counts[('__le__', 7)] == 1
+    assert counts[('__rsub__', 11)] == 1
+    assert counts[('__neg__', 11)] == 1
+    assert counts[('__pow__', 11)] == 2
+    assert counts[('inverse', 11)] == 1
+    assert counts[('_new', 7)] == 6
+    assert counting.exponent_sizes == {11: {4: 1, 2: 1}}
+    assert set(counting.times) == set(counts)
+    assert all(elapsed >= 0 for elapsed in counting.times.values())
+
+    summary = counting.summary(limit=3)
+    assert summary.startswith('operation')
+    assert len(summary.splitlines()) == 4
+
+
+def test_gcd_steps(counting, monkeypatch):
+    assert Mod(3, 7)._extended_gcd() == [1, -2]
+    assert counting.gcd_steps == {7: 2}
+    assert counting.counts[('_extended_gcd', 7)] == 1
+
+    # Native inverses are counted as calls, without steps
+    Mod(3, 2**61 - 1).inverse
+    assert set(counting.gcd_steps) == {7}
+
+    # 2^61 - 1 = 3 × 768614336404564650 + 1, then 3 = 3 × 1: two steps,
+    # and 3^-1 = -768614336404564650
+    monkeypatch.setattr(mod, '_NATIVE_INVERSE', False)
+    assert Mod(3, 2**61 - 1).inverse == 2**61 - 1 - 768614336404564650
+    assert counting.gcd_steps == {7: 2, 2**61 - 1: 2}
+    assert counting.counts[('inverse', 2**61 - 1)] == 2
+
+
+def test_keywords(counting):
+    assert Mod(value=3, modulus=7) == Mod(3, 7)
+    assert Mod(3, 7).copy(modulus=5) == Mod(3, 5)
+    assert counting.counts[('__init__', 7)] == 3
+    assert counting.counts[('copy', 7)] == 1
+
+
+def test_failures(counting):
+    with pytest.raises(ValueError):
+        Mod(3, 0)
+    with pytest.raises(ValueError):
+        Mod(2, 4).inverse
+    assert counting.counts[('__init__', None)] == 1
+    assert counting.counts[('inverse', 4)] == 1
+
+
+def test_callback():
+    samples = []
+    stats.reset()
+    stats.enable(lambda *sample: samples.append(sample), sample=2)
+    try:
+        number = Mod(3, 2**127 - 1)
+        for _ in range(5):
+            number *= number
+    finally:
+        stats.disable()
+        stats.reset()
+
+    assert sorted(sample[:2] for sample in samples) == \
+        [('__mul__', 2**127 - 1)] * 2 + [('_new', 2**127 - 1)] * 2
+    assert all(sample[2] >= 0 for sample in samples)
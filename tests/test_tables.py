@@ -0,0 +1,77 @@
+from math import gcd
+
+from pytest import fixture, raises
+
+import mod
+from mod import Mod, ModRing, ModTables, set_tables
+
+
+@fixture(params=[False, True])
+def tables(request):
+    set_tables(64, multiplication=True, logarithm=request.param)
+    yield request.param
+    set_tables(0)
+
+
+def test_tables(tables):
+    for modulus in range(1, 64):
+        for value in range(modulus):
+            number = Mod(value, modulus)
+            if gcd(value, modulus) == 1:
+                assert number.inverse * number == Mod(1, modulus)
+            else:
+                with raises(ValueError):
+                    number.inverse
+            for exponent in [0, 1, 5, 63, 2**70]:
+                assert number**exponent == pow(value, exponent, modulus)
+            if gcd(value, modulus) == 1:
+                assert number**-7 == number.inverse**7
+
+    assert ModRing(13).tables.multiplication[5][7] == 35 % 13
+    assert (ModRing(13).tables.log is not None) == tables
+    assert ModRing(12).tables.log is None
+    assert ModRing(-13).tables is None
+    assert ModRing(64).tables is None
+
+
+def test_log(tables):
+    for modulus in [2, 3, 31, 61]:
+        for base in range(1, modulus):
+            powers = {}
+            for exponent in range(modulus):
+                powers.setdefault(pow(base, exponent, modulus), exponent)
+            for target in range(modulus):
+                if target in powers:
+                    assert Mod(target, modulus).log(base) == powers[target]
+                else:
+                    with raises(ValueError):
+                        Mod(target, modulus).log(base)
+
+
+def test_generator():
+    tables = ModTables(61, logarithm=True)
+    assert tables.generator == 2
+    assert sorted(tables.antilog) == list(range(1, 61))
+    assert ModTables(2, logarithm=True).antilog == [1]
+    assert ModTables(12, logarithm=True).log is None
+    assert ModTables(12).inverse == [
+        None, 1, None, None, None, 5, None, 7, None, None, None, 11,
+    ]
+
+
+def test_memory():
+    set_tables(4096, memory=ModTables(4007).size * 2)
+    try:
+        for modulus in [4001, 4003, 4007]:
+            Mod(2, modulus).inverse
+        assert list(mod._TABLES) == [4003, 4007]
+        assert mod._TABLE_BYTES == sum(
+            tables.size for tables in mod._TABLES.values()
+        )
+
+        # Multiplication tables are only built when they fit
+        set_tables(4096, memory=1 << 20, multiplication=True)
+        assert ModRing(100).tables.multiplication[99][99] == 1
+        assert ModRing(4001).tables.multiplication is None
+    finally:
+        set_tables(0)
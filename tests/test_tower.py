@@ -0,0 +1,110 @@
+import random
+
+from pytest import raises
+
+import mod
+from mod import Mod, ModRing, pow_many
+
+
+def test_reduced_exponent():
+    # Bases sharing factors with the modulus, huge exponents
+    generator = random.Random(3)
+    for modulus in [1, 2, 8, 1000, 2**5 * 3**3 * 7, 2**31 - 1, 17**4]:
+        ModRing(modulus).carmichael
+        for _ in range(20):
+            value = generator.randrange(modulus)
+            exponent = generator.getrandbits(200)
+            for small in range(12):
+                assert Mod(value, modulus)**small == \
+                    pow(value, small, modulus)
+            assert Mod(value, modulus)**exponent == \
+                pow(value, exponent, modulus)
+
+
+def test_reduction_without_factorization():
+    mod._RINGS.clear()
+    exponent = 3**5000
+    # Prime modulus: found by a primality test
+    assert Mod(5, 2**61 - 1)**exponent == pow(5, exponent, 2**61 - 1)
+    assert mod._RINGS[2**61 - 1]._carmichael == 2**61 - 2
+    # Small composite modulus: factored
+    assert Mod(6, 10**9)**exponent == pow(6, exponent, 10**9)
+    assert mod._RINGS[10**9]._carmichael is not None
+    # Large composite modulus with a prime cofactor: factored
+    modulus = 2**10 * 3 * (2**61 - 1)
+    assert Mod(6, modulus)**exponent == pow(6, exponent, modulus)
+    assert mod._RINGS[modulus]._carmichael is not None
+    # Large composite modulus: left alone
+    modulus = (2**61 - 1) * (2**89 - 1)
+    assert Mod(5, modulus)**exponent == pow(5, exponent, modulus)
+    assert mod._RINGS[modulus]._factorization is None
+    # Exponent not wide enough
+    assert Mod(5, 2**127 - 1)**2**200 == pow(5, 2**200, 2**127 - 1)
+    assert 2**127 - 1 not in mod._RINGS
+
+
+def test_negative_exponent():
+    exponent = 7**2000
+    number = Mod(3, 2**61 - 1)
+    assert number**-exponent == (number**exponent).inverse
+    with raises(ValueError):
+        Mod(2, 1000)**-exponent
+
+
+def test_pow_many():
+    exponent = 5**1000
+    numbers = [Mod(value, 1000) for value in range(50)]
+    ModRing(1000).carmichael
+    assert pow_many(numbers, exponent) == [x**exponent for x in numbers]
+
+
+def tower(values, modulus):
+    result = values[-1]
+    for value in reversed(values[:-1]):
+        result = value**result
+    return result % modulus
+
+
+def test_power_tower():
+    generator = random.Random(5)
+    for modulus in [1, 2, 12, 1000, 2**10, 3**6 * 5, 999983, -100]:
+        for _ in range(30):
+            values = [generator.randrange(6) for _ in range(4)]
+            if values[1] ** (values[2] ** values[3]) > 10**5:
+                values[3] = 1
+            assert Mod(values[0], modulus).power_tower(*values[1:]) == \
+                Mod(tower(values, abs(modulus)), modulus)
+
+    assert Mod(3, 1000).power_tower() == 3
+    assert Mod(3, 1000).power_tower(5) == 243
+    assert Mod(3, 1000).power_tower(0) == 1
+    assert Mod(3, 1000).power_tower(Mod(2, 7), 3) == 3**8 % 1000
+    assert Mod(3, 1000).power_tower(3, 3, 3) == pow(3, 3**27, 1000)
+    assert Mod(7, 10**9).power_tower(7, 7, 7, 7) == \
+        Mod(7, 10**9).power_tower(7, 7, 7, 7, 1)
+
+
+def test_reduced_tower():
+    # 2^(2^(2^(2^2))) = 2^65536 is past the exact bound of both moduli
+    assert Mod(3, 1000).power_tower(2, 2, 2, 2, 2) == \
+        pow(3, 2**65536, 1000)
+    assert Mod(6, 2**10 * 3**5).power_tower(2, 2, 2, 2, 2) == \
+        pow(6, 2**65536, 2**10 * 3**5)
+
+
+def test_tower_large_modulus():
+    modulus = (2**255 - 19) * (2**256 - 189)
+    mod._RINGS.clear()
+    assert Mod(3, modulus).power_tower(2) == 9
+    assert Mod(3, modulus).power_tower(2, 3) == 3**8
+    assert Mod(3, modulus).power_tower(5, 5, 2) == \
+        pow(3, 5**25, modulus)
+    assert modulus not in mod._RINGS
+
+    with raises(ValueError, match='cannot be factored'):
+        Mod(3, modulus).power_tower(10, 10**100)
+
+
+def test_negative_tower():
+    with raises(ValueError):
+        Mod(3, 1000).power_tower(2, -1)